@@ -1,42 +1,114 @@
-from fastapi import APIRouter
+import asyncio
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from app.core.config import SCOREBOARD_CACHE_CONTROL
+from app.core.http import CachedBody, SnapshotMemo, conditional_response
 from app.services import games as game_service
+from app.services import live as live_service
 from app.services import teams as team_service
 from app.services import players as player_service
 from app.models.api import APIResponse
 
 router = APIRouter()
 
+# Serialized bodies and ETags per scoreboard snapshot, so repeated polls skip rebuilding and re-encoding.
+_today_responses = SnapshotMemo()
+
+def _json_body(data, message: str):
+    return CachedBody(APIResponse.success_body(data, message))
+
 @router.get("/today", response_model=APIResponse[list[dict]])
-def get_games_today():
+async def get_games_today(request: Request):
     """
     Retrieve NBA game results for today (Eastern Time).
+    Supports If-None-Match: unchanged scoreboards are answered with 304 Not Modified.
     """
     try:
-        games = game_service.get_games_by_date()
-        return APIResponse.success_response(games, "Successfully retrieved today's games")
+        games = await game_service.get_today_games_async()
+        cached = _today_responses.get(games, "today", lambda: _json_body(
+            game_service.get_game_projection(games).payloads_for(games), "Successfully retrieved today's games"
+        ))
+        return conditional_response(request, cached, SCOREBOARD_CACHE_CONTROL)
     except Exception as e:
         return APIResponse.error_response(str(e), "Failed to retrieve today's games")
 
-@router.get("/today/by-team", response_model=APIResponse[dict])
-def get_team_game_today(team: str):
+@router.get("/today/by-team", response_model=APIResponse[list[dict]])
+async def get_team_game_today(request: Request, team: str):
     """
     Retrieve today's game(s) for a specific team.
+    Supports If-None-Match like /games/today.
     ex: /games/today/by-team?team=GSW
     """
     try:
-        result = game_service.get_team_game_today(team)
-        return APIResponse.success_response(result, f"Successfully retrieved today's game for {team}")
+        games = await game_service.get_today_games_async()
+        resolved = team_service.find_team(team)
+        label = team if resolved is None else resolved["abbreviation"]
+        build = lambda: _json_body(
+            game_service.get_game_projection(games).payloads_for(game_service.find_team_games(games, team)),
+            f"Successfully retrieved today's game for {label}"
+        )
+        # Keyed by team ID, so "gsw" and "GSW" share one body and ETag; only known teams are
+        # memoized, so arbitrary query strings cannot grow the memo.
+        if resolved is None:
+            cached = build()
+        else:
+            cached = _today_responses.get(games, ("team", resolved["id"]), build)
+        return conditional_response(request, cached, SCOREBOARD_CACHE_CONTROL)
     except Exception as e:
         return APIResponse.error_response(str(e), f"Failed to retrieve today's game for {team}")
 
+@router.get("/range", response_model=APIResponse[dict])
+def get_games_in_range(start: str, end: str):
+    """
+    Retrieve NBA game results for every date in a range, keyed by date.
+    ex: /games/range?start=2025-04-01&end=2025-04-07
+    """
+    try:
+        games = {date: game_service.to_game_payloads(day) for date, day in game_service.get_games_in_range(start, end).items()}
+        return APIResponse.fast_response(games, f"Successfully retrieved games from {start} to {end}")
+    except Exception as e:
+        return APIResponse.error_response(str(e), f"Failed to retrieve games from {start} to {end}")
+
+@router.get("/live")
+async def stream_live_scores(team: str = None):
+    """
+    Stream live score updates as Server-Sent Events.
+    Sends a "snapshot" event with the current games, then "diff" events with only the changed fields.
+    ex: /games/live or /games/live?team=GSW
+    """
+    team_id = None
+    if team:
+        found = team_service.find_team(team)
+        if found is None:
+            return APIResponse.error_response(f"Team not found: {team}", "Failed to subscribe to live scores")
+        team_id = found["id"]
+
+    subscriber = live_service.broadcaster.subscribe(team_id)
+
+    async def events():
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), timeout=live_service.KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if message is None:
+                    break
+                yield message
+        finally:
+            live_service.broadcaster.unsubscribe(subscriber)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 @router.get("/{date}", response_model=APIResponse[list[dict]])
-def get_games_by_date(date: str):
+async def get_games_by_date(date: str):
     """
     Retrieve NBA game results for a specific date.
     """
     try:
-        games = game_service.get_games_by_date(date)
-        return APIResponse.success_response(games, f"Successfully retrieved games for {date}")
+        games = game_service.to_game_payloads(await game_service.get_games_by_date_async(date))
+        return APIResponse.fast_response(games, f"Successfully retrieved games for {date}")
     except Exception as e:
         return APIResponse.error_response(str(e), f"Failed to retrieve games for {date}")
 
@@ -46,7 +118,7 @@ def get_user_team_games(email: str):
     Get today's games for the teams registered by a user.
     """
     try:
-        games = game_service.get_user_team_games_today(email)
-        return APIResponse.success_response(games, "Successfully retrieved user's team games")
+        games = game_service.to_game_payloads(game_service.get_user_team_games_today(email))
+        return APIResponse.fast_response(games, "Successfully retrieved user's team games")
     except Exception as e:
         return APIResponse.error_response(str(e), "Failed to retrieve user's team games")
\ No newline at end of file
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+from app.core import metrics
+
+router = APIRouter()
+
+@router.get("", include_in_schema=False)
+def get_metrics():
+    """
+    Request latency, upstream call time and cache statistics in Prometheus text format.
+    """
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
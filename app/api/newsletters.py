@@ -1,9 +1,19 @@
-from fastapi import APIRouter, Response
-from app.services.newsletter import render_newsletter_html
+from fastapi import APIRouter, Request
+from app.core.config import SCOREBOARD_CACHE_CONTROL
+from app.core.http import CachedBody, SnapshotMemo, conditional_response
+from app.services.games import get_games_by_date
+from app.services.newsletter import get_today_us_date, render_newsletter_html
 
 router = APIRouter()
 
+# Rendered preview per scoreboard snapshot and date.
+_preview_responses = SnapshotMemo()
+
 @router.get("/preview")
-def preview_newsletter():
-    html = render_newsletter_html()
-    return Response(content=html, media_type="text/html")
\ No newline at end of file
+def preview_newsletter(request: Request):
+    games = get_games_by_date()
+    cached = _preview_responses.get(
+        games, get_today_us_date(),
+        lambda: CachedBody(render_newsletter_html(games).encode("utf-8"), "text/html; charset=utf-8")
+    )
+    return conditional_response(request, cached, SCOREBOARD_CACHE_CONTROL)
@@ -1,28 +1,41 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from app.services import players as player_service
+from app.services import player_search
 from app.models.api import APIResponse
 
 router = APIRouter()
 
 @router.get("/id/{player_id}/stats", response_model=APIResponse[dict])
-def get_player_stats_by_id(player_id: int):
+async def get_player_stats_by_id(player_id: int):
     """
     Get recent game stats for a specific player.
     """
     try:
-        stats = player_service.get_player_stats_by_id(player_id)
-        return APIResponse.success_response(stats, f"Successfully retrieved stats for player {player_id}")
+        stats = await player_service.get_player_stats_by_id_async(player_id)
+        return APIResponse.fast_response(stats, f"Successfully retrieved stats for player {player_id}")
     except Exception as e:
         return APIResponse.error_response(str(e), f"Failed to retrieve stats for player {player_id}")
 
+@router.get("/ids/stats", response_model=APIResponse[dict])
+async def get_player_stats_by_ids(player_ids: list[int] = Query(...)):
+    """
+    Get recent game stats for several players in one request.
+    ex: /players/ids/stats?player_ids=2544&player_ids=201939
+    """
+    try:
+        stats = await player_service.get_player_stats_by_ids_async(player_ids)
+        return APIResponse.fast_response(stats, f"Successfully retrieved stats for {len(player_ids)} players")
+    except Exception as e:
+        return APIResponse.error_response(str(e), "Failed to retrieve stats for players")
+
 @router.get("/name/{player_name}/stats", response_model=APIResponse[dict])
-def get_player_stats_by_name(player_name: str):
+async def get_player_stats_by_name(player_name: str):
     """
     Get recent game stats for a specific player.
     """
     try:
-        stats = player_service.get_player_stats_by_name(player_name)
-        return APIResponse.success_response(stats, f"Successfully retrieved stats for player {player_name}")
+        stats = await player_service.get_player_stats_by_name_async(player_name)
+        return APIResponse.fast_response(stats, f"Successfully retrieved stats for player {player_name}")
     except Exception as e:
         return APIResponse.error_response(str(e), f"Failed to retrieve stats for player {player_name}")
 
@@ -33,7 +46,18 @@ def search_players(search: str):
     """
     try:
         players = player_service.search_players(search)
-        return APIResponse.success_response(players, f"Successfully searched for players matching '{search}'")
+        return APIResponse.fast_response(players, f"Successfully searched for players matching '{search}'")
     except Exception as e:
         return APIResponse.error_response(str(e), f"Failed to search for players matching '{search}'")
 
+@router.get("/autocomplete", response_model=APIResponse[list[dict]])
+def autocomplete_players(q: str, limit: int = Query(player_search.AUTOCOMPLETE_MAX_RESULTS, ge=1, le=player_search.AUTOCOMPLETE_MAX_RESULTS)):
+    """
+    Suggest players for a partial or misspelled name, active players first.
+    ex: /players/autocomplete?q=lebr&limit=5
+    """
+    try:
+        players = player_search.autocomplete_players(q, limit)
+        return APIResponse.fast_response(players, f"Successfully retrieved suggestions for '{q}'")
+    except Exception as e:
+        return APIResponse.error_response(str(e), f"Failed to retrieve suggestions for '{q}'")
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Response
+from app.core.profiling import profile_store
+from app.models.api import APIResponse
+
+router = APIRouter()
+
+@router.get("", response_model=APIResponse[list[dict]])
+def list_profiles():
+    """
+    List stored request profiles, newest first.
+    """
+    try:
+        return APIResponse.fast_response(profile_store.list(), "Successfully retrieved profiles")
+    except Exception as e:
+        return APIResponse.error_response(str(e), "Failed to retrieve profiles")
+
+@router.get("/{profile_id}")
+def get_profile(profile_id: str):
+    """
+    Download a profile in collapsed-stack format (flamegraph.pl, speedscope).
+    """
+    try:
+        profile = profile_store.read(profile_id)
+    except ValueError as e:
+        return APIResponse.error_response(str(e), "Invalid profile id")
+    if profile is None:
+        return APIResponse.error_response("Profile not found", f"No profile {profile_id}")
+    return Response(content=profile, media_type="text/plain; charset=utf-8")
@@ -1,17 +1,23 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+from app.core.http import SnapshotMemo
 from app.services import teams as team_service
 from app.models.api import APIResponse
 
 router = APIRouter()
 
+# The team list only changes when the index is rebuilt, so its body is serialized once per index.
+_team_list_bodies = SnapshotMemo()
+
 @router.get("", response_model=APIResponse[list[dict]])
 def get_teams():
     """
     Get the list of all NBA teams.
     """
     try:
-        teams = team_service.get_team_list()
-        return APIResponse.success_response(teams, "Successfully retrieved teams list")
+        # The index's own tuple is only serialized here, never handed out, so no copy is needed.
+        teams = team_service.get_team_index().team_list
+        body = _team_list_bodies.get(teams, "all", lambda: APIResponse.success_body(teams, "Successfully retrieved teams list"))
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         return APIResponse.error_response(str(e), "Failed to retrieve teams list")
 
@@ -22,6 +28,6 @@ def get_team(team_name: str):
     """
     try:
         teams = team_service.get_team_by_name(team_name)
-        return APIResponse.success_response(teams, f"Successfully retrieved team details for {team_name}")
+        return APIResponse.fast_response(teams, f"Successfully retrieved team details for {team_name}")
     except Exception as e:
         return APIResponse.error_response(str(e), f"Failed to retrieve team details for {team_name}")
\ No newline at end of file
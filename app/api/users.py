@@ -3,8 +3,9 @@ from datetime import datetime, timezone
 
 from app.models.user import UserCreate, UserOut
 from app.models.api import APIResponse
-from app.core.dynamodb import get_table
+from app.core.dynamodb import get_table, scan_items
 from app.services import teams as team_service
+from app.services import subscribers as subscriber_service
 
 import traceback
 import os
@@ -12,6 +13,10 @@ import os
 router = APIRouter()
 TABLE_NAME = os.getenv("USERS_TABLE_NAME", "users")
 
+def _subscriber_out(item):
+    # Shapes a stored user like UserOut without a per-item model validation.
+    return {field: item.get(field) for field in UserOut.model_fields}
+
 @router.get("/subscribers", response_model=APIResponse[list[UserOut]])
 def list_subscribers():
     """
@@ -20,9 +25,8 @@ def list_subscribers():
     table = get_table(TABLE_NAME)
     
     try:
-        response = table.scan()
-        items = response.get("Items", [])
-        return APIResponse.success_response(items, "Successfully retrieved subscribers")
+        items = [_subscriber_out(item) for item in scan_items(table)]
+        return APIResponse.fast_response(items, "Successfully retrieved subscribers")
     except Exception as e:
         return APIResponse.error_response(str(e), "Failed to retrieve subscribers")
 
@@ -79,31 +83,11 @@ def update_user_teams(email: str, team_ids: list[int]):
     """
     Update the list of favorite teams for the newsletter.
     """
-    table = get_table(TABLE_NAME)
     try:
-        all_teams = team_service.get_team_list()
-
-        selected = [
-            {
-                "id": team['id'],
-                "name": team['full_name'],
-                "abbreviation": team['abbreviation']
-            }
-            for team in all_teams
-            if team['id'] in team_ids
-        ]
-
-
-        response = table.update_item(
-            Key={"email": email},
-            UpdateExpression="SET teams = :teams, updated_at = :updated_at",
-            ExpressionAttributeValues={
-                ":teams": selected,
-                ":updated_at": datetime.now(timezone.utc).isoformat()
-            },
-            ReturnValues="ALL_NEW"
-        )
-        return APIResponse.success_response(response["Attributes"], "Teams updated successfully")
+        selected = team_service.get_teams_by_ids(team_ids)
+        updated_at = datetime.now(timezone.utc).isoformat()
+        item = subscriber_service.update_user_teams(email, selected, updated_at)
+        return APIResponse.success_response(item, "Teams updated successfully")
 
     except Exception as e:
         print("[ERROR] update_user_teams failed:", e)
@@ -115,10 +99,8 @@ def delete_user(email: str):
     """
     Unsubscribe from the newsletter.
     """
-    table = get_table(TABLE_NAME)
-    
     try:
-        table.delete_item(Key={"email": email})
+        subscriber_service.delete_user(email)
         return APIResponse.success_response({"email": email}, "Successfully unsubscribed user")
     except Exception as e:
         return APIResponse.error_response(str(e), "Failed to unsubscribe user")
\ No newline at end of file
@@ -0,0 +1,180 @@
+import json
+import os
+import re
+import threading
+import zlib
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: appends are only serialized within one process.
+    fcntl = None
+
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+KIND_SCOREBOARD = "scoreboard"
+KIND_BOXSCORE = "boxscore"
+
+
+def game_date(game: dict):
+    """
+    Returns the US Eastern date (YYYY-MM-DD) of a scoreboard or box score game dict.
+    """
+    game_code = game.get("gameCode", "")
+    if len(game_code) >= 8 and game_code[:8].isdigit():
+        return f"{game_code[:4]}-{game_code[4:6]}-{game_code[6:8]}"
+    return game.get("gameEt", "")[:10] or None
+
+
+class GameArchive:
+    """
+    Local, append-only archive of Final scoreboard games and box scores.
+
+    Every snapshot is appended to ``games.dat`` as one zlib-compressed JSON record and
+    an index line {date, game_id, kind, offset, length} is appended to ``index.jsonl``.
+    The index is small and kept in memory, so reading a day seeks straight to that
+    day's records without touching the rest of the archive. New index lines written
+    by other processes are picked up on the next read. Appends hold an exclusive
+    ``flock`` on ``archive.lock``, so several workers can share one directory.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.data_path = os.path.join(directory, "games.dat")
+        self.index_path = os.path.join(directory, "index.jsonl")
+        self.lock_path = os.path.join(directory, "archive.lock")
+        self._by_date = {}
+        self._by_game = {}
+        self._dates = []
+        self._index_pos = 0
+        self._lock = threading.Lock()
+
+    def _refresh_index(self):
+        try:
+            size = os.path.getsize(self.index_path)
+        except OSError:
+            return
+        if size <= self._index_pos:
+            return
+
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_pos)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A writer is mid-line; pick it up next time.
+                    break
+                self._index_pos += len(line)
+                self._add_to_index(json.loads(line))
+        self._dates = sorted(self._by_date)
+
+    def _add_to_index(self, entry):
+        location = (entry["offset"], entry["length"])
+        self._by_date.setdefault(entry["date"], {}).setdefault(entry["game_id"], {})[entry["kind"]] = location
+        self._by_game.setdefault(entry["game_id"], {})[entry["kind"]] = location
+
+    @contextmanager
+    def _file_lock(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            yield
+
+    def contains(self, game_id: str, kind: str):
+        with self._lock:
+            self._refresh_index()
+            return kind in self._by_game.get(game_id, {})
+
+    def append(self, date: str, game_id: str, kind: str, payload: dict):
+        """
+        Appends one snapshot unless (game_id, kind) is already archived. Returns True if written.
+        """
+        record = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+        # The dedupe check and both appends happen under the cross-process lock, so the
+        # index never records a stale offset or the same game twice.
+        with self._lock, self._file_lock():
+            self._refresh_index()
+            if kind in self._by_game.get(game_id, {}):
+                return False
+
+            with open(self.data_path, "ab") as data:
+                offset = data.seek(0, os.SEEK_END)
+                data.write(record)
+                data.flush()
+                os.fsync(data.fileno())
+
+            entry = {"date": date, "game_id": game_id, "kind": kind, "offset": offset, "length": len(record)}
+            line = (json.dumps(entry) + "\n").encode("utf-8")
+            with open(self.index_path, "ab") as index:
+                index.write(line)
+                index.flush()
+                os.fsync(index.fileno())
+            self._index_pos += len(line)
+            self._add_to_index(entry)
+            if date not in self._dates:
+                self._dates = sorted(self._by_date)
+            return True
+
+    def _read(self, data, location):
+        offset, length = location
+        data.seek(offset)
+        return json.loads(zlib.decompress(data.read(length)))
+
+    def _read_kind(self, games, kind):
+        locations = sorted(games[game_id][kind] for game_id in games if kind in games[game_id])
+        if not locations:
+            return []
+        with open(self.data_path, "rb") as data:
+            return [self._read(data, location) for location in locations]
+
+    def get_games(self, date: str):
+        """
+        Returns the archived scoreboard games for one date.
+        """
+        if not DATE_PATTERN.match(date or ""):
+            raise ValueError(f"Invalid date '{date}', expected YYYY-MM-DD")
+
+        with self._lock:
+            self._refresh_index()
+            games = self._by_date.get(date, {})
+        return self._read_kind(games, KIND_SCOREBOARD)
+
+    def get_games_in_range(self, start: str, end: str):
+        """
+        Returns {date: games} for every archived date between start and end (inclusive).
+        Records are read in file order with one open file handle.
+        """
+        for date in (start, end):
+            if not DATE_PATTERN.match(date or ""):
+                raise ValueError(f"Invalid date '{date}', expected YYYY-MM-DD")
+
+        with self._lock:
+            self._refresh_index()
+            dates = [date for date in self._dates if start <= date <= end]
+            locations = [
+                (games[game_id][KIND_SCOREBOARD], date)
+                for date in dates
+                for games in (self._by_date[date],)
+                for game_id in games
+                if KIND_SCOREBOARD in games[game_id]
+            ]
+
+        result = {date: [] for date in dates}
+        if locations:
+            with open(self.data_path, "rb") as data:
+                for location, date in sorted(locations):
+                    result[date].append(self._read(data, location))
+        return result
+
+    def get_boxscore(self, game_id: str):
+        """
+        Returns the archived box score for a game, or None.
+        """
+        with self._lock:
+            self._refresh_index()
+            location = self._by_game.get(game_id, {}).get(KIND_BOXSCORE)
+        if location is None:
+            return None
+        with open(self.data_path, "rb") as data:
+            return self._read(data, location)
@@ -0,0 +1,180 @@
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import Future
+
+_caches = []
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache with per-entry expiry and stale-while-revalidate refresh.
+
+    A fresh entry is returned as-is. An expired entry that is still inside the stale
+    window is returned immediately while a single background thread reloads it.
+    Anything older is reloaded by the caller. Loads are single-flight: concurrent
+    callers (threads or coroutines) missing the same key wait on one in-flight load.
+    """
+
+    def __init__(self, name: str, ttl, stale_ttl: float = 0.0):
+        """
+        Args:
+            name (str): Cache name used in stats output.
+            ttl (float | None | callable): Seconds an entry stays fresh. ``None`` means
+                never expire. A callable receives the loaded value and returns the TTL.
+            stale_ttl (float): Seconds after expiry during which the stale value is served.
+        """
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+        self.coalesced = 0
+        self._entries = {}
+        self._inflight = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        _caches.append(self)
+
+    def _expiry(self, value, now):
+        ttl = self.ttl(value) if callable(self.ttl) else self.ttl
+        if ttl is None:
+            return math.inf, math.inf
+        return now + ttl, now + ttl + self.stale_ttl
+
+    def set(self, key, value):
+        now = time.monotonic()
+        expires_at, stale_until = self._expiry(value, now)
+        with self._lock:
+            self._prune(now)
+            self._entries[key] = (value, expires_at, stale_until)
+
+    def _prune(self, now):
+        # Entries past their stale window are never served again; drop them so keys that
+        # stop being requested (e.g. past days' games) do not accumulate.
+        expired = [key for key, (_, _, stale_until) in self._entries.items() if stale_until <= now]
+        for key in expired:
+            del self._entries[key]
+
+    def _lookup(self, key, loader):
+        """
+        Returns (True, value) on a fresh or stale hit. On a miss returns (False, (future, is_leader)):
+        the first caller for a key becomes the leader and must load it, the rest wait on its future.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, stale_until = entry
+                if now < expires_at:
+                    self.hits += 1
+                    return True, value
+                if now < stale_until:
+                    self.stale_hits += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(target=self._refresh, args=(key, loader), daemon=True).start()
+                    return True, value
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return False, (future, False)
+
+            self.misses += 1
+            future = self._inflight[key] = Future()
+            return False, (future, True)
+
+    def _load(self, key, loader, future):
+        try:
+            value = loader()
+            self.set(key, value)
+            future.set_result(value)
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def get(self, key, loader):
+        """
+        Return the cached value for ``key``, calling ``loader()`` when it is missing or too old.
+        """
+        found, result = self._lookup(key, loader)
+        if found:
+            return result
+
+        future, is_leader = result
+        if is_leader:
+            self._load(key, loader, future)
+        return future.result()
+
+    async def aget(self, key, loader, executor=None):
+        """
+        Async version of get. The blocking ``loader()`` runs on ``executor`` (the loop's default
+        executor if None) and every coroutine or thread waiting on the same key shares its result.
+        """
+        found, result = self._lookup(key, loader)
+        if found:
+            return result
+
+        future, is_leader = result
+        if is_leader:
+            asyncio.get_running_loop().run_in_executor(executor, self._load, key, loader, future)
+        # Shielded so a cancelled waiter (client disconnect, timeout) cannot cancel the shared load.
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def _refresh(self, key, loader):
+        try:
+            self.set(key, loader())
+            with self._lock:
+                self.refreshes += 1
+        except Exception as e:
+            print(f"[WARN] {self.name} cache refresh failed for {key!r}:", e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Drop all entries and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.stale_hits = self.refreshes = self.coalesced = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "coalesced": self.coalesced,
+                "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            }
+
+
+def all_caches():
+    """
+    Returns every TTLCache created in this process.
+    """
+    return list(_caches)
+
+
+def clear_all():
+    for cache in _caches:
+        cache.clear()
@@ -0,0 +1,34 @@
+import os
+
+# Seconds a scoreboard snapshot is served as fresh before it is refreshed.
+SCOREBOARD_TTL_SECONDS = float(os.getenv("SCOREBOARD_TTL_SECONDS", "15"))
+
+# Extra seconds an expired snapshot may still be served while a background refresh runs.
+SCOREBOARD_STALE_SECONDS = float(os.getenv("SCOREBOARD_STALE_SECONDS", "60"))
+
+# Cache-Control for responses built from the scoreboard snapshot, so a CDN or browser can absorb repeated polls.
+SCOREBOARD_CACHE_CONTROL = f"public, max-age={int(SCOREBOARD_TTL_SECONDS)}, stale-while-revalidate={int(SCOREBOARD_STALE_SECONDS)}"
+
+# Seconds a live (not yet Final) box score is cached.
+BOXSCORE_LIVE_TTL_SECONDS = float(os.getenv("BOXSCORE_LIVE_TTL_SECONDS", "10"))
+
+# Seconds a Final box score is cached in memory. After that it is re-read from the local archive.
+BOXSCORE_FINAL_TTL_SECONDS = float(os.getenv("BOXSCORE_FINAL_TTL_SECONDS", "21600"))
+
+# Upper bound on concurrent box score requests to nba_api.
+BOXSCORE_MAX_WORKERS = int(os.getenv("BOXSCORE_MAX_WORKERS", "8"))
+
+# Directory of the local archive of Final games and box scores served for past dates.
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "data/archive")
+
+# Seconds between live scoreboard polls while at least one client is subscribed to /api/games/live.
+LIVE_POLL_INTERVAL_SECONDS = float(os.getenv("LIVE_POLL_INTERVAL_SECONDS", "5"))
+
+# Opt-in request profiling: requests sent with an X-Profile header (equal to PROFILING_TOKEN if set) are sampled.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+PROFILE_SAMPLE_INTERVAL_SECONDS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_SECONDS", "0.005"))
+
+# Directory of stored profiles; only the newest PROFILE_MAX_FILES are kept.
+PROFILE_DIR = os.getenv("PROFILE_DIR", "data/profiles")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "20"))
@@ -1,9 +1,128 @@
-import boto3
 import os
+import queue
+import threading
 
 REGION = os.getenv("AWS_REGION", "ap-northeast-2")
 
-dynamodb = boto3.resource("dynamodb", region_name=REGION)
+# Number of parallel Segment/TotalSegments workers used by scan_items.
+SCAN_SEGMENTS = int(os.getenv("DYNAMODB_SCAN_SEGMENTS", "4"))
+
+# Created on first use: importing boto3 and building the resource is a large part of a Lambda cold start.
+dynamodb = None
+_resource_lock = threading.Lock()
+
+_SEGMENT_DONE = object()
+
+def get_resource():
+    global dynamodb
+    if dynamodb is None:
+        with _resource_lock:
+            if dynamodb is None:
+                import boto3
+                dynamodb = boto3.resource("dynamodb", region_name=REGION)
+    return dynamodb
 
 def get_table(name: str):
-    return dynamodb.Table(name)
\ No newline at end of file
+    return get_resource().Table(name)
+
+def transact_write(items):
+    """
+    Applies up to 100 Put/Update/Delete/ConditionCheck items, across tables, all or nothing.
+    Items use plain Python values, like the Table API.
+    """
+    return get_resource().meta.client.transact_write_items(TransactItems=items)
+
+def _scan_pages(table, scan_kwargs):
+    """
+    Yields each page of a scan, following LastEvaluatedKey until the table (or segment) is exhausted.
+    """
+    while True:
+        response = table.scan(**scan_kwargs)
+        yield response.get("Items", [])
+
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        scan_kwargs = dict(scan_kwargs, ExclusiveStartKey=last_key)
+
+def _projection(attributes):
+    if not attributes:
+        return {}
+    names = {f"#a{i}": attribute for i, attribute in enumerate(attributes)}
+    return {"ProjectionExpression": ", ".join(names), "ExpressionAttributeNames": names}
+
+def _merge_pages(page_sources):
+    """
+    Runs each page source in its own thread and yields items as soon as any source returns a page.
+    """
+    pages = queue.Queue()
+
+    def drain(source):
+        try:
+            for page in source():
+                pages.put(page)
+        except Exception as e:
+            pages.put(e)
+        finally:
+            pages.put(_SEGMENT_DONE)
+
+    for source in page_sources:
+        threading.Thread(target=drain, args=(source,), daemon=True).start()
+
+    remaining = len(page_sources)
+    while remaining:
+        page = pages.get()
+        if page is _SEGMENT_DONE:
+            remaining -= 1
+        elif isinstance(page, Exception):
+            raise page
+        else:
+            yield from page
+
+def scan_items(table, total_segments: int = SCAN_SEGMENTS, attributes=None):
+    """
+    Yields every item in the table using a fully paginated scan.
+
+    With total_segments > 1 the table is split into parallel Segment/TotalSegments
+    workers and items are yielded as soon as any segment returns a page.
+    attributes limits the scan to the given top-level attributes via a projection expression.
+    """
+    scan_kwargs = _projection(attributes)
+
+    if total_segments <= 1:
+        for page in _scan_pages(table, scan_kwargs):
+            yield from page
+        return
+
+    yield from _merge_pages([
+        lambda segment=segment: _scan_pages(table, dict(scan_kwargs, Segment=segment, TotalSegments=total_segments))
+        for segment in range(total_segments)
+    ])
+
+def _query_pages(table, query_kwargs):
+    while True:
+        response = table.query(**query_kwargs)
+        yield response.get("Items", [])
+
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        query_kwargs = dict(query_kwargs, ExclusiveStartKey=last_key)
+
+def query_items(table, key_name: str, key_values, attributes=None):
+    """
+    Yields every item whose partition key equals one of key_values.
+    Each partition is queried (and paginated) in parallel and items are yielded as pages arrive.
+    """
+    base_kwargs = _projection(attributes)
+    names = dict(base_kwargs.pop("ExpressionAttributeNames", {}), **{"#pk": key_name})
+
+    yield from _merge_pages([
+        lambda value=value: _query_pages(table, dict(
+            base_kwargs,
+            KeyConditionExpression="#pk = :pk",
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues={":pk": value}
+        ))
+        for value in key_values
+    ])
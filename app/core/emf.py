@@ -0,0 +1,200 @@
+"""
+Per-stage metrics for the Lambdas as CloudWatch Embedded Metric Format (EMF) log lines.
+
+A MetricsLogger collects stage timings, counters and latency samples during one invocation
+and ``flush()`` prints them as a single JSON line. CloudWatch Logs extracts the metrics from
+the ``_aws`` block; every other key stays searchable in Logs Insights. When disabled every
+call returns immediately and nothing is printed.
+
+This module only depends on the standard library so build-script.sh can ship it
+next to producer_lambda.py and consumer_lambda.py as a top-level ``emf`` module.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "NBANewsletter")
+
+# EMF accepts at most 100 values per metric in one log line.
+MAX_SAMPLES = 100
+PERCENTILES = (50, 95, 99)
+
+_NULL_STAGE = nullcontext()
+
+
+def percentile(ordered, q):
+    """
+    Returns the q-th percentile (nearest rank) of an already sorted list.
+    """
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+class _Stage:
+    __slots__ = ("metrics", "name", "started")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.add_time(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class MetricsLogger:
+    """
+    Collects one invocation's metrics and prints them as one EMF log line.
+
+    Stage times are reported in milliseconds as ``<Stage>Time`` and accumulate when a stage
+    runs several times. Counters and samples may be recorded from several threads.
+    """
+
+    def __init__(self, service, enabled=None, namespace=None):
+        """
+        Args:
+            service (str): Value of the ``Service`` dimension, e.g. the Lambda function name.
+            enabled (bool): Defaults to METRICS_ENABLED.
+            namespace (str): CloudWatch namespace, defaults to METRICS_NAMESPACE.
+        """
+        self.enabled = METRICS_ENABLED if enabled is None else enabled
+        self.service = service
+        self.namespace = namespace or METRICS_NAMESPACE
+        self._values = {}
+        self._units = {}
+        self._samples = {}
+        self._properties = {}
+        self._lock = threading.Lock()
+
+    def put(self, name, value, unit="Count"):
+        """
+        Sets a metric value.
+        """
+        if self.enabled:
+            self._values[name] = value
+            self._units[name] = unit
+
+    def increment(self, name, amount=1):
+        """
+        Adds to a counter metric.
+        """
+        if self.enabled:
+            with self._lock:
+                self._values[name] = self._values.get(name, 0) + amount
+                self._units[name] = "Count"
+
+    def add_time(self, name, seconds):
+        """
+        Adds seconds to the ``<name>Time`` stage metric.
+        """
+        if self.enabled:
+            key = f"{name}Time"
+            with self._lock:
+                self._values[key] = self._values.get(key, 0) + seconds * 1000
+                self._units[key] = "Milliseconds"
+
+    def elapsed(self, name):
+        """
+        Returns the seconds recorded so far for the ``name`` stage (0 when disabled).
+        """
+        return self._values.get(f"{name}Time", 0) / 1000
+
+    def stage(self, name):
+        """
+        Returns a context manager that adds its elapsed time to the ``<name>Time`` metric.
+        """
+        return _Stage(self, name) if self.enabled else _NULL_STAGE
+
+    def timed_iter(self, name, iterable):
+        """
+        Yields from iterable, adding the time spent producing items to ``<name>Time``.
+        Disabled loggers return iterable unchanged.
+        """
+        if not self.enabled:
+            return iterable
+        return self._timed_iter(name, iter(iterable))
+
+    def _timed_iter(self, name, iterator):
+        elapsed = 0.0
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    elapsed += time.perf_counter() - started
+                    return
+                elapsed += time.perf_counter() - started
+                yield item
+        finally:
+            self.add_time(name, elapsed)
+
+    def observe(self, name, value, unit="Milliseconds"):
+        """
+        Records one sample of a distribution, reported with its p50/p95/p99.
+        """
+        if self.enabled:
+            with self._lock:
+                self._samples.setdefault(name, []).append(value)
+                self._units[name] = unit
+
+    def put_summary(self, summary, names):
+        """
+        Reports summary values as metrics.
+
+        Args:
+            summary (dict): Handler summary.
+            names (dict): Summary key -> (metric name, unit). Other keys are not reported.
+        """
+        for key, (name, unit) in names.items():
+            if key in summary:
+                self.put(name, summary[key], unit)
+
+    def set_property(self, name, value):
+        """
+        Adds a non-metric field to the log line.
+        """
+        if self.enabled:
+            self._properties[name] = value
+
+    def to_document(self):
+        """
+        Returns the EMF document for the collected metrics.
+        """
+        values = {name: round(value, 3) if isinstance(value, float) else value for name, value in self._values.items()}
+        units = dict(self._units)
+        for name, samples in self._samples.items():
+            ordered = sorted(samples)
+            # The raw samples let CloudWatch compute its own percentiles; very long lists are capped.
+            values[name] = [round(sample, 3) for sample in samples[:MAX_SAMPLES]]
+            for q in PERCENTILES:
+                values[f"{name}P{q}"] = round(percentile(ordered, q), 3)
+                units[f"{name}P{q}"] = units[name]
+
+        return {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [{
+                    "Namespace": self.namespace,
+                    "Dimensions": [["Service"]],
+                    "Metrics": [{"Name": name, "Unit": units[name]} for name in values],
+                }],
+            },
+            "Service": self.service,
+            **self._properties,
+            **values,
+        }
+
+    def flush(self):
+        """
+        Prints the collected metrics as one EMF log line. Does nothing when disabled.
+        """
+        if self.enabled:
+            print(json.dumps(self.to_document(), default=str))
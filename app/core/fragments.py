@@ -0,0 +1,95 @@
+"""
+Per-game HTML fragment cache for newsletter rendering, shared by the API and the producer Lambda.
+
+A newsletter is a page shell around one card per game, and a game's card is the same
+for every subscriber who follows that game. Templates define the card as a
+``game_card(game)`` macro and lay the page out as ``{% for card in cards %}{{ card }}{% endfor %}``,
+so each card is rendered once per (game ID, snapshot version), the shell once per date,
+and every newsletter is then a string join.
+
+This module only depends on the standard library so build-script.sh can ship it
+next to producer_lambda.py as a top-level ``fragments`` module.
+"""
+
+import threading
+
+# Stands in for the cards when the shell is rendered, and marks where it is split.
+_CARDS_SLOT = "<!--newsletter-cards-->"
+
+
+class FragmentRenderer:
+    """
+    Renders newsletters from cached per-game fragments.
+
+    Fragments are kept for one snapshot version at a time: passing a new version drops
+    the previous version's cards, so memory stays bounded by one scoreboard.
+    """
+
+    def __init__(self, template):
+        """
+        Args:
+            template (jinja2.Template): Page template exposing a ``game_card`` macro and a ``cards`` loop.
+        """
+        self.template = template
+        self.renders = 0
+        self.hits = 0
+        self._version = None
+        self._cards = {}
+        self._shells = {}
+        self._lock = threading.Lock()
+
+    def _shell(self, date):
+        shell = self._shells.get(date)
+        if shell is None:
+            head, tail = self.template.render(date=date, cards=[_CARDS_SLOT]).split(_CARDS_SLOT)
+            # Dates only change daily; keep just the latest shell.
+            shell = (head, tail)
+            self._shells = {date: shell}
+        return shell
+
+    def card(self, game, version):
+        """
+        Returns the rendered card for a game, rendering it only once per (game ID, version).
+
+        Args:
+            game: Scoreboard game dict or GameView.
+            version: Snapshot version the game belongs to; None disables caching.
+
+        Returns:
+            str: The card's HTML.
+        """
+        if version is None:
+            return str(self.template.module.game_card(game))
+
+        key = game["gameId"]
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._cards = {}
+            html = self._cards.get(key)
+            if html is not None:
+                self.hits += 1
+                return html
+
+        html = str(self.template.module.game_card(game))
+        with self._lock:
+            self.renders += 1
+            if version == self._version:
+                self._cards[key] = html
+        return html
+
+    def render(self, date, games, version=None):
+        """
+        Assembles a newsletter from the shell and each game's card.
+
+        Args:
+            date (str): Newsletter date shown in the shell.
+            games (list): Games to include, in order.
+            version: Snapshot version of the games; None renders every card fresh.
+
+        Returns:
+            str: The newsletter HTML.
+        """
+        with self._lock:
+            head, tail = self._shell(date)
+        return head + "".join(self.card(game, version) for game in games) + tail
@@ -0,0 +1,126 @@
+"""
+Compact projection of scoreboard games shared by the API and the producer Lambda.
+
+A raw nba_api scoreboard game carries dozens of fields; the newsletter templates and
+API clients only use teams, scores, periods, leaders and status. GameView keeps just
+those, in ``__slots__`` objects with the upstream field names, so templates render
+them unchanged and ``to_dict()`` gives the JSON payload.
+
+This module only depends on the standard library so build-script.sh can ship it
+next to producer_lambda.py as a top-level ``game_view`` module.
+"""
+
+import hashlib
+import json
+
+
+class _CompactView:
+    __slots__ = ()
+    # Field name -> view class for nested dicts (or lists of dicts).
+    _nested = {}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        view = cls.__new__(cls)
+        for name in cls.__slots__:
+            value = data.get(name)
+            nested = cls._nested.get(name)
+            if nested is not None and value is not None:
+                value = [nested.from_dict(item) for item in value] if isinstance(value, list) else nested.from_dict(value)
+            setattr(view, name, value)
+        return view
+
+    def to_dict(self):
+        result = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if isinstance(value, _CompactView):
+                value = value.to_dict()
+            elif isinstance(value, list):
+                value = [item.to_dict() if isinstance(item, _CompactView) else item for item in value]
+            result[name] = value
+        return result
+
+    # Read access by key, so code written against scoreboard dicts (matching, digest keys) keeps working.
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def __eq__(self, other):
+        return type(other) is type(self) and all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class PeriodScore(_CompactView):
+    __slots__ = ("period", "score")
+    period: int
+    score: int
+
+
+class TeamLine(_CompactView):
+    __slots__ = ("teamId", "teamName", "teamCity", "teamTricode", "score", "periods")
+    _nested = {"periods": PeriodScore}
+    teamId: int
+    teamName: str
+    teamCity: str
+    teamTricode: str
+    score: int
+    periods: list
+
+
+class Leader(_CompactView):
+    __slots__ = ("personId", "name", "points", "rebounds", "assists")
+    personId: int
+    name: str
+    points: int
+    rebounds: int
+    assists: int
+
+
+class GameLeaders(_CompactView):
+    __slots__ = ("homeLeaders", "awayLeaders")
+    _nested = {"homeLeaders": Leader, "awayLeaders": Leader}
+    homeLeaders: Leader
+    awayLeaders: Leader
+
+
+class GameView(_CompactView):
+    """
+    The fields of one scoreboard game that templates and API clients use.
+    """
+
+    __slots__ = ("gameId", "gameCode", "gameStatus", "gameStatusText", "period", "gameEt",
+                 "homeTeam", "awayTeam", "gameLeaders")
+    _nested = {"homeTeam": TeamLine, "awayTeam": TeamLine, "gameLeaders": GameLeaders}
+    gameId: str
+    gameCode: str
+    gameStatus: int
+    gameStatusText: str
+    period: int
+    gameEt: str
+    homeTeam: TeamLine
+    awayTeam: TeamLine
+    gameLeaders: GameLeaders
+
+
+def project_games(games):
+    """
+    Returns a GameView for each scoreboard game dict.
+    """
+    return [GameView.from_dict(game) for game in games]
+
+
+def snapshot_version(payloads):
+    """
+    Returns a short content hash of a snapshot's game payloads (GameView.to_dict() output).
+    Identical scoreboards get the same version, so fragments cached for them stay valid.
+    """
+    encoded = json.dumps(payloads, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
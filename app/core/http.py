@@ -0,0 +1,68 @@
+import hashlib
+import threading
+
+from fastapi import Request, Response
+
+
+class CachedBody:
+    """
+    A serialized response body and its content-hash ETag, computed once and reused
+    for every request served from the same snapshot.
+    """
+
+    __slots__ = ("body", "etag", "media_type")
+
+    def __init__(self, body: bytes, media_type: str = "application/json"):
+        self.body = body
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        self.media_type = media_type
+
+
+class SnapshotMemo:
+    """
+    Memoizes values derived from a snapshot object (e.g. the cached scoreboard list) by identity.
+    All values are dropped as soon as a different snapshot is passed in.
+    """
+
+    def __init__(self):
+        self._snapshot = None
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def get(self, snapshot, key, build):
+        with self._lock:
+            if self._snapshot is not snapshot:
+                self._snapshot = snapshot
+                self._values = {}
+            value = self._values.get(key)
+        if value is not None:
+            return value
+
+        value = build()
+        with self._lock:
+            if self._snapshot is snapshot:
+                self._values[key] = value
+        return value
+
+
+def etag_matches(if_none_match: str, etag: str):
+    """
+    True if an If-None-Match header value matches the ETag (weak comparison, "*" matches anything).
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def conditional_response(request: Request, cached: CachedBody, cache_control: str):
+    """
+    Returns 304 Not Modified if the client already has this body, otherwise the body itself.
+    """
+    headers = {"ETag": cached.etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type=cached.media_type, headers=headers)
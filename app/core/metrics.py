@@ -0,0 +1,248 @@
+"""
+In-process request, upstream and cache metrics exposed in Prometheus text format on /metrics.
+
+Histograms keep fixed bucket counts per label set behind one lock, so recording an
+observation is a bisect and a few increments. Cache statistics are read from
+``cache.all_caches()`` when /metrics is scraped, which costs nothing between scrapes.
+"""
+
+import bisect
+import threading
+import time
+
+from app.core import cache
+
+# Seconds; covers cached responses (sub-millisecond) up to slow upstream calls.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_metrics = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in (*zip(names, values), *extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+        return False
+
+
+class Histogram:
+    """
+    A Prometheus histogram with one series per combination of label values.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def observe(self, value: float, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # One count per bucket plus the +Inf overflow, then the sum.
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def time(self, *labels):
+        """
+        Returns a context manager that observes its elapsed seconds.
+        """
+        return _Timer(self, labels)
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def collect(self):
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), values):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, [('le', _number(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(values[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Counter:
+    """
+    A Prometheus counter with one value per combination of label values.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def collect(self):
+        with self._lock:
+            values = dict(self._values)
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in sorted(values.items())]
+        return lines
+
+
+http_request_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")
+)
+nba_api_seconds = Histogram("nba_api_request_duration_seconds", "Upstream nba_api call time.", ("endpoint",))
+dynamodb_seconds = Histogram("dynamodb_request_duration_seconds", "DynamoDB call time.", ("operation",))
+dynamodb_errors = Counter("dynamodb_request_errors_total", "DynamoDB calls that failed or returned an error.", ("operation",))
+
+
+def _cache_lines():
+    stats = [cache_.stats() for cache_ in cache.all_caches()]
+    families = (
+        ("cache_hits_total", "counter", "Fresh cache hits.", "hits"),
+        ("cache_stale_hits_total", "counter", "Expired entries served while refreshing.", "stale_hits"),
+        ("cache_misses_total", "counter", "Cache misses that loaded the value.", "misses"),
+        ("cache_coalesced_total", "counter", "Misses that waited on another caller's load.", "coalesced"),
+        ("cache_refreshes_total", "counter", "Background refreshes of stale entries.", "refreshes"),
+        ("cache_entries", "gauge", "Entries currently cached.", "size"),
+        ("cache_hit_ratio", "gauge", "Share of lookups answered from the cache (fresh or stale).", "hit_ratio"),
+    )
+    lines = []
+    for name, kind, documentation, key in families:
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+        lines += [f"{name}{_labels(('cache',), (entry['name'],))} {_number(entry[key])}" for entry in stats]
+    return lines
+
+
+def render():
+    """
+    Returns every metric in Prometheus text exposition format.
+    """
+    lines = []
+    for metric in _metrics:
+        lines += metric.collect()
+    lines += _cache_lines()
+    return "\n".join(lines) + "\n"
+
+
+def clear_all():
+    for metric in _metrics:
+        metric.clear()
+
+
+def _dynamodb_started(context, **kwargs):
+    context["metrics_started"] = time.perf_counter()
+
+
+def _dynamodb_observe(operation, context):
+    started = context.pop("metrics_started", None)
+    if started is not None:
+        dynamodb_seconds.observe(time.perf_counter() - started, operation)
+
+
+def _dynamodb_finished(model, context, http_response, **kwargs):
+    _dynamodb_observe(model.name, context)
+    # Service errors (e.g. a failed condition) arrive as error responses.
+    if http_response.status_code >= 300:
+        dynamodb_errors.inc(model.name)
+
+
+def _dynamodb_failed(event_name, context, **kwargs):
+    # Connection errors and timeouts: no response, and the event carries no operation model.
+    operation = event_name.rsplit(".", 1)[-1]
+    _dynamodb_observe(operation, context)
+    dynamodb_errors.inc(operation)
+
+
+def instrument_dynamodb(resource):
+    """
+    Times every call made through a boto3 DynamoDB resource (including its tables) with botocore events.
+    """
+    events = resource.meta.client.meta.events
+    # before-call handlers can short-circuit each other (e.g. a Stubber), before-parameter-build ones cannot.
+    events.register("before-parameter-build.dynamodb", _dynamodb_started, unique_id="metrics-dynamodb-started")
+    events.register("after-call.dynamodb", _dynamodb_finished, unique_id="metrics-dynamodb-finished")
+    events.register("after-call-error.dynamodb", _dynamodb_failed, unique_id="metrics-dynamodb-failed")
+
+
+def route_template(scope):
+    """
+    Returns the route template a request matched, e.g. ``/api/teams/{team_name}``, or ``unmatched``.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    # FastAPI versions that resolve included routers lazily record the prefixed path here.
+    effective = scope.get("fastapi", {}).get("effective_route_context")
+    return getattr(effective, "path", None) or route.path
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording each HTTP request's latency under its route template,
+    e.g. ``/api/games/today/{team}``, so path parameters do not create new series.
+    Unrouted paths (404s) share the ``unmatched`` route.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_request_seconds.observe(time.perf_counter() - started, scope["method"], route_template(scope), str(status))
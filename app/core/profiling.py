@@ -0,0 +1,252 @@
+"""
+Opt-in, per-request sampling profiler.
+
+With PROFILING_ENABLED set, a request carrying an ``X-Profile`` header (equal to
+PROFILING_TOKEN when one is configured) is sampled every PROFILE_SAMPLE_INTERVAL_SECONDS
+by a background thread while it runs. Samples are taken from wall-clock time, wherever the
+request is:
+
+- running on the event loop: the loop thread's stack below this middleware;
+- suspended at an ``await``: the task's await chain, ending in an ``(await)`` frame;
+- inside a sync endpoint on the threadpool: the worker thread's stack from the endpoint down
+  (concurrent requests to the same sync endpoint are sampled too).
+
+The result is written in collapsed-stack format (``frame;frame;frame count``), the input of
+flamegraph.pl and speedscope, to a directory that keeps the newest PROFILE_MAX_FILES profiles.
+When profiling is disabled the middleware is not installed at all.
+"""
+
+import asyncio
+import inspect
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from app.core.config import PROFILE_DIR, PROFILE_MAX_FILES, PROFILE_SAMPLE_INTERVAL_SECONDS, PROFILING_TOKEN
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+PROFILE_SUFFIX = ".folded"
+
+_PROFILE_ID_PATTERN = re.compile(r"^[\w.-]+$")
+
+
+def _frame_label(code):
+    filename = "/".join(code.co_filename.replace("\\", "/").rsplit("/", 2)[-2:])
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _thread_stack(frame, stop_code=None):
+    """
+    Returns the frame labels from the outermost frame down, starting at ``stop_code`` when given.
+    """
+    codes = []
+    while frame is not None:
+        codes.append(frame.f_code)
+        if frame.f_code is stop_code:
+            break
+        frame = frame.f_back
+    if stop_code is not None and codes[-1] is not stop_code:
+        return None
+    return [_frame_label(code) for code in reversed(codes)]
+
+
+def _await_chain(coro):
+    """
+    Returns the codes of a suspended coroutine and everything it is awaiting, outermost first.
+    """
+    codes = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        codes.append(frame.f_code)
+        # Stops at the first awaitable that is not a coroutine, e.g. the future an I/O wait is on.
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return codes
+
+
+class ProfileStore:
+    """
+    Directory of collapsed-stack profiles that keeps only the newest ``max_files``.
+    """
+
+    def __init__(self, directory: str = PROFILE_DIR, max_files: int = PROFILE_MAX_FILES):
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def _path(self, profile_id: str):
+        if not _PROFILE_ID_PATTERN.match(profile_id):
+            raise ValueError(f"Invalid profile id: {profile_id}")
+        return os.path.join(self.directory, profile_id + PROFILE_SUFFIX)
+
+    def save(self, profile_id: str, stacks: Counter):
+        lines = [f"{';'.join(stack)} {count}\n" for stack, count in stacks.most_common()]
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._path(profile_id), "w", encoding="utf-8") as f:
+                f.writelines(lines)
+            for entry in self.list()[self.max_files:]:
+                os.remove(self._path(entry["id"]))
+
+    def list(self):
+        """
+        Returns the stored profiles, newest first.
+        """
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith(PROFILE_SUFFIX)]
+        except FileNotFoundError:
+            return []
+
+        entries = []
+        for name in names:
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append({
+                "id": name[:-len(PROFILE_SUFFIX)],
+                "size_bytes": stat.st_size,
+                "created_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(),
+            })
+        # Ids start with a UTC timestamp, so they sort by creation time.
+        return sorted(entries, key=lambda entry: entry["id"], reverse=True)
+
+    def read(self, profile_id: str):
+        """
+        Returns a stored profile's contents, or None if it does not exist (or was rotated out).
+        """
+        try:
+            with open(self._path(profile_id), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+
+profile_store = ProfileStore()
+
+
+class RequestSampler:
+    """
+    Background thread sampling one request's stacks until stopped.
+    """
+
+    def __init__(self, scope, interval: float = PROFILE_SAMPLE_INTERVAL_SECONDS):
+        self.scope = scope
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        self._loop_thread = threading.get_ident()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops sampling without waiting for the thread; join() waits for its last sample.
+        """
+        self._stopped.set()
+
+    def join(self):
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    def _endpoint_code(self):
+        # Set by the router once the request is matched; only sync endpoints run on worker threads.
+        endpoint = self.scope.get("endpoint")
+        if endpoint is None or inspect.iscoroutinefunction(endpoint):
+            return None
+        return getattr(endpoint, "__code__", None)
+
+    def sample(self):
+        frames = sys._current_frames()
+        middleware_code = ProfilingMiddleware.__call__.__code__
+        if asyncio.current_task(self._loop) is self._task:
+            stack = _thread_stack(frames.get(self._loop_thread), middleware_code)
+        else:
+            codes = _await_chain(self._task.get_coro())
+            stack = None
+            if middleware_code in codes:
+                stack = [_frame_label(code) for code in codes[codes.index(middleware_code):]] + ["(await)"]
+        if stack:
+            self.stacks[tuple(stack)] += 1
+
+        endpoint_code = self._endpoint_code()
+        if endpoint_code is not None:
+            for ident, frame in frames.items():
+                if ident not in (self._loop_thread, self._thread.ident):
+                    stack = _thread_stack(frame, endpoint_code)
+                    if stack:
+                        self.stacks[("(threadpool)", *stack)] += 1
+        self.samples += 1
+
+
+def profile_id_for(scope):
+    """
+    Returns a file-safe id for a request's profile, e.g. ``20250401T120000123456Z_GET_api-players-id-1-stats``.
+    """
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-")[:80] or "root"
+    return f"{timestamp}_{scope['method']}_{slug}"
+
+
+def wants_profile(scope, token: str = PROFILING_TOKEN):
+    for name, value in scope.get("headers", ()):
+        if name == PROFILE_HEADER:
+            return value.decode("latin-1") == token if token else bool(value)
+    return False
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles requests sent with the ``X-Profile`` header.
+    The response carries the stored profile's id in ``X-Profile-Id``.
+    """
+
+    def __init__(self, app, store: ProfileStore = None, token: str = PROFILING_TOKEN,
+                 interval: float = PROFILE_SAMPLE_INTERVAL_SECONDS):
+        self.app = app
+        self.store = store or profile_store
+        self.token = token
+        self.interval = interval
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not wants_profile(scope, self.token):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = profile_id_for(scope)
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message = dict(message, headers=[*message.get("headers", []), (PROFILE_ID_HEADER, profile_id.encode())])
+            await send(message)
+
+        sampler = RequestSampler(scope, self.interval)
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop()
+            elapsed = time.perf_counter() - started
+            # Joining the sampler and writing the file would otherwise block the event loop.
+            await asyncio.to_thread(sampler.join)
+            try:
+                await asyncio.to_thread(self.store.save, profile_id, sampler.stacks)
+                print(f"[PROFILE] {scope['method']} {scope['path']} took {elapsed * 1000:.1f} ms, "
+                      f"{sampler.samples} samples -> {profile_id}")
+            except OSError as e:
+                print(f"[WARN] Failed to save profile {profile_id}:", e)
@@ -0,0 +1,94 @@
+"""
+Bitmask team-to-game matching shared by the API and the producer Lambda.
+
+This module only depends on the standard library so build-script.sh can ship it
+next to producer_lambda.py as a top-level ``team_matching`` module.
+"""
+
+
+class GameMatcher:
+    """
+    Matches followed teams against one day's games using team bitmasks.
+
+    Every team playing today gets one bit (at most 30), each game becomes the mask of
+    its two teams, and a user's followed teams become a single mask. Matching a mask is
+    then one bitwise AND per game, and results are memoized per distinct mask so users
+    following the same teams share one computation.
+    """
+
+    def __init__(self, games):
+        """
+        Args:
+            games (list): Scoreboard game dictionaries for the day.
+        """
+        self.games = games
+        self._bits = {}
+        self._team_count = 0
+        self._game_masks = []
+        self._matches = {0: []}
+        self.users_seen = 0
+
+        for game in games:
+            mask = 0
+            for side in ("homeTeam", "awayTeam"):
+                mask |= self._assign_bit(game[side].get("teamId"), game[side].get("teamTricode"))
+            self._game_masks.append(mask)
+
+    def _assign_bit(self, team_id, tricode):
+        bit = self._bits.get(team_id) or self._bits.get(tricode)
+        if bit is None:
+            bit = 1 << self._team_count
+            self._team_count += 1
+        for key in (team_id, tricode):
+            if key is not None:
+                self._bits[key] = bit
+        return bit
+
+    def team_mask(self, user_teams):
+        """
+        Encode a user's followed teams as a bitmask. Teams not playing today contribute nothing.
+
+        Args:
+            user_teams (list): Team dicts with an ``id`` and/or ``abbreviation`` key.
+
+        Returns:
+            int: Team bitmask.
+        """
+        mask = 0
+        for team in user_teams:
+            mask |= self._bits.get(team.get("id")) or self._bits.get(team.get("abbreviation")) or 0
+        return mask
+
+    def match_mask(self, mask):
+        """
+        Return the games involving any team in ``mask``, in scoreboard order.
+        """
+        games = self._matches.get(mask)
+        if games is None:
+            games = [game for game, game_mask in zip(self.games, self._game_masks) if game_mask & mask]
+            self._matches[mask] = games
+        return games
+
+    def match(self, user_teams):
+        """
+        Return the games where any of the user's teams is playing.
+        """
+        return self.match_mask(self.team_mask(user_teams))
+
+    def group_users(self, users):
+        """
+        Group users by identical team mask so each distinct mask is matched once.
+
+        Args:
+            users (iterable): User items with a ``teams`` list. May be a stream; ``users_seen`` counts them.
+
+        Returns:
+            dict: Team mask -> list of users with that mask. Users with no team playing today are dropped.
+        """
+        groups = {}
+        for user in users:
+            self.users_seen += 1
+            mask = self.team_mask(user.get("teams", []))
+            if mask:
+                groups.setdefault(mask, []).append(user)
+        return groups
@@ -1,9 +1,31 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from app.api import users, newsletters, games, teams, players
+from app.api import users, newsletters, games, teams, players, metrics as metrics_api
+from app.core import dynamodb, metrics
+from app.core.config import PROFILING_ENABLED
+from app.services import player_search
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the player autocomplete index before the first keystroke arrives.
+    player_search.get_search_index()
+    metrics.instrument_dynamodb(dynamodb.get_resource())
+    yield
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(metrics.MetricsMiddleware)
 app.include_router(users.router, prefix="/api/users", tags=["users"])
 app.include_router(newsletters.router, prefix="/api/newsletters", tags=["newsletters"])
 app.include_router(games.router, prefix="/api/games", tags=["games"])
 app.include_router(teams.router, prefix="/api/teams", tags=["teams"])
-app.include_router(players.router, prefix="/api/players", tags=["players"])
\ No newline at end of file
+app.include_router(players.router, prefix="/api/players", tags=["players"])
+app.include_router(metrics_api.router, prefix="/metrics", tags=["metrics"])
+
+if PROFILING_ENABLED:
+    # Imported only when enabled, so unprofiled deployments do not load or route through it.
+    from app.api import profiles
+    from app.core.profiling import ProfilingMiddleware
+
+    app.add_middleware(ProfilingMiddleware)
+    app.include_router(profiles.router, prefix="/api/profiles", tags=["profiles"])
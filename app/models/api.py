@@ -1,8 +1,32 @@
 from typing import TypeVar, Generic, Optional
+from decimal import Decimal
+from datetime import date, datetime
 from pydantic.generics import GenericModel
+from fastapi import Response
+import json
+
+try:
+    import orjson
+except ImportError:  # Falls back to the stdlib encoder with the same output.
+    orjson = None
 
 T = TypeVar('T')
 
+def _encode_default(value):
+    # DynamoDB numbers come back as Decimal.
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(value) -> bytes:
+    """Encodes a JSON-ready value to UTF-8 bytes with orjson when available."""
+    if orjson is not None:
+        # Batch lookups are keyed by int IDs; encode them as strings like json.dumps does.
+        return orjson.dumps(value, default=_encode_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=_encode_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
 class APIResponse(GenericModel, Generic[T]):
     """Standard API response wrapper"""
     success: bool
@@ -16,4 +40,20 @@ class APIResponse(GenericModel, Generic[T]):
 
     @classmethod
     def error_response(cls, error: str, message: str = None) -> 'APIResponse[T]':
-        return cls(success=False, error=error, message=message)
\ No newline at end of file
+        return cls(success=False, error=error, message=message)
+
+    @staticmethod
+    def success_body(data, message: str = None) -> bytes:
+        """
+        Serializes a success response straight to JSON bytes, without building or validating a model.
+        Only for trusted service data that is already in the response shape.
+        """
+        return dumps({"success": True, "message": message, "data": data, "error": None})
+
+    @staticmethod
+    def fast_response(data, message: str = None) -> Response:
+        """
+        Returns a success response through the fast path. FastAPI passes a returned Response
+        through as-is, so the route's response_model only documents the shape.
+        """
+        return Response(content=APIResponse.success_body(data, message), media_type="application/json")
@@ -1,10 +1,26 @@
 from nba_api.live.nba.endpoints import scoreboard
 
 from datetime import datetime
+import asyncio
 import pytz
 import os
 
 from app.core.dynamodb import get_table
+from app.core.cache import TTLCache
+from app.core.metrics import nba_api_seconds
+from app.core.archive import GameArchive, KIND_SCOREBOARD, game_date
+from app.core.team_matching import GameMatcher
+from app.core.game_view import project_games, snapshot_version
+from app.services import teams as team_service
+from app.core.config import SCOREBOARD_TTL_SECONDS, SCOREBOARD_STALE_SECONDS, ARCHIVE_DIR
+
+GAME_STATUS_FINAL = 3
+
+# Process-wide snapshot of today's scoreboard shared by every service.
+scoreboard_cache = TTLCache("scoreboard", ttl=SCOREBOARD_TTL_SECONDS, stale_ttl=SCOREBOARD_STALE_SECONDS)
+
+# Final games and box scores, kept so past dates can be served without nba_api.
+game_archive = GameArchive(ARCHIVE_DIR)
 
 def get_today_us_date():
     """
@@ -14,30 +30,149 @@ def get_today_us_date():
     now_est = datetime.now(est)
     return now_est.strftime("%Y-%m-%d")
 
+def archive_final_games(games):
+    """
+    Appends every Final game that is not archived yet.
+    Archiving never fails the request that triggered it.
+    """
+    for game in games:
+        date = game_date(game)
+        if game.get("gameStatus") != GAME_STATUS_FINAL or not date:
+            continue
+        try:
+            game_archive.append(date, game["gameId"], KIND_SCOREBOARD, game)
+        except Exception as e:
+            print(f"[WARN] Failed to archive game {game.get('gameId')}:", e)
+
+def _fetch_today_games():
+    with nba_api_seconds.time("scoreboard"):
+        board = scoreboard.ScoreBoard()
+        games = board.get_dict()["scoreboard"]["games"]
+    archive_final_games(games)
+    return games
+
+def get_today_games():
+    """
+    Returns today's games from the shared scoreboard cache.
+    The upstream scoreboard is fetched at most once per TTL window.
+    """
+    return scoreboard_cache.get("today", _fetch_today_games)
+
+async def get_today_games_async():
+    """
+    Async version of get_today_games.
+    Concurrent callers missing the cache share one in-flight scoreboard fetch.
+    """
+    return await scoreboard_cache.aget("today", _fetch_today_games)
+
+async def refresh_today_games_async():
+    """
+    Reloads today's scoreboard through the shared cache, ignoring the current entry's TTL.
+    Callers missing the cache meanwhile share the same in-flight fetch.
+    """
+    scoreboard_cache.invalidate("today")
+    return await scoreboard_cache.aget("today", _fetch_today_games)
+
 def get_games_by_date(date_str: str = None):
     """
-    Retrieves NBA game data for today (nba_api.live only provides today’s games).
+    Retrieves NBA game data for a date (YYYY-MM-DD, US Eastern Time).
+    Today comes from the live scoreboard; other dates are read from the local archive.
+    """
+    if date_str and date_str != get_today_us_date():
+        return game_archive.get_games(date_str)
+    return get_today_games()
+
+async def get_games_by_date_async(date_str: str = None):
     """
-    # scoreboard.ScoreBoard() only returns today’s games, so date_str is not used here
-    board = scoreboard.ScoreBoard()
-    return board.get_dict()["scoreboard"]["games"]
+    Async version of get_games_by_date.
+    """
+    if date_str and date_str != get_today_us_date():
+        return await asyncio.to_thread(game_archive.get_games, date_str)
+    return await get_today_games_async()
+
+def get_games_in_range(start: str, end: str):
+    """
+    Retrieves games for every date between start and end (inclusive) as {date: games}.
+    Past dates come from the archive in one pass; today, if in range, from the live scoreboard.
+    """
+    games_by_date = game_archive.get_games_in_range(start, end)
+    today = get_today_us_date()
+    if start <= today <= end:
+        games_by_date[today] = get_today_games()
+    return games_by_date
+
+_matcher = None
+
+def get_game_matcher(games):
+    """
+    Returns a GameMatcher for the given games, reused while the scoreboard snapshot is unchanged.
+    """
+    global _matcher
+    matcher = _matcher
+    if matcher is None or matcher.games is not games:
+        matcher = _matcher = GameMatcher(games)
+    return matcher
+
+class GameProjection:
+    """
+    Compact views of one scoreboard snapshot and their JSON payloads, built once per snapshot.
+    """
+
+    def __init__(self, games):
+        self.games = games
+        self.views = project_games(games)
+        self._payloads = {view.gameId: view.to_dict() for view in self.views}
+        self.version = snapshot_version(list(self._payloads.values()))
+
+    def payloads_for(self, games):
+        """
+        Returns the payloads of games from this snapshot (all of them, or a matched subset), in order.
+        """
+        return [self._payloads[game["gameId"]] for game in games]
+
+_projection = None
+
+def get_game_projection(games):
+    """
+    Returns the GameProjection for the given games, reused while the scoreboard snapshot is unchanged.
+    """
+    global _projection
+    projection = _projection
+    if projection is None or projection.games is not games:
+        projection = _projection = GameProjection(games)
+    return projection
+
+def to_game_payloads(games):
+    """
+    Returns compact JSON payloads for any list of games.
+    The current snapshot reuses its projection; other lists (archived dates, subsets) are projected on the fly.
+    """
+    projection = _projection
+    if projection is not None and projection.games is games:
+        return projection.payloads_for(games)
+    return [view.to_dict() for view in project_games(games)]
+
+def find_team_games(games, team: str):
+    """
+    Returns the games in a scoreboard snapshot that involve the team (ID, tricode, nickname or full name).
+    """
+    team_info = team_service.find_team(team)
+    if team_info is None:
+        return []
+    return get_game_matcher(games).match([team_info])
 
 def get_team_game_today(team: str):
     """
     Returns games involving the specified team for today.
-    Matches against team abbreviation or full name (case-insensitive).
+    Matches against team ID, abbreviation, nickname or full name (case-insensitive).
     """
-    games = get_games_by_date()
+    return find_team_games(get_games_by_date(), team)
 
-    team = team.lower()
-    filtered_games = [
-        g for g in games
-        if team in (g["homeTeam"]["teamTricode"].lower(),
-                    g["awayTeam"]["teamTricode"].lower(),
-                    g["homeTeam"]["teamName"].lower(),
-                    g["awayTeam"]["teamName"].lower())
-    ]
-    return filtered_games
+async def get_team_game_today_async(team: str):
+    """
+    Async version of get_team_game_today.
+    """
+    return find_team_games(await get_games_by_date_async(), team)
 
 def get_user_team_games_today(email: str):
     """
@@ -49,11 +184,5 @@ def get_user_team_games_today(email: str):
     if not user:
         raise ValueError("User not found")
 
-    team_ids = [team["id"] for team in user.get("teams", [])]
     games = get_games_by_date()
-
-    filtered_games = [
-        g for g in games
-        if g["homeTeam"]["teamId"] in team_ids or g["awayTeam"]["teamId"] in team_ids
-    ]
-    return filtered_games
\ No newline at end of file
+    return get_game_matcher(games).match(user.get("teams", []))
\ No newline at end of file
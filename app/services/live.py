@@ -0,0 +1,164 @@
+import asyncio
+import json
+
+from app.core.config import LIVE_POLL_INTERVAL_SECONDS
+from app.services import games as game_service
+
+# Events a slow client may fall behind by before it is dropped (it can reconnect for a fresh snapshot).
+SUBSCRIBER_QUEUE_SIZE = 100
+# Seconds of silence after which a comment line is sent to keep proxies from closing the stream.
+KEEPALIVE_SECONDS = 15
+
+def _flatten(value: dict, prefix: str = "", out: dict = None):
+    """
+    Flattens nested dicts into {"homeTeam.score": 101, ...}. Lists are compared as whole values.
+    """
+    out = {} if out is None else out
+    for key, item in value.items():
+        path = f"{prefix}{key}"
+        if isinstance(item, dict):
+            _flatten(item, path + ".", out)
+        else:
+            out[path] = item
+    return out
+
+def diff_games(previous: dict, games: list):
+    """
+    Compares a new scoreboard against the previous flattened snapshot.
+
+    Returns the new snapshot ({gameId: flattened game}) and a list of
+    {"gameId", "changes"} with only the fields that changed (every field for new games).
+    """
+    snapshot = {}
+    diffs = []
+    for game in games:
+        flat = _flatten(game)
+        snapshot[game["gameId"]] = flat
+
+        old = previous.get(game["gameId"])
+        changes = flat if old is None else {path: value for path, value in flat.items() if old.get(path) != value}
+        if changes:
+            diffs.append({"gameId": game["gameId"], "changes": changes})
+    return snapshot, diffs
+
+def _sse(event: str, data):
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+class LiveSubscriber:
+    __slots__ = ("team_id", "queue", "ready")
+
+    def __init__(self, team_id=None):
+        self.team_id = team_id
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        # False until the subscriber has received its snapshot; diffs are only sent after it.
+        self.ready = False
+
+class LiveScoreBroadcaster:
+    """
+    Polls the scoreboard on a fixed interval while anyone is listening and pushes
+    per-game diffs to every subscriber as Server-Sent Events.
+
+    Every subscriber first receives a "snapshot" event with the current games (the
+    compact projection returned by /games/today), then "diff" events of {"gameId", "changes"} where
+    changes maps flattened field paths such as "homeTeam.score" to their new value.
+
+    One upstream poll serves all clients: diffs are computed once per poll and each
+    event payload is serialized once per team filter. Polls load through the shared
+    scoreboard cache, so the REST endpoints reuse them.
+    """
+
+    def __init__(self, interval: float = LIVE_POLL_INTERVAL_SECONDS):
+        self.interval = interval
+        self.polls = 0
+        self._snapshot = {}
+        self._games = None
+        self._game_teams = {}
+        self._subscribers = set()
+        self._task = None
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def _wants(self, subscriber, game_id):
+        return subscriber.team_id is None or subscriber.team_id in self._game_teams.get(game_id, ())
+
+    def subscribe(self, team_id=None):
+        """
+        Registers a subscriber (optionally for one team ID) and starts the poller if it is not running.
+        The snapshot is queued right away if a poll has completed, otherwise after the first poll.
+        """
+        subscriber = LiveSubscriber(team_id)
+        self._subscribers.add(subscriber)
+
+        if self._games is not None:
+            self._send_snapshots([subscriber])
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self._subscribers.discard(subscriber)
+
+    async def _run(self):
+        while self._subscribers:
+            try:
+                await self.poll()
+            except Exception as e:
+                print("[WARN] Live scoreboard poll failed:", e)
+            await asyncio.sleep(self.interval)
+
+    async def poll(self):
+        """
+        Refreshes the scoreboard once, sends snapshots to new subscribers and diffs to the rest.
+        """
+        snapshot = await game_service.refresh_today_games_async()
+        games = game_service.get_game_projection(snapshot).payloads_for(snapshot)
+        self.polls += 1
+
+        self._snapshot, diffs = diff_games(self._snapshot, games)
+        self._games = games
+        self._game_teams = {
+            game["gameId"]: (game["homeTeam"].get("teamId"), game["awayTeam"].get("teamId"))
+            for game in games
+        }
+
+        # Pending subscribers get the snapshot, which already includes this poll's changes.
+        pending = [subscriber for subscriber in self._subscribers if not subscriber.ready]
+        if diffs:
+            self.publish(diffs)
+        self._send_snapshots(pending)
+
+    def _send_snapshots(self, subscribers):
+        payloads = {}
+        for subscriber in subscribers:
+            payload = payloads.get(subscriber.team_id)
+            if payload is None:
+                games = [game for game in self._games if self._wants(subscriber, game["gameId"])]
+                payload = payloads[subscriber.team_id] = _sse("snapshot", games)
+            self._put(subscriber, payload)
+            subscriber.ready = True
+
+    def publish(self, diffs):
+        payloads = {}
+        for subscriber in list(self._subscribers):
+            if not subscriber.ready:
+                continue
+            payload = payloads.get(subscriber.team_id)
+            if payload is None:
+                changed = [diff for diff in diffs if self._wants(subscriber, diff["gameId"])]
+                payload = payloads[subscriber.team_id] = _sse("diff", changed) if changed else ""
+            if payload:
+                self._put(subscriber, payload)
+
+    def _put(self, subscriber, payload):
+        try:
+            subscriber.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Too far behind to catch up with diffs; close the stream so the client reconnects.
+            self.unsubscribe(subscriber)
+            subscriber.queue.get_nowait()
+            subscriber.queue.put_nowait(None)
+
+broadcaster = LiveScoreBroadcaster()
@@ -1,8 +1,20 @@
 from app.core.templates import env
-from app.services.games import get_games_by_date
+from app.core.fragments import FragmentRenderer
+from app.services.games import get_games_by_date, get_game_projection
 from datetime import datetime
 import pytz
 
+_renderer = None
+
+def get_renderer():
+    """
+    Returns the shared FragmentRenderer, so game cards are rendered once per game and scoreboard version.
+    """
+    global _renderer
+    if _renderer is None:
+        _renderer = FragmentRenderer(env.get_template("newsletter.html"))
+    return _renderer
+
 
 def get_today_us_date():
     """
@@ -14,13 +26,14 @@ def get_today_us_date():
     return est_now.date().isoformat()
 
 
-def render_newsletter_html():
+def render_newsletter_html(games=None):
     """
-    Renders the newsletter HTML using today's NBA games.
+    Renders the newsletter HTML using today's NBA games (or the given scoreboard snapshot).
     """
-    template = env.get_template("newsletter.html")
-    games = get_games_by_date()
+    if games is None:
+        games = get_games_by_date()
     date = get_today_us_date()
 
-    html = template.render(games=games, date=date)
-    return html
\ No newline at end of file
+    projection = get_game_projection(games)
+    html = get_renderer().render(date, projection.views, projection.version)
+    return html
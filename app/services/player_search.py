@@ -0,0 +1,115 @@
+from nba_api.stats.static import players
+from collections import Counter
+import threading
+
+from app.services.players import normalize_name
+
+# Most results the autocomplete endpoint returns, and so the most each trie node keeps.
+AUTOCOMPLETE_MAX_RESULTS = 10
+
+# Minimum Dice similarity for a trigram (typo-tolerant) match.
+TRIGRAM_MIN_SIMILARITY = 0.35
+
+def _trigrams(text: str):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class PlayerSearchIndex:
+    """
+    Prebuilt autocomplete index over normalized player names.
+
+    A prefix trie is keyed by the full name and by each later word in it
+    ("lebron james" and "james"), and every node stores its best
+    AUTOCOMPLETE_MAX_RESULTS players already ranked (active players first, then by name),
+    so a prefix lookup is one walk down the trie. A trigram index backs it up for typos.
+    """
+
+    def __init__(self, player_list):
+        self.players = player_list
+        self._names = [normalize_name(player["full_name"]) for player in player_list]
+        self._rank = sorted(
+            range(len(player_list)),
+            key=lambda i: (not player_list[i]["is_active"], self._names[i])
+        )
+        self._position = {idx: position for position, idx in enumerate(self._rank)}
+        self._root = ({}, [])
+        self._trigrams = {}
+
+        # Inserting in rank order keeps every node's top list sorted without re-sorting.
+        for idx in self._rank:
+            words = self._names[idx].split()
+            for start in range(len(words)):
+                self._insert(" ".join(words[start:]), idx)
+            for trigram in _trigrams(self._names[idx]):
+                self._trigrams.setdefault(trigram, []).append(idx)
+
+    def _insert(self, key, idx):
+        node = self._root
+        for char in key:
+            children = node[0]
+            node = children.get(char)
+            if node is None:
+                node = children[char] = ({}, [])
+            top = node[1]
+            if len(top) < AUTOCOMPLETE_MAX_RESULTS and idx not in top:
+                top.append(idx)
+
+    def _prefix_matches(self, query):
+        node = self._root
+        for char in query:
+            node = node[0].get(char)
+            if node is None:
+                return []
+        return node[1]
+
+    def _fuzzy_matches(self, query, exclude, limit):
+        query_trigrams = _trigrams(query)
+        counts = Counter()
+        for trigram in query_trigrams:
+            counts.update(self._trigrams.get(trigram, ()))
+
+        scored = []
+        for idx, common in counts.items():
+            if idx in exclude:
+                continue
+            similarity = 2 * common / (len(query_trigrams) + len(self._names[idx]) + 1)
+            if similarity >= TRIGRAM_MIN_SIMILARITY:
+                scored.append((not self.players[idx]["is_active"], -similarity, self._position[idx], idx))
+
+        scored.sort()
+        return [entry[-1] for entry in scored[:limit]]
+
+    def autocomplete(self, query: str, limit: int = AUTOCOMPLETE_MAX_RESULTS):
+        """
+        Returns up to limit players whose name (or any later word of it) starts with query,
+        topped up with typo-tolerant trigram matches.
+        """
+        query = normalize_name(query)
+        limit = min(limit, AUTOCOMPLETE_MAX_RESULTS)
+        if not query or limit <= 0:
+            return []
+
+        matches = self._prefix_matches(query)[:limit]
+        if len(matches) < limit:
+            matches = matches + self._fuzzy_matches(query, set(matches), limit - len(matches))
+        return [self.players[idx] for idx in matches]
+
+_search_index = None
+_search_index_lock = threading.Lock()
+
+def get_search_index():
+    """
+    Returns the player search index, building it on first use.
+    """
+    global _search_index
+    if _search_index is None:
+        with _search_index_lock:
+            if _search_index is None:
+                _search_index = PlayerSearchIndex(players.get_players())
+    return _search_index
+
+def autocomplete_players(query: str, limit: int = AUTOCOMPLETE_MAX_RESULTS):
+    """
+    Returns the top matching players for a partial or misspelled name.
+    """
+    return get_search_index().autocomplete(query, limit)
@@ -1,9 +1,33 @@
 from nba_api.stats.static import players
 from nba_api.live.nba.endpoints import boxscore
-from nba_api.live.nba.endpoints import scoreboard
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import asyncio
+import re
+import threading
+import unicodedata
 import pytz
 
+from app.core.cache import TTLCache
+from app.core.metrics import nba_api_seconds
+from app.core.config import BOXSCORE_LIVE_TTL_SECONDS, BOXSCORE_FINAL_TTL_SECONDS, BOXSCORE_MAX_WORKERS
+from app.core.archive import KIND_BOXSCORE, game_date
+from app.services import games as game_service
+from app.services.games import GAME_STATUS_FINAL, get_today_games, get_today_games_async
+
+def _boxscore_ttl(game_box):
+    # A Final box score can no longer change; keep it for hours, then let past days fall out
+    # of memory (they are served from the archive if asked for again).
+    if game_box.get("gameStatus") == GAME_STATUS_FINAL:
+        return BOXSCORE_FINAL_TTL_SECONDS
+    return BOXSCORE_LIVE_TTL_SECONDS
+
+boxscore_cache = TTLCache("boxscore", ttl=_boxscore_ttl)
+_boxscore_executor = ThreadPoolExecutor(max_workers=BOXSCORE_MAX_WORKERS, thread_name_prefix="boxscore")
+# Async loads run on their own pool: sync followers block _boxscore_executor workers on
+# in-flight loads, so a leader's load queued behind them there could never start.
+_boxscore_load_executor = ThreadPoolExecutor(max_workers=BOXSCORE_MAX_WORKERS, thread_name_prefix="boxscore-load")
+
 def search_players(search: str):
     """
     Search NBA players by full name.
@@ -16,53 +40,175 @@ def get_today_us_date():
     return datetime.now(est).strftime("%Y-%m-%d")
 
 def get_today_game_ids():
-    board = scoreboard.ScoreBoard()
-    games = board.get_dict()["scoreboard"]["games"]
-    return [game["gameId"] for game in games]
+    return [game["gameId"] for game in get_today_games()]
+
+async def get_today_game_ids_async():
+    return [game["gameId"] for game in await get_today_games_async()]
+
+def _fetch_boxscore(game_id):
+    # Final box scores survive restarts in the archive, so only live games hit nba_api.
+    archived = game_service.game_archive.get_boxscore(game_id)
+    if archived is not None:
+        return archived
+
+    with nba_api_seconds.time("boxscore"):
+        game_box = boxscore.BoxScore(game_id).get_dict()["game"]
+
+    date = game_date(game_box)
+    if game_box.get("gameStatus") == GAME_STATUS_FINAL and date:
+        try:
+            game_service.game_archive.append(date, game_id, KIND_BOXSCORE, game_box)
+        except Exception as e:
+            print(f"[WARN] Failed to archive box score {game_id}:", e)
+    return game_box
+
+def get_boxscore(game_id):
+    """
+    Returns the box score for a game.
+    Live box scores are cached briefly; Final box scores for BOXSCORE_FINAL_TTL_SECONDS.
+    """
+    return boxscore_cache.get(game_id, lambda: _fetch_boxscore(game_id))
+
+async def get_boxscore_async(game_id):
+    """
+    Async version of get_boxscore.
+    Concurrent callers for the same game share one in-flight fetch.
+    """
+    return await boxscore_cache.aget(game_id, lambda: _fetch_boxscore(game_id), _boxscore_load_executor)
+
+def get_today_boxscores():
+    """
+    Fetches box scores for all of today's games concurrently, in scoreboard order.
+    """
+    return list(_boxscore_executor.map(get_boxscore, get_today_game_ids()))
+
+async def get_today_boxscores_async():
+    """
+    Async version of get_today_boxscores.
+    """
+    game_ids = await get_today_game_ids_async()
+    return list(await asyncio.gather(*(get_boxscore_async(game_id) for game_id in game_ids)))
+
+def _format_player_stats(player):
+    stats = player["statistics"]
+    return {
+        "name": player["name"],
+        "starter": player["starter"],
+        "points": stats["points"],
+        "rebounds": stats["rebounds"],
+        "assists": stats["assists"],
+        "minutes": stats["minutes"]
+    }
+
+NO_STATS_MESSAGE = "No stats found for the player today."
+
+def normalize_name(name: str):
+    """
+    Lowercases a player name and strips accents, punctuation and extra whitespace.
+    ex: "Luka Dončić" -> "luka doncic", "D'Angelo Russell" -> "dangelo russell"
+    """
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    return " ".join(re.sub(r"[^\w\s]", "", name.lower()).split())
+
+class PlayerIndex:
+    """
+    Lookup tables over every player in a set of box scores.
+    Built once per box score refresh and shared by all lookups until the next one.
+    """
+
+    def __init__(self, boxscores):
+        # Keep the box scores alive so their ids stay a valid version key.
+        self.boxscores = boxscores
+        self.key = tuple(map(id, boxscores))
+        self.by_id = {}
+        self.by_name = {}
+
+        for game_box in boxscores:
+            for player in game_box["homeTeam"]["players"] + game_box["awayTeam"]["players"]:
+                if "personId" in player:
+                    self.by_id.setdefault(int(player["personId"]), player)
+                self.by_name.setdefault(normalize_name(player["name"]), player)
+
+    def find_by_name(self, player_name: str):
+        name = normalize_name(player_name)
+        player = self.by_name.get(name)
+        if player is not None or not name:
+            return player
+
+        # Fall back to partial names such as "lebron" or "curry".
+        for indexed_name, player in self.by_name.items():
+            if name in indexed_name:
+                return player
+        return None
+
+_player_index = None
+_player_index_lock = threading.Lock()
+
+def _index_for(boxscores):
+    global _player_index
+
+    key = tuple(map(id, boxscores))
+    with _player_index_lock:
+        if _player_index is None or _player_index.key != key:
+            _player_index = PlayerIndex(boxscores)
+        return _player_index
+
+def get_player_index():
+    """
+    Returns the player index for today's box scores, rebuilding it only when a box score was refreshed.
+    """
+    return _index_for(get_today_boxscores())
+
+async def get_player_index_async():
+    """
+    Async version of get_player_index.
+    """
+    return _index_for(await get_today_boxscores_async())
+
+def _stats_or_message(player):
+    if player is None:
+        return {"message": NO_STATS_MESSAGE}
+    return _format_player_stats(player)
 
 def get_player_stats_by_id(player_id: int):
     """
     Retrieves today's box score stats for a specific player by their ID.
     """
-    for game_id in get_today_game_ids():
-        game_box = boxscore.BoxScore(game_id).get_dict()["game"]
+    return _stats_or_message(get_player_index().by_id.get(player_id))
 
-        players = game_box["homeTeam"]["players"] + game_box["awayTeam"]["players"]
+async def get_player_stats_by_id_async(player_id: int):
+    """
+    Async version of get_player_stats_by_id.
+    """
+    index = await get_player_index_async()
+    return _stats_or_message(index.by_id.get(player_id))
 
-        for player in players:
-            if int(player["personId"]) == player_id:
-                stats = player["statistics"]
-                return {
-                    "name": player["name"],
-                    "starter": player["starter"],
-                    "points": stats["points"],
-                    "rebounds": stats["rebounds"],
-                    "assists": stats["assists"],
-                    "minutes": stats["minutes"]
-                }
+def _stats_by_ids(index, player_ids):
+    return {player_id: _stats_or_message(index.by_id.get(player_id)) for player_id in player_ids}
 
-    return {"message": "No stats found for the player today."}
+def get_player_stats_by_ids(player_ids: list[int]):
+    """
+    Retrieves today's box score stats for several players with one index lookup per ID.
+    Returns a dict keyed by player ID.
+    """
+    return _stats_by_ids(get_player_index(), player_ids)
+
+async def get_player_stats_by_ids_async(player_ids: list[int]):
+    """
+    Async version of get_player_stats_by_ids.
+    """
+    return _stats_by_ids(await get_player_index_async(), player_ids)
 
 def get_player_stats_by_name(player_name: str):
     """
     Retrieves today's box score stats for a player matching the given name.
     """
-    player_name = player_name.lower()
+    return _stats_or_message(get_player_index().find_by_name(player_name))
 
-    for game_id in get_today_game_ids():
-        game_box = boxscore.BoxScore(game_id).get_dict()["game"]
-        players = game_box["homeTeam"]["players"] + game_box["awayTeam"]["players"]
-
-        for player in players:
-            if player_name in player["name"].lower():
-                stats = player["statistics"]
-                return {
-                    "name": player["name"],
-                    "starter": player["starter"],
-                    "points": stats["points"],
-                    "rebounds": stats["rebounds"],
-                    "assists": stats["assists"],
-                    "minutes": stats["minutes"]
-                }
-
-    return {"message": "No stats found for the player today."}
\ No newline at end of file
+async def get_player_stats_by_name_async(player_name: str):
+    """
+    Async version of get_player_stats_by_name.
+    """
+    index = await get_player_index_async()
+    return _stats_or_message(index.find_by_name(player_name))
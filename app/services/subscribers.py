@@ -0,0 +1,116 @@
+from botocore.exceptions import ClientError
+
+from app.core.dynamodb import get_table, scan_items, transact_write
+
+import os
+
+USERS_TABLE_NAME = os.getenv("USERS_TABLE_NAME", "users")
+TEAM_SUBSCRIBERS_TABLE_NAME = os.getenv("TEAM_SUBSCRIBERS_TABLE_NAME", "team_subscribers")
+# Marks the index as backfilled; the producer reads the users table until it exists.
+# No team has ID 0, so the marker never shows up in a team's partition.
+TEAM_INDEX_READY_KEY = {"team_id": 0, "email": "#backfill-complete"}
+
+# Attempts for a user write that keeps losing the race against another write to the same user.
+USER_WRITE_MAX_ATTEMPTS = 3
+
+def _team_ids(teams):
+    return {int(team["id"]) for team in teams or []}
+
+def sync_team_index(email: str, old_teams, new_teams):
+    """
+    Updates the team -> subscribers index after a user's teams change.
+
+    The index holds one item per (team_id, email) with a copy of the user's full team list,
+    so the producer can query only the teams playing today and still match every team a subscriber follows.
+    """
+    table = get_table(TEAM_SUBSCRIBERS_TABLE_NAME)
+    new_team_ids = _team_ids(new_teams)
+
+    with table.batch_writer() as batch:
+        for team_id in _team_ids(old_teams) - new_team_ids:
+            batch.delete_item(Key={"team_id": team_id, "email": email})
+        for team_id in new_team_ids:
+            batch.put_item(Item={"team_id": team_id, "email": email, "teams": new_teams})
+
+def _index_writes(email: str, old_teams, new_teams):
+    new_team_ids = _team_ids(new_teams)
+    writes = [
+        {"Delete": {"TableName": TEAM_SUBSCRIBERS_TABLE_NAME, "Key": {"team_id": team_id, "email": email}}}
+        for team_id in _team_ids(old_teams) - new_team_ids
+    ]
+    writes += [
+        {"Put": {"TableName": TEAM_SUBSCRIBERS_TABLE_NAME, "Item": {"team_id": team_id, "email": email, "teams": new_teams}}}
+        for team_id in new_team_ids
+    ]
+    return writes
+
+def _teams_unchanged(old_item):
+    # Guards the transaction against another write to the user's teams since we read them.
+    if "teams" in old_item:
+        return {"ConditionExpression": "teams = :old_teams", "ExpressionAttributeValues": {":old_teams": old_item["teams"]}}
+    return {"ConditionExpression": "attribute_not_exists(teams)"}
+
+def _write_user_and_index(email: str, user_write, new_teams):
+    """
+    Applies a write to the user's row together with the matching index changes in one transaction,
+    so the index can never disagree with the users table. Retries if the user changed meanwhile.
+    Returns the user item as it was before the write.
+    """
+    users = get_table(USERS_TABLE_NAME)
+    for attempt in range(1, USER_WRITE_MAX_ATTEMPTS + 1):
+        old_item = users.get_item(Key={"email": email}).get("Item", {})
+        try:
+            transact_write([user_write(old_item), *_index_writes(email, old_item.get("teams", []), new_teams)])
+            return old_item
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "TransactionCanceledException" or attempt == USER_WRITE_MAX_ATTEMPTS:
+                raise
+
+def update_user_teams(email: str, teams, updated_at: str):
+    """
+    Sets a user's teams and updates the team -> subscribers index atomically.
+    Returns the updated user item.
+    """
+    def user_write(old_item):
+        condition = _teams_unchanged(old_item)
+        return {"Update": {
+            "TableName": USERS_TABLE_NAME,
+            "Key": {"email": email},
+            "UpdateExpression": "SET teams = :teams, updated_at = :updated_at",
+            **condition,
+            "ExpressionAttributeValues": {
+                ":teams": teams,
+                ":updated_at": updated_at,
+                **condition.get("ExpressionAttributeValues", {})
+            }
+        }}
+
+    old_item = _write_user_and_index(email, user_write, teams)
+    return {**old_item, "email": email, "teams": teams, "updated_at": updated_at}
+
+def delete_user(email: str):
+    """
+    Deletes a user and their team -> subscribers index items atomically.
+    Returns the deleted user item ({} if there was none).
+    """
+    def user_write(old_item):
+        return {"Delete": {"TableName": USERS_TABLE_NAME, "Key": {"email": email}, **_teams_unchanged(old_item)}}
+
+    return _write_user_and_index(email, user_write, [])
+
+def rebuild_team_index():
+    """
+    Writes index items for every user in the users table.
+    Run once after creating the team_subscribers table (python -m app.services.subscribers).
+    Until it has completed the producer falls back to scanning the users table.
+    """
+    users = get_table(USERS_TABLE_NAME)
+    count = 0
+    for user in scan_items(users, attributes=("email", "teams")):
+        sync_team_index(user["email"], [], user.get("teams", []))
+        count += 1
+    get_table(TEAM_SUBSCRIBERS_TABLE_NAME).put_item(Item=dict(TEAM_INDEX_READY_KEY))
+    return count
+
+if __name__ == "__main__":
+    print(f"Indexed {rebuild_team_index()} users into {TEAM_SUBSCRIBERS_TABLE_NAME}")
@@ -1,14 +1,86 @@
 from nba_api.stats.static import teams
+from types import MappingProxyType
+
+class TeamIndex:
+    """
+    Immutable lookup tables over the static NBA team list.
+    Built once at startup so team lookups are O(1) dict probes without per-request allocations.
+    """
+
+    def __init__(self, team_list):
+        self.team_list = tuple(team_list)
+
+        by_id = {}
+        by_key = {}
+        subscriptions = {}
+        for team in self.team_list:
+            by_id[team["id"]] = team
+            for key in (team["abbreviation"], team["nickname"], team["full_name"]):
+                by_key[key.lower()] = team
+            # Shape stored on users in DynamoDB.
+            subscriptions[team["id"]] = MappingProxyType({
+                "id": team["id"],
+                "name": team["full_name"],
+                "abbreviation": team["abbreviation"]
+            })
+
+        self.by_id = MappingProxyType(by_id)
+        self.by_key = MappingProxyType(by_key)
+        self.subscriptions = MappingProxyType(subscriptions)
+
+    def find(self, value):
+        """
+        Returns the team matching an ID, tricode, nickname or full name (case-insensitive), or None.
+        """
+        value = str(value).strip().lower()
+        if value.isdigit():
+            return self.by_id.get(int(value))
+        return self.by_key.get(value)
+
+_team_index = None
+
+def load_team_index():
+    """
+    Builds the team index from nba_api's static team list.
+    """
+    global _team_index
+    _team_index = TeamIndex(teams.get_teams())
+    return _team_index
+
+def get_team_index():
+    return _team_index or load_team_index()
 
 def get_team_list():
     """
     Returns a list of all NBA teams.
+    Each call gets its own copy, so callers cannot change the shared index.
+    """
+    return [dict(team) for team in get_team_index().team_list]
+
+def find_team(value):
+    """
+    Returns a single team by ID, tricode, nickname or full name, or None.
     """
-    return teams.get_teams()
+    return get_team_index().find(value)
+
+def get_teams_by_ids(team_ids):
+    """
+    Returns the subscription form ({id, name, abbreviation}) of each known team ID, in request order.
+    Unknown and duplicate IDs are skipped.
+    """
+    subscriptions = get_team_index().subscriptions
+    return [dict(subscriptions[team_id]) for team_id in dict.fromkeys(team_ids) if team_id in subscriptions]
 
 def get_team_by_name(team_name: str):
     """
-    Retrieves NBA team information by team ID.
+    Retrieves NBA team information by ID, tricode, nickname or full name.
+    Falls back to partial full-name matches (ex: "Los Angeles") when there is no exact match.
     """
-    team = teams.find_teams_by_full_name(team_name)
-    return team
\ No newline at end of file
+    team = find_team(team_name)
+    if team is not None:
+        return [dict(team)]
+
+    team_name = team_name.strip().lower()
+    return [dict(team) for team in get_team_index().team_list if team_name in team["full_name"].lower()]
+
+load_team_index()
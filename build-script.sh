@@ -15,7 +15,14 @@ mkdir -p "$PRODUCER_BUILD"
 
 pip3 install -r "$PRODUCER_DIR/requirements.txt" -t "$PRODUCER_BUILD"
 cp "$PRODUCER_DIR/producer_lambda.py" "$PRODUCER_BUILD"
+cp app/core/team_matching.py "$PRODUCER_BUILD/team_matching.py"
+cp app/core/dynamodb.py "$PRODUCER_BUILD/dynamodb.py"
+cp app/core/game_view.py "$PRODUCER_BUILD/game_view.py"
+cp app/core/fragments.py "$PRODUCER_BUILD/fragments.py"
+cp app/core/emf.py "$PRODUCER_BUILD/emf.py"
 cp "$PRODUCER_DIR/newsletter_template.html" "$PRODUCER_BUILD/"
+# Precompile the template with the packaged Jinja2 so cold starts load bytecode instead of parsing it.
+PYTHONPATH="$PRODUCER_BUILD" python3 "$PRODUCER_DIR/compile_templates.py" "$PRODUCER_BUILD/compiled_templates"
 
 (cd "$PRODUCER_BUILD" && zip -r "../$(basename "$PRODUCER_ZIP")" . > /dev/null)
 
@@ -28,6 +35,7 @@ mkdir -p "$CONSUMER_BUILD"
 
 pip3 install -r "$CONSUMER_DIR/requirements.txt" -t "$CONSUMER_BUILD"
 cp "$CONSUMER_DIR/consumer_lambda.py" "$CONSUMER_BUILD"
+cp app/core/emf.py "$CONSUMER_BUILD/emf.py"
 
 (cd "$CONSUMER_BUILD" && zip -r "../$(basename "$CONSUMER_ZIP")" . > /dev/null)
 
@@ -1,24 +1,247 @@
 import json
 import os
+import queue
 import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from email.message import EmailMessage
+from functools import partial
 
-def send_email(to_email, subject, html_body):
+from emf import MetricsLogger
+
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", "10"))
+
+# Concurrent SMTP sessions (and sending threads) per container.
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "3"))
+SMTP_MAX_ATTEMPTS = int(os.getenv("SMTP_MAX_ATTEMPTS", "3"))
+
+# Provider quotas. Gmail allows roughly 500 messages per day for a personal account.
+SMTP_RATE_PER_SECOND = float(os.getenv("SMTP_RATE_PER_SECOND", "5"))
+SMTP_DAILY_QUOTA = int(os.getenv("SMTP_DAILY_QUOTA", "500"))
+
+# Errors that mean the session itself is unusable, as opposed to a rejected message.
+SMTP_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError)
+
+# Transient "slow down" replies: service not available, mailbox busy, local error, insufficient storage.
+SMTP_THROTTLE_CODES = {421, 450, 451, 452}
+
+
+class DailyQuotaExceeded(Exception):
+    pass
+
+
+class RateLimiter:
+    """
+    Token bucket for the provider's per-second and per-day sending quotas.
+
+    The refill rate is halved whenever the server answers with a throttling reply
+    and grows back gradually on successful sends. The daily count is kept per
+    container and resets at UTC midnight.
+    """
+
+    def __init__(self, rate_per_second, daily_quota, min_rate=0.5):
+        self.max_rate = rate_per_second
+        self.rate = rate_per_second
+        self.min_rate = min(min_rate, rate_per_second)
+        self.capacity = max(1.0, rate_per_second)
+        self.tokens = self.capacity
+        self.daily_quota = daily_quota
+        self.sent_today = 0
+        self._day = time.gmtime().tm_yday
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a send is allowed. Raises DailyQuotaExceeded once the day's quota is used up.
+        """
+        while True:
+            with self._lock:
+                today = time.gmtime().tm_yday
+                if today != self._day:
+                    self._day, self.sent_today = today, 0
+                if self.daily_quota and self.sent_today >= self.daily_quota:
+                    raise DailyQuotaExceeded(f"Daily quota of {self.daily_quota} messages reached")
+
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.sent_today += 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def throttle(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0
+
+    def recover(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+
+
+class SMTPConnectionPool:
+    """
+    A small pool of authenticated SMTP sessions reused across messages and warm invocations.
+    Sessions are opened lazily and discarded when they fail at the connection level.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.connects = 0
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS)
+        if SMTP_STARTTLS:
+            server.starttls()
+        if os.getenv("GMAIL_APP_PASSWORD"):
+            server.login(os.getenv("GMAIL_ADDRESS"), os.getenv("GMAIL_APP_PASSWORD"))
+        self.connects += 1
+        return server
+
+    @contextmanager
+    def connection(self):
+        with self._slots:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                server = self._connect()
+
+            try:
+                yield server
+            except Exception as e:
+                if isinstance(e, SMTP_CONNECTION_ERRORS) or getattr(e, "smtp_code", None) == 421:
+                    _close_quietly(server)
+                else:
+                    self._idle.put(server)
+                raise
+            else:
+                self._idle.put(server)
+
+    def close_all(self):
+        while True:
+            try:
+                _close_quietly(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+def _close_quietly(server):
+    try:
+        server.quit()
+    except Exception:
+        server.close()
+
+
+_pool = SMTPConnectionPool(SMTP_POOL_SIZE)
+_limiter = RateLimiter(SMTP_RATE_PER_SECOND, SMTP_DAILY_QUOTA)
+_executor = ThreadPoolExecutor(max_workers=SMTP_POOL_SIZE)
+# Used when send_email is called outside a handler invocation.
+_no_metrics = MetricsLogger("consumer", enabled=False)
+
+# Summary fields reported as CloudWatch metrics: summary key -> (metric name, unit).
+SUMMARY_METRICS = {
+    "sent": ("Sent", "Count"),
+    "failed": ("Failed", "Count"),
+    "messages_per_second": ("MessagesPerSecond", "Count/Second"),
+}
+
+def build_message(to_email, subject, html_body):
     msg = EmailMessage()
     msg["Subject"] = subject
     msg["From"] = os.getenv("GMAIL_ADDRESS")
     msg["To"] = to_email
     msg.set_content("Your email client does not support HTML.")
     msg.add_alternative(html_body, subtype="html")
+    return msg
 
-    with smtplib.SMTP("smtp.gmail.com", 587) as server:
-        server.starttls()
-        server.login(os.getenv("GMAIL_ADDRESS"), os.getenv("GMAIL_APP_PASSWORD"))
-        server.send_message(msg)
+def send_email(to_email, subject, html_body, metrics=_no_metrics):
+    """
+    Send one email through the connection pool within the rate limit.
 
-def lambda_handler(event, context):
-    for record in event["Records"]:
+    A lost session is replaced and a throttling reply (421/450/451/452) slows the
+    limiter down before retrying, up to SMTP_MAX_ATTEMPTS. Other errors are raised.
+    Rate limit waits, SMTP send latency, reconnects and throttles are recorded in metrics.
+    """
+    msg = build_message(to_email, subject, html_body)
+
+    for attempt in range(SMTP_MAX_ATTEMPTS):
+        with metrics.stage("RateLimitWait"):
+            _limiter.acquire()
+        try:
+            started = time.perf_counter()
+            with _pool.connection() as server:
+                server.send_message(msg)
+            metrics.observe("SmtpSendLatency", (time.perf_counter() - started) * 1000)
+            _limiter.recover()
+            return
+        except SMTP_CONNECTION_ERRORS as e:
+            print("[WARN] SMTP session lost, reconnecting:", e)
+            metrics.increment("SmtpReconnects")
+            error = e
+        except smtplib.SMTPResponseException as e:
+            if e.smtp_code not in SMTP_THROTTLE_CODES:
+                raise
+            print(f"[WARN] SMTP server throttled ({e.smtp_code}), slowing down")
+            metrics.increment("SmtpThrottled")
+            _limiter.throttle()
+            time.sleep(0.5 * 2 ** attempt)
+            error = e
+
+    raise error
+
+def _process_record(record, metrics=_no_metrics):
+    try:
         body = json.loads(record["body"])
-        send_email(body["email"], body["subject"], body["html_body"])
+        send_email(body["email"], body["subject"], body["html_body"], metrics)
+        return None
+    except Exception as e:
+        print(f"[ERROR] Failed to send message {record.get('messageId')}:", e)
+        return {"itemIdentifier": record["messageId"]}
+
+def lambda_handler(event, context):
+    """
+    Send one email per SQS record, several at a time over pooled SMTP sessions.
+
+    Failed records are returned in batchItemFailures (ReportBatchItemFailures),
+    so SQS only redelivers the messages that actually failed.
+    """
+    started = time.perf_counter()
+    records = event["Records"]
+    metrics = MetricsLogger(os.getenv("AWS_LAMBDA_FUNCTION_NAME", "consumer"))
+    if context is not None:
+        metrics.set_property("requestId", context.aws_request_id)
+    connects = _pool.connects
+
+    failures = [failure for failure in _executor.map(partial(_process_record, metrics=metrics), records) if failure]
+
+    seconds = time.perf_counter() - started
+    sent = len(records) - len(failures)
+    summary = {
+        "sent": sent,
+        "failed": len(failures),
+        "seconds": round(seconds, 3),
+        "messages_per_second": round(sent / seconds, 1) if seconds else 0.0
+    }
+    metrics.put_summary(summary, SUMMARY_METRICS)
+    metrics.put("Records", len(records))
+    metrics.put("SmtpConnects", _pool.connects - connects)
+    metrics.add_time("Handler", seconds)
+    metrics.flush()
 
-    return {"statusCode": 200, "message": "Emails sent"}
\ No newline at end of file
+    return {
+        "statusCode": 200,
+        "message": f"{sent} emails sent",
+        "summary": summary,
+        "batchItemFailures": failures
+    }
@@ -0,0 +1,31 @@
+"""
+Precompile the newsletter template into Python modules shipped with the producer zip.
+
+producer_lambda.load_template() loads them with jinja2.ModuleLoader, so a cold start
+imports ready bytecode instead of lexing, parsing and compiling the template source.
+Run by build-script.sh with the Jinja2 version that is packaged into the zip:
+
+    python compile_templates.py <build dir>/compiled_templates
+"""
+import os
+import sys
+
+from jinja2 import Environment, FileSystemLoader
+
+TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def compile_templates(target_dir):
+    """
+    Compile every .html template next to this script into target_dir.
+
+    Args:
+        target_dir (str): Output directory for the compiled template modules.
+    """
+    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+    os.makedirs(target_dir, exist_ok=True)
+    env.compile_templates(target_dir, zip=None, filter_func=lambda name: name.endswith(".html"), ignore_errors=False)
+
+
+if __name__ == "__main__":
+    compile_templates(sys.argv[1])
@@ -1,20 +1,98 @@
-import boto3
 import os
 import json
-from nba_api.live.nba.endpoints import scoreboard
-from jinja2 import Environment, FileSystemLoader
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from team_matching import GameMatcher
+from game_view import project_games, snapshot_version
+from fragments import FragmentRenderer
+from dynamodb import get_table, query_items, scan_items
+from emf import MetricsLogger
+
+# boto3, nba_api and Jinja2 are imported, and clients and templates created, on first use,
+# so a cold start only pays for what the invocation actually needs (e.g. nothing on a day without games).
 
 # --- AWS Resource Setup ---
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table("users")
-sqs = boto3.client("sqs")
+TEAM_SUBSCRIBERS_TABLE_NAME = os.getenv("TEAM_SUBSCRIBERS_TABLE_NAME", "team_subscribers")
+USERS_TABLE_NAME = os.getenv("USERS_TABLE_NAME", "users")
+# Written by rebuild_team_index once every user is indexed (app/services/subscribers.py).
+TEAM_INDEX_READY_KEY = {"team_id": 0, "email": "#backfill-complete"}
 SQS_URL = os.getenv("SQS_QUEUE_URL")
+team_index_table = None
+users_table = None
+sqs = None
+
+# SendMessageBatch limits: 10 entries and 256 KiB of message bodies per call.
+SQS_BATCH_MAX_ENTRIES = 10
+SQS_BATCH_MAX_BYTES = 256 * 1024
+SQS_MAX_WORKERS = int(os.getenv("SQS_MAX_WORKERS", "4"))
+SQS_MAX_ATTEMPTS = int(os.getenv("SQS_MAX_ATTEMPTS", "3"))
+
+# Summary fields reported as CloudWatch metrics: summary key -> (metric name, unit).
+SUMMARY_METRICS = {
+    "teams_playing": ("TeamsPlaying", "Count"),
+    "users": ("UsersScanned", "Count"),
+    "newsletters": ("Newsletters", "Count"),
+    "team_masks": ("TeamMasks", "Count"),
+    "distinct_digests": ("DistinctDigests", "Count"),
+    "render_cache_hit_rate": ("RenderCacheHitRate", "None"),
+    "card_renders": ("CardRenders", "Count"),
+    "sqs_sent": ("SqsSent", "Count"),
+    "sqs_failed": ("SqsFailed", "Count"),
+    "sqs_batches": ("SqsBatches", "Count"),
+    "sqs_messages_per_second": ("SqsMessagesPerSecond", "Count/Second"),
+}
 
 # --- Jinja2 Template Setup ---
 template_dir = os.path.dirname(os.path.abspath(__file__))
-env = Environment(loader=FileSystemLoader(template_dir))
-template = env.get_template("newsletter_template.html")
+# build-script.sh precompiles the template into this directory so cold starts skip parsing it.
+COMPILED_TEMPLATES_DIR = os.path.join(template_dir, "compiled_templates")
+TEMPLATE_NAME = "newsletter_template.html"
+template = None
+# Each game card is rendered once per snapshot and shared by every digest that includes it.
+renderer = None
+
+def get_team_index_table():
+    global team_index_table
+    if team_index_table is None:
+        team_index_table = get_table(TEAM_SUBSCRIBERS_TABLE_NAME)
+    return team_index_table
+
+def get_users_table():
+    global users_table
+    if users_table is None:
+        users_table = get_table(USERS_TABLE_NAME)
+    return users_table
+
+def get_sqs():
+    global sqs
+    if sqs is None:
+        import boto3
+        sqs = boto3.client("sqs", endpoint_url=os.getenv("SQS_ENDPOINT_URL"))
+    return sqs
+
+def load_template():
+    """
+    Load the newsletter template, from the precompiled module when the build shipped one.
+
+    Returns:
+        jinja2.Template: The newsletter template.
+    """
+    from jinja2 import Environment, FileSystemLoader, ModuleLoader
+
+    if os.path.isdir(COMPILED_TEMPLATES_DIR):
+        env = Environment(loader=ModuleLoader(COMPILED_TEMPLATES_DIR))
+    else:
+        env = Environment(loader=FileSystemLoader(template_dir))
+    return env.get_template(TEMPLATE_NAME)
+
+def get_renderer():
+    global template, renderer
+    if renderer is None:
+        if template is None:
+            template = load_template()
+        renderer = FragmentRenderer(template)
+    return renderer
 
 def get_today_games():
     """
@@ -23,56 +101,171 @@ def get_today_games():
     Returns:
         list: A list of game dictionaries for today.
     """
+    from nba_api.live.nba.endpoints import scoreboard
+
     return scoreboard.ScoreBoard().get_dict()["scoreboard"]["games"]
 
-def get_user_matched_games(user_teams, games):
+def get_today_subscribers(games):
     """
-    Filter games where the user's favorite teams are playing.
+    Yield the subscribers of teams playing today from the team -> subscribers index.
+    Only partitions for today's teams are read, so cost scales with affected
+    subscribers rather than the whole users table. Until the backfill has written its
+    completion marker, every user is read from the users table instead: subscribes and
+    team updates made before the backfill would otherwise hide everyone else.
 
     Args:
-        user_teams (list): List of teams the user follows.
         games (list): List of all games for the day.
 
-    Returns:
-        list: A list of games where the user's teams are playing.
+    Yields:
+        dict: Subscriber items with ``email`` and ``teams``, once per email.
     """
-    abbreviations = [team["abbreviation"] for team in user_teams]
-    return [
-        game for game in games
-        if game["homeTeam"]["teamTricode"] in abbreviations or
-           game["awayTeam"]["teamTricode"] in abbreviations
-    ]
-
-def create_newsletter_html(date_str, games):
+    index_table = get_team_index_table()
+    if "Item" not in index_table.get_item(Key=TEAM_INDEX_READY_KEY):
+        print("[WARN] team_subscribers index has not been backfilled; falling back to a users table scan")
+        yield from scan_items(get_users_table(), attributes=("email", "teams"))
+        return
+
+    team_ids = {game[side]["teamId"] for game in games for side in ("homeTeam", "awayTeam")}
+    seen = set()
+    for item in query_items(index_table, "team_id", team_ids, attributes=("email", "teams")):
+        # A subscriber following both teams of a game, or two playing teams, appears once per team.
+        if item["email"] not in seen:
+            seen.add(item["email"])
+            yield item
+
+def create_newsletter_html(date_str, games, version=None):
     """
-    Render HTML for the newsletter using the Jinja2 template.
+    Render HTML for the newsletter by joining cached per-game fragments.
 
     Args:
         date_str (str): The current date string.
-        games (list): A list of filtered games.
+        games (list): A list of filtered GameView objects.
+        version (str): Snapshot version the games belong to; None renders every card fresh.
 
     Returns:
         str: Rendered HTML string.
     """
-    return template.render(date=date_str, games=games)
+    return get_renderer().render(date_str, games, version)
 
-def send_to_sqs(email, subject, html_body):
+def get_digest_html(digest_cache, date_str, games, version=None):
     """
-    Send the rendered newsletter HTML as a message to an SQS queue.
+    Return the newsletter HTML for a set of games, rendering it only once per distinct digest.
+    Users whose teams match the same games receive identical HTML, so the rendered
+    string is memoized by the sorted tuple of matched game IDs.
 
     Args:
-        email (str): Recipient's email address.
-        subject (str): Email subject.
-        html_body (str): HTML content of the email.
+        digest_cache (dict): Rendered HTML keyed by game ID tuple, shared for one run.
+        date_str (str): The current date string.
+        games (list): A list of filtered games.
+        version (str): Snapshot version of the games, used to reuse rendered game cards.
+
+    Returns:
+        tuple: (rendered HTML string, True if it came from the cache)
+    """
+    digest_key = tuple(sorted(game["gameId"] for game in games))
+    html = digest_cache.get(digest_key)
+    if html is not None:
+        return html, True
+
+    html = create_newsletter_html(date_str, games, version)
+    digest_cache[digest_key] = html
+    return html, False
+
+class SQSPublisher:
+    """
+    Publish newsletter messages with SendMessageBatch, several batches in parallel.
+
+    Messages are buffered into batches of up to 10 entries (and 256 KiB), each full
+    batch is handed to a small thread pool, and only the entries SQS reports as
+    failed are retried. Any client exposing ``send_message_batch`` works, so a local
+    SQS stand-in can be passed in tests.
     """
-    sqs.send_message(
-        QueueUrl=SQS_URL,
-        MessageBody=json.dumps({
-            "email": email,
-            "subject": subject,
-            "html_body": html_body
-        })
-    )
+
+    def __init__(self, client, queue_url, max_workers=SQS_MAX_WORKERS, max_attempts=SQS_MAX_ATTEMPTS):
+        self.client = client
+        self.queue_url = queue_url
+        self.max_attempts = max_attempts
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+        self._entries = []
+        self._entries_bytes = 0
+        self._futures = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._started = time.perf_counter()
+        self._last_html = None
+        self._last_html_json = None
+
+    def publish(self, email, subject, html_body):
+        """
+        Queue one newsletter message, sending a batch whenever one fills up.
+
+        Args:
+            email (str): Recipient's email address.
+            subject (str): Email subject.
+            html_body (str): HTML content of the email.
+        """
+        # Users of the same digest share one HTML string, so encode it once.
+        if html_body is not self._last_html:
+            self._last_html = html_body
+            self._last_html_json = json.dumps(html_body)
+        body = f'{{"email": {json.dumps(email)}, "subject": {json.dumps(subject)}, "html_body": {self._last_html_json}}}'
+        body_bytes = len(body.encode("utf-8"))
+
+        if self._entries and (
+            len(self._entries) >= SQS_BATCH_MAX_ENTRIES or self._entries_bytes + body_bytes > SQS_BATCH_MAX_BYTES
+        ):
+            self._flush()
+
+        self._entries.append({"Id": str(len(self._entries)), "MessageBody": body})
+        self._entries_bytes += body_bytes
+
+    def _flush(self):
+        if self._entries:
+            self._futures.append(self._executor.submit(self._send_batch, self._entries))
+            self._entries = []
+            self._entries_bytes = 0
+
+    def _send_batch(self, entries):
+        pending = entries
+        for attempt in range(self.max_attempts):
+            if attempt:
+                time.sleep(0.1 * 2 ** (attempt - 1))
+            try:
+                response = self.client.send_message_batch(QueueUrl=self.queue_url, Entries=pending)
+            except Exception as e:
+                print(f"[WARN] send_message_batch failed (attempt {attempt + 1}):", e)
+                continue
+            failed_ids = {failure["Id"] for failure in response.get("Failed", [])}
+            pending = [entry for entry in pending if entry["Id"] in failed_ids]
+            if not pending:
+                break
+        return len(entries) - len(pending), len(pending)
+
+    def close(self):
+        """
+        Send any buffered messages, wait for all batches and return the publishing summary.
+
+        Returns:
+            dict: Sent and failed counts, batch count and throughput.
+        """
+        self._flush()
+        for future in self._futures:
+            sent, failed = future.result()
+            self.sent += sent
+            self.failed += failed
+        self.batches = len(self._futures)
+        self._futures = []
+        self._executor.shutdown()
+
+        seconds = time.perf_counter() - self._started
+        return {
+            "sqs_sent": self.sent,
+            "sqs_failed": self.failed,
+            "sqs_batches": self.batches,
+            "sqs_seconds": round(seconds, 3),
+            "sqs_messages_per_second": round(self.sent / seconds, 1) if seconds else 0.0
+        }
 
 
 def lambda_handler(event, context):
@@ -88,18 +281,65 @@ def lambda_handler(event, context):
         dict: Result status with a message.
     """
     today_str = datetime.now().strftime("%Y-%m-%d")
-    games = get_today_games()
-    users = table.scan().get("Items", [])
+    metrics = MetricsLogger(os.getenv("AWS_LAMBDA_FUNCTION_NAME", "producer"))
+    metrics.set_property("date", today_str)
+    if context is not None:
+        metrics.set_property("requestId", context.aws_request_id)
 
-    for user in users:
-        email = user.get("email")
-        teams = user.get("teams", [])
+    # Matching and rendering only need the compact projection, built once per run.
+    with metrics.stage("FetchGames"):
+        games = project_games(get_today_games())
+    if not games:
+        # Nothing to send: return before any AWS client or template is created.
+        summary = {"teams_playing": 0, "users": 0, "newsletters": 0}
+        metrics.put_summary(summary, SUMMARY_METRICS)
+        metrics.flush()
+        return {"statusCode": 200, "message": "No games today", "summary": summary}
 
-        matched_games = get_user_matched_games(teams, games)
+    version = snapshot_version([game.to_dict() for game in games])
+    card_renders = get_renderer().renders
+    # Subscribers stream in from each playing team's partition and are grouped as they arrive,
+    # so reading them ("Scan") is timed separately from the grouping around it ("Match").
+    users = metrics.timed_iter("Scan", get_today_subscribers(games))
+
+    started = time.perf_counter()
+    matcher = GameMatcher(games)
+    users_by_mask = matcher.group_users(users)
+    metrics.add_time("Match", time.perf_counter() - started - metrics.elapsed("Scan"))
+
+    publisher = SQSPublisher(get_sqs(), SQS_URL)
+    digest_cache = {}
+    newsletters = 0
+    cache_hits = 0
+
+    # Users with the same team mask share one match and one render.
+    for mask, mask_users in users_by_mask.items():
+        matched_games = matcher.match_mask(mask)
         if not matched_games:
             continue
 
-        html = create_newsletter_html(today_str, matched_games)
-        send_to_sqs(email, f"NBA Newsletter - {today_str}", html)
+        with metrics.stage("Render"):
+            html, cached = get_digest_html(digest_cache, today_str, matched_games, version)
+        cache_hits += len(mask_users) - (not cached)
+        newsletters += len(mask_users)
+        with metrics.stage("Enqueue"):
+            for user in mask_users:
+                publisher.publish(user.get("email"), f"NBA Newsletter - {today_str}", html)
+
+    with metrics.stage("Enqueue"):
+        published = publisher.close()
+
+    summary = {
+        "teams_playing": 2 * len(games),
+        "users": matcher.users_seen,
+        "newsletters": newsletters,
+        "team_masks": len(users_by_mask),
+        "distinct_digests": len(digest_cache),
+        "render_cache_hit_rate": round(cache_hits / newsletters, 4) if newsletters else 0.0,
+        "card_renders": get_renderer().renders - card_renders,
+        **published
+    }
+    metrics.put_summary(summary, SUMMARY_METRICS)
+    metrics.flush()
 
-    return {"statusCode": 200, "message": "Messages pushed to SQS"}
\ No newline at end of file
+    return {"statusCode": 200, "message": "Messages pushed to SQS", "summary": summary}
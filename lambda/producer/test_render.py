@@ -53,8 +53,9 @@ sample_games = [
     }
 ]
 
-# Render the template
-html = template.render(date=date_str, games=sample_games)
+# Render the template: one card per game (the game_card macro), joined into the page
+cards = [template.module.game_card(game) for game in sample_games]
+html = template.render(date=date_str, cards=cards)
 
 # Output the rendered HTML to a file
 with open("test_output.html", "w", encoding="utf-8") as f:
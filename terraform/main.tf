@@ -16,7 +16,7 @@ data "aws_iam_policy_document" "lambda_sqs_policy" {
   }
 }
 
-# IAM policy document for allowing Lambda to scan DynamoDB users table
+# IAM policy document for allowing Lambda to read subscribers from DynamoDB
 data "aws_iam_policy_document" "lambda_dynamodb_policy" {
   statement {
     effect = "Allow"
@@ -27,6 +27,38 @@ data "aws_iam_policy_document" "lambda_dynamodb_policy" {
       "arn:aws:dynamodb:ap-northeast-2:915650020635:table/users"
     ]
   }
+
+  statement {
+    effect = "Allow"
+    actions = [
+      "dynamodb:Query",
+      "dynamodb:Scan"
+    ]
+    resources = [aws_dynamodb_table.team_subscribers.arn]
+  }
+}
+
+# Inverted index: one item per (team_id, email) so the producer only reads today's teams
+resource "aws_dynamodb_table" "team_subscribers" {
+  name         = "team_subscribers"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "team_id"
+  range_key    = "email"
+
+  attribute {
+    name = "team_id"
+    type = "N"
+  }
+
+  attribute {
+    name = "email"
+    type = "S"
+  }
+
+  tags = {
+    Environment = var.environment
+    Project     = var.project_name
+  }
 }
 
 # IAM policy to grant SQS permissions to Lambda
@@ -140,7 +172,9 @@ resource "aws_lambda_function" "producer" {
 
   environment {
     variables = {
-      SQS_QUEUE_URL = aws_sqs_queue.newsletter_queue.url
+      SQS_QUEUE_URL               = aws_sqs_queue.newsletter_queue.url
+      USERS_TABLE_NAME            = "users"
+      TEAM_SUBSCRIBERS_TABLE_NAME = aws_dynamodb_table.team_subscribers.name
     }
   }
 
@@ -189,9 +223,12 @@ resource "aws_lambda_function" "consumer" {
 resource "aws_lambda_event_source_mapping" "consumer_sqs_trigger" {
   event_source_arn = aws_sqs_queue.newsletter_queue.arn
   function_name    = aws_lambda_function.consumer.arn
-  batch_size       = 1
+  batch_size       = 10
   enabled          = true
 
+  maximum_batching_window_in_seconds = 5
+  function_response_types            = ["ReportBatchItemFailures"]
+
   depends_on = [
     aws_lambda_function.consumer,
     aws_sqs_queue.newsletter_queue
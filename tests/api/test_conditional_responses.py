@@ -0,0 +1,103 @@
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.api import games as games_api
+from app.core.http import etag_matches
+from app.main import app
+from app.services.games import to_game_payloads
+
+client = TestClient(app)
+
+GAMES = [
+    {
+        "gameId": "1",
+        "gameStatusText": "Final",
+        "homeTeam": {"teamId": 1610612747, "teamTricode": "LAL", "score": 110},
+        "awayTeam": {"teamId": 1610612744, "teamTricode": "GSW", "score": 100},
+    }
+]
+
+
+def scoreboard(games):
+    return patch("app.services.games._fetch_today_games", return_value=games)
+
+
+class TestConditionalResponses:
+
+    def test_today_returns_etag_and_304_when_unchanged(self):
+        """
+        Test that a repeated poll with the ETag gets 304 with no body, and the same snapshot keeps its ETag.
+        """
+        with scoreboard(GAMES):
+            first = client.get("/api/games/today")
+            second = client.get("/api/games/today", headers={"If-None-Match": first.headers["etag"]})
+
+        assert first.status_code == 200
+        assert first.json()["data"] == to_game_payloads(GAMES)
+        assert first.headers["cache-control"].startswith("public, max-age=")
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == first.headers["etag"]
+
+    def test_today_etag_changes_with_content(self):
+        """
+        Test that a changed scoreboard gets a new ETag and a full response.
+        """
+        with scoreboard(GAMES):
+            etag = client.get("/api/games/today").headers["etag"]
+
+        changed = [dict(GAMES[0], gameStatusText="Q4")]
+        with patch("app.services.games.scoreboard_cache.get", return_value=changed), \
+             patch("app.services.games.scoreboard_cache.aget", return_value=changed):
+            response = client.get("/api/games/today", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_by_team_is_conditional(self):
+        """
+        Test that the by-team endpoint returns the team's games and honours If-None-Match.
+        """
+        with scoreboard(GAMES):
+            first = client.get("/api/games/today/by-team", params={"team": "GSW"})
+            second = client.get("/api/games/today/by-team", params={"team": "GSW"},
+                                headers={"If-None-Match": first.headers["etag"]})
+            other = client.get("/api/games/today/by-team", params={"team": "BOS"})
+
+        assert [game["gameId"] for game in first.json()["data"]] == ["1"]
+        assert second.status_code == 304
+        assert other.json()["data"] == []
+        assert other.headers["etag"] != first.headers["etag"]
+
+    def test_by_team_spellings_share_one_body(self):
+        """
+        Test that different spellings of the same team are served one memoized body and ETag.
+        """
+        with scoreboard(list(GAMES)), patch("app.api.games._json_body", wraps=games_api._json_body) as mock_body:
+            upper = client.get("/api/games/today/by-team", params={"team": "GSW"})
+            lower = client.get("/api/games/today/by-team", params={"team": "gsw"})
+
+        assert lower.content == upper.content
+        assert lower.headers["etag"] == upper.headers["etag"]
+        assert mock_body.call_count == 1
+
+    def test_newsletter_preview_is_rendered_once_per_snapshot(self):
+        """
+        Test that the preview is rendered once per scoreboard snapshot and answered with 304 when unchanged.
+        """
+        with scoreboard(GAMES), \
+             patch("app.api.newsletters.render_newsletter_html", return_value="<html/>") as mock_render:
+            first = client.get("/api/newsletters/preview")
+            second = client.get("/api/newsletters/preview", headers={"If-None-Match": first.headers["etag"]})
+
+        assert first.text == "<html/>"
+        assert first.headers["content-type"].startswith("text/html")
+        assert second.status_code == 304
+        mock_render.assert_called_once()
+
+    def test_etag_matches(self):
+        assert etag_matches('"a", W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+        assert not etag_matches('"a"', '"b"')
+        assert not etag_matches(None, '"b"')
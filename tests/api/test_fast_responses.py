@@ -0,0 +1,88 @@
+import json
+from decimal import Decimal
+from unittest.mock import patch
+
+from fakes import FakeTable
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import api
+from app.models.api import APIResponse
+
+client = TestClient(app)
+
+
+class TestFastResponses:
+
+    def test_success_body_matches_validated_response(self):
+        """
+        Test that the fast path produces the same JSON document as the pydantic model.
+        """
+        data = [{"gameId": "1", "homeTeam": {"score": 101, "periods": [{"period": 1, "score": 30}]}}]
+
+        fast = json.loads(APIResponse.success_body(data, "ok"))
+
+        assert fast == json.loads(APIResponse[list[dict]].success_response(data, "ok").model_dump_json())
+
+    def test_success_body_without_orjson(self):
+        """
+        Test that the stdlib fallback encodes the same document, including DynamoDB Decimals.
+        """
+        data = {"id": Decimal("1610612747"), "ratio": Decimal("0.5"), "name": "Dončić"}
+
+        with patch.object(api, "orjson", None):
+            fallback = APIResponse.success_body(data)
+
+        assert json.loads(fallback) == json.loads(APIResponse.success_body(data))
+        assert json.loads(fallback)["data"] == {"id": 1610612747, "ratio": 0.5, "name": "Dončić"}
+
+    def test_subscribers_are_shaped_like_user_out(self):
+        """
+        Test that the subscriber list keeps only UserOut fields and encodes Decimal team IDs as ints.
+        """
+        users = FakeTable([{
+            "email": "a@example.com",
+            "teams": [{"id": Decimal(1610612747), "name": "Los Angeles Lakers", "abbreviation": "LAL"}],
+            "players": [],
+            "created_at": "2025-01-01T00:00:00+00:00",
+            "updated_at": "2025-01-01T00:00:00+00:00",
+            "internal_note": "not exposed",
+        }])
+
+        with patch("app.api.users.get_table", return_value=users):
+            response = client.get("/api/users/subscribers")
+
+        subscriber, = response.json()["data"]
+        assert "internal_note" not in subscriber
+        assert subscriber["teams"][0]["id"] == 1610612747
+
+    def test_team_list_body_is_serialized_once(self):
+        """
+        Test that the unchanged team list reuses its serialized body.
+        """
+        with patch("app.api.teams.APIResponse.success_body", wraps=APIResponse.success_body) as mock_body:
+            first = client.get("/api/teams")
+            second = client.get("/api/teams")
+
+        assert first.content == second.content
+        assert len(first.json()["data"]) == 30
+        assert mock_body.call_count <= 1
+
+    def test_player_stats_batch_encodes_int_keys(self):
+        """
+        Test that the batch stats endpoint serializes its int-keyed result with orjson and the fallback.
+        """
+        player = {"personId": 2544, "name": "LeBron James", "starter": "1",
+                  "statistics": {"points": 30, "rebounds": 8, "assists": 9, "minutes": "PT36M"}}
+        boxscores = [{"homeTeam": {"players": [player]}, "awayTeam": {"players": []}}]
+
+        with patch("app.services.players.get_today_boxscores_async", return_value=boxscores):
+            response = client.get("/api/players/ids/stats?player_ids=2544&player_ids=99")
+            with patch.object(api, "orjson", None):
+                fallback = client.get("/api/players/ids/stats?player_ids=2544&player_ids=99")
+
+        body = response.json()
+        assert body["success"] is True
+        assert body["data"]["2544"]["points"] == 30
+        assert body["data"]["99"] == {"message": "No stats found for the player today."}
+        assert fallback.json() == body
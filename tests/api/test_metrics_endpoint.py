@@ -0,0 +1,39 @@
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+class TestMetricsEndpoint:
+
+    def test_requests_are_recorded_by_route_template(self):
+        """
+        Test that latency is recorded per route template and status, with unrouted paths grouped.
+        """
+        client.get("/api/teams/lakers")
+        client.get("/api/teams/celtics")
+        client.get("/not-a-route")
+
+        response = client.get("/metrics")
+
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'http_request_duration_seconds_count{method="GET",route="/api/teams/{team_name}",status="200"} 2' in response.text
+        assert 'http_request_duration_seconds_count{method="GET",route="unmatched",status="404"} 1' in response.text
+
+    def test_nba_api_time_and_cache_hit_ratio_are_exposed(self):
+        """
+        Test that scoreboard fetches are timed once and repeated reads show up as cache hits.
+        """
+        with patch("app.services.games.scoreboard.ScoreBoard") as mock_scoreboard:
+            mock_scoreboard.return_value.get_dict.return_value = {"scoreboard": {"games": []}}
+            client.get("/api/games/today")
+            client.get("/api/games/today")
+
+        text = client.get("/metrics").text
+
+        assert 'nba_api_request_duration_seconds_count{endpoint="scoreboard"} 1' in text
+        assert 'cache_misses_total{cache="scoreboard"} 1' in text
+        assert 'cache_hit_ratio{cache="scoreboard"} 0.5' in text
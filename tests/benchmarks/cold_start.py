@@ -0,0 +1,172 @@
+"""
+Cold-start benchmark for the producer and consumer Lambdas.
+
+Stages the Lambda sources the way build-script.sh lays them out (shared app/core modules
+copied next to the handler, template precompiled), then measures each scenario in a fresh
+interpreter so every run pays the full import cost, like a new Lambda container:
+
+    python tests/benchmarks/cold_start.py [--runs 15] [--output tests/benchmarks/results/cold_start.json]
+
+Dependencies come from the current environment instead of a pip install into the build dir.
+The slowest top-level imports of an eager producer import are written next to the JSON report.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+SHARED_MODULES = ("team_matching", "dynamodb", "game_view", "fragments", "emf")
+
+# Each scenario runs in a fresh interpreter and prints the elapsed milliseconds of the timed part.
+_TIMED = """
+import time
+start = time.perf_counter()
+{body}
+print((time.perf_counter() - start) * 1000)
+"""
+
+SCENARIOS = {
+    # What a cold start pays today before the handler runs.
+    "producer_import": ("producer", "import producer_lambda"),
+    # What the module used to import at load time: boto3, nba_api and Jinja2 up front.
+    "producer_import_eager": ("producer", (
+        "import producer_lambda, boto3, jinja2\n"
+        "from nba_api.live.nba.endpoints import scoreboard"
+    )),
+    # A full invocation on a day without games. Only the scoreboard request is stubbed out, so the
+    # nba_api import that get_today_games defers to the invocation is still timed.
+    "producer_no_games_invoke": ("producer", (
+        "import producer_lambda\n"
+        "from nba_api.live.nba.endpoints import scoreboard\n"
+        "class EmptyScoreBoard:\n"
+        "    def get_dict(self):\n"
+        "        return {'scoreboard': {'games': []}}\n"
+        "scoreboard.ScoreBoard = EmptyScoreBoard\n"
+        "import contextlib, io\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    producer_lambda.lambda_handler({}, None)"
+    )),
+    "consumer_import": ("consumer", "import consumer_lambda"),
+}
+
+# Template loading is timed after Jinja2 is imported, so only lexing/parsing vs loading bytecode differs.
+TEMPLATE_SCENARIOS = {
+    "template_load_source": "producer_lambda.COMPILED_TEMPLATES_DIR = '/nonexistent'",
+    "template_load_compiled": "",
+}
+_TEMPLATE_TIMED = """
+import time, jinja2, producer_lambda
+{setup}
+start = time.perf_counter()
+producer_lambda.load_template()
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def stage(build_dir):
+    """
+    Lay the Lambda sources out like build-script.sh does.
+
+    Args:
+        build_dir (str): Empty directory to stage into.
+
+    Returns:
+        dict: Staged directory for each Lambda.
+    """
+    producer = os.path.join(build_dir, "producer")
+    consumer = os.path.join(build_dir, "consumer")
+    os.makedirs(producer)
+    os.makedirs(consumer)
+
+    producer_src = os.path.join(ROOT, "lambda", "producer")
+    shutil.copy(os.path.join(producer_src, "producer_lambda.py"), producer)
+    shutil.copy(os.path.join(producer_src, "newsletter_template.html"), producer)
+    for module in SHARED_MODULES:
+        shutil.copy(os.path.join(ROOT, "app", "core", f"{module}.py"), producer)
+    subprocess.run(
+        [sys.executable, os.path.join(producer_src, "compile_templates.py"), os.path.join(producer, "compiled_templates")],
+        check=True,
+    )
+    shutil.copy(os.path.join(ROOT, "lambda", "consumer", "consumer_lambda.py"), consumer)
+    shutil.copy(os.path.join(ROOT, "app", "core", "emf.py"), consumer)
+    return {"producer": producer, "consumer": consumer}
+
+
+def run_timed(code, cwd, runs):
+    """
+    Run code in a fresh interpreter `runs` times.
+
+    Returns:
+        dict: Median, min and max of the printed milliseconds.
+    """
+    samples = []
+    for _ in range(runs):
+        # `python -c` puts the working directory first on sys.path, so the staged modules are imported.
+        output = subprocess.run([sys.executable, "-c", code], cwd=cwd, capture_output=True, text=True, check=True).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return {
+        "median_ms": round(statistics.median(samples), 2),
+        "min_ms": round(min(samples), 2),
+        "max_ms": round(max(samples), 2),
+    }
+
+
+def import_profile(cwd, code, top):
+    """
+    Returns the `top` slowest top-level imports of code, from ``python -X importtime``.
+    """
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=cwd, capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented further; the top level already includes them.
+        if len(name) - len(name.lstrip()) == 1:
+            rows.append((int(cumulative), name.strip()))
+    rows.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": round(us / 1000, 2)} for us, name in rows[:top]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "cold_start.json"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as build_dir:
+        dirs = stage(build_dir)
+        scenarios = {name: run_timed(_TIMED.format(body=body), dirs[target], args.runs)
+                     for name, (target, body) in SCENARIOS.items()}
+        for name, setup in TEMPLATE_SCENARIOS.items():
+            scenarios[name] = run_timed(_TEMPLATE_TIMED.format(setup=setup), dirs["producer"], args.runs)
+        slowest = import_profile(dirs["producer"], SCENARIOS["producer_import_eager"][1], args.top)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "scenarios": scenarios,
+        "producer_eager_slowest_imports": slowest,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    with open(os.path.join(os.path.dirname(os.path.abspath(args.output)), "producer_importtime.txt"), "w") as f:
+        f.writelines(f"{row['cumulative_ms']:>10.2f} ms  {row['module']}\n" for row in slowest)
+    print(json.dumps(scenarios, indent=2))
+
+
+if __name__ == "__main__":
+    main()
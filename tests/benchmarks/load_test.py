@@ -0,0 +1,323 @@
+"""
+Local load test for the FastAPI app.
+
+Serves ``app.main:app`` with uvicorn on localhost, with DynamoDB replaced by the in-memory
+stand-ins from tests/fakes.py and nba_api by the recorded fixtures (see nba_fixtures.py),
+and drives a weighted mix of concurrent requests at it:
+
+    python tests/benchmarks/load_test.py [--mix subscribe=1,teams=1,games=4,stats=4]
+                                         [--concurrency 32] [--duration 10] [--nba-latency-ms 0]
+
+Traffic kinds: "subscribe" (POST /api/users/subscribe with a new email), "teams"
+(PATCH /api/users/{email}/teams for a seeded subscriber), "games" (GET /api/games/today)
+and "stats" (GET /api/players/id/{player_id}/stats for a player in the recorded box scores).
+Responses with an error status or ``"success": false`` count as errors.
+
+Per traffic kind the report has the request count, errors, throughput and p50/p95/p99
+latency, written as JSON. The client shares the server's process (and GIL) by default; run
+``--serve`` in one shell and ``--url http://127.0.0.1:8000`` (with the same --users) in
+another to keep them apart. --nba-latency-ms delays every replayed nba_api call, so cache
+misses cost what they would against nba.com.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(os.path.dirname(BENCHMARKS_DIR))
+for path in (ROOT, os.path.dirname(BENCHMARKS_DIR)):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from app.core.emf import percentile  # noqa: E402
+from fakes import FakeDynamoDB, FakeTable  # noqa: E402
+from nba_fixtures import load_boxscores, load_scoreboard  # noqa: E402
+
+DEFAULT_MIX = "subscribe=1,teams=1,games=4,stats=4"
+DEFAULT_OUTPUT = os.path.join(BENCHMARKS_DIR, "results", "load_test.json")
+
+# Items per FakeTable scan page, about what fits in DynamoDB's 1 MB pages.
+DYNAMODB_PAGE_ITEMS = 5000
+
+
+class TrafficData:
+    """
+    Request inputs shared by the load test's workers: seeded subscribers, team IDs and players
+    from the recorded box scores. Emails are ``user{i}@example.com``, so a separately started
+    ``--serve`` process with the same ``users`` count holds the same subscribers.
+    """
+
+    def __init__(self, users, seed=0):
+        from app.services import teams as team_service
+
+        self.rng = random.Random(seed)
+        self.emails = [f"user{i}@example.com" for i in range(users)]
+        self.team_ids = sorted(team_service.get_team_index().subscriptions)
+        self.player_ids = sorted({
+            player["personId"]
+            for boxscore in load_boxscores().values()
+            for side in ("homeTeam", "awayTeam")
+            for player in boxscore["game"][side]["players"]
+        })
+        self._new_users = itertools.count()
+
+    def random_teams(self):
+        return self.rng.sample(self.team_ids, self.rng.choice((1, 1, 1, 2, 2, 3)))
+
+
+# Traffic kind -> (route, request builder returning (method, path, httpx request kwargs)).
+TRAFFIC = {
+    "subscribe": ("POST /api/users/subscribe", lambda data: (
+        "POST", "/api/users/subscribe", {"json": {"email": f"new{next(data._new_users)}@example.com"}}
+    )),
+    "teams": ("PATCH /api/users/{email}/teams", lambda data: (
+        "PATCH", f"/api/users/{data.rng.choice(data.emails)}/teams", {"json": data.random_teams()}
+    )),
+    "games": ("GET /api/games/today", lambda data: ("GET", "/api/games/today", {})),
+    "stats": ("GET /api/players/id/{player_id}/stats", lambda data: (
+        "GET", f"/api/players/id/{data.rng.choice(data.player_ids)}/stats", {}
+    )),
+}
+
+
+def parse_mix(mix):
+    """
+    Parses ``"subscribe=1,games=4"`` into {kind: weight}.
+    """
+    weights = {}
+    for part in mix.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in TRAFFIC:
+            raise ValueError(f"Unknown traffic kind {kind!r}, expected one of {', '.join(TRAFFIC)}")
+        weights[kind] = float(weight or 1)
+    return {kind: weight for kind, weight in weights.items() if weight > 0}
+
+
+def _replay(response_for, latency):
+    """
+    Returns an nba_api endpoint stand-in answering ``get_dict()`` with ``response_for(*args)``
+    after sleeping ``latency`` seconds in the constructor, where the real endpoint does its request.
+    """
+    class Replay:
+        def __init__(self, *args, **kwargs):
+            if latency:
+                time.sleep(latency)
+            self._response = response_for(*args)
+
+        def get_dict(self):
+            return self._response
+
+    return Replay
+
+
+@contextlib.contextmanager
+def stand_ins(data, nba_latency=0.0):
+    """
+    Replaces DynamoDB and nba_api for the app while active and seeds every subscriber in ``data``.
+    Yields the FakeDynamoDB.
+    """
+    import app.main  # noqa: F401 - loads every module that imports get_table or transact_write
+    from app.core import dynamodb
+    from app.core.archive import GameArchive
+    from app.services import games, players, subscribers
+    from app.services import teams as team_service
+
+    db = FakeDynamoDB({
+        subscribers.USERS_TABLE_NAME: FakeTable(page_size=DYNAMODB_PAGE_ITEMS),
+        subscribers.TEAM_SUBSCRIBERS_TABLE_NAME: FakeTable(page_size=DYNAMODB_PAGE_ITEMS, key=("team_id", "email")),
+    })
+    scoreboard = load_scoreboard()
+    boxscores = load_boxscores()
+
+    with contextlib.ExitStack() as stack:
+        # Routers and services import get_table and transact_write by name, so patch every binding.
+        fakes = {"get_table": (dynamodb.get_table, db.get_table),
+                 "transact_write": (dynamodb.transact_write, db.transact_write)}
+        for name, module in list(sys.modules.items()):
+            if name == "app" or name.startswith("app."):
+                for attribute, (original, fake) in fakes.items():
+                    if getattr(module, attribute, None) is original:
+                        stack.enter_context(patch.object(module, attribute, fake))
+
+        stack.enter_context(patch.object(games.scoreboard, "ScoreBoard", _replay(lambda: scoreboard, nba_latency)))
+        stack.enter_context(patch.object(players.boxscore, "BoxScore",
+                                         _replay(lambda game_id, *args: boxscores[game_id], nba_latency)))
+        archive_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        stack.enter_context(patch.object(games, "game_archive", GameArchive(archive_dir)))
+
+        now = datetime.now(timezone.utc).isoformat()
+        users = db.get_table(subscribers.USERS_TABLE_NAME)
+        for email in data.emails:
+            users.put_item(Item={"email": email, "players": [], "created_at": now, "updated_at": now})
+            subscribers.update_user_teams(email, team_service.get_teams_by_ids(data.random_teams()), now)
+        yield db
+
+
+@contextlib.contextmanager
+def serve(port=0):
+    """
+    Runs app.main:app with uvicorn in a background thread and yields its base URL.
+    """
+    import uvicorn
+    from app.main import app
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", port))
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", access_log=False))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, name="load-test-server", daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("uvicorn failed to start")
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+    finally:
+        server.should_exit = True
+        thread.join()
+        sock.close()
+
+
+async def drive(url, data, mix, concurrency, duration, max_requests=None):
+    """
+    Sends requests drawn from ``mix`` from ``concurrency`` workers until ``duration`` seconds
+    have passed or ``max_requests`` were sent.
+
+    Returns:
+        tuple: ({kind: latency seconds}, Counter of errors by kind, elapsed seconds)
+    """
+    import httpx
+
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+    latencies = {kind: [] for kind in kinds}
+    errors = Counter()
+    sent = itertools.count()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        async def worker(deadline):
+            while time.perf_counter() < deadline and (max_requests is None or next(sent) < max_requests):
+                kind = data.rng.choices(kinds, weights)[0]
+                method, path, kwargs = TRAFFIC[kind][1](data)
+                started = time.perf_counter()
+                try:
+                    response = await client.request(method, path, **kwargs)
+                    ok = response.status_code < 400 and response.json().get("success", True)
+                except (httpx.HTTPError, ValueError):
+                    ok = False
+                latencies[kind].append(time.perf_counter() - started)
+                if not ok:
+                    errors[kind] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(started + duration) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+
+def _summary(samples, errors, elapsed):
+    ordered = sorted(samples)
+    summary = {
+        "requests": len(ordered),
+        "errors": errors,
+        "requests_per_second": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+    }
+    if ordered:
+        summary.update({f"p{q}_ms": round(percentile(ordered, q) * 1000, 3) for q in (50, 95, 99)})
+        summary["max_ms"] = round(ordered[-1] * 1000, 3)
+    return summary
+
+
+def summarize(latencies, errors, elapsed):
+    """
+    Returns the overall and per-kind request counts, errors, throughput and latency percentiles.
+    """
+    return {
+        "total": _summary([sample for samples in latencies.values() for sample in samples],
+                          sum(errors.values()), elapsed),
+        "endpoints": {kind: {"route": TRAFFIC[kind][0], **_summary(samples, errors[kind], elapsed)}
+                      for kind, samples in latencies.items()},
+    }
+
+
+def run_load_test(mix=DEFAULT_MIX, concurrency=32, duration=10.0, max_requests=None, warmup=1.0,
+                  users=1000, nba_latency_ms=0.0, seed=0, url=None):
+    """
+    Runs one load test and returns the report. Starts a stubbed server unless ``url`` is given.
+    """
+    weights = parse_mix(mix)
+    data = TrafficData(users, seed)
+
+    with contextlib.ExitStack() as stack:
+        if url is None:
+            stack.enter_context(stand_ins(data, nba_latency_ms / 1000))
+            url = stack.enter_context(serve())
+        if warmup:
+            asyncio.run(drive(url, data, weights, concurrency, warmup))
+        latencies, errors, elapsed = asyncio.run(drive(url, data, weights, concurrency, duration, max_requests))
+
+    return {
+        "benchmark": "load_test",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "mix": weights,
+        "concurrency": concurrency,
+        "duration_seconds": round(elapsed, 3),
+        "seeded_users": users,
+        "nba_latency_ms": nba_latency_ms,
+        **summarize(latencies, errors, elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Weighted traffic kinds: {', '.join(TRAFFIC)}")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to send traffic for")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Seconds of unrecorded traffic first")
+    parser.add_argument("--users", type=int, default=1000, help="Seeded subscribers")
+    parser.add_argument("--nba-latency-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", default=None, help="Drive an already running --serve process instead")
+    parser.add_argument("--serve", action="store_true", help="Only run the stubbed server on --port")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    if args.serve:
+        with stand_ins(TrafficData(args.users, args.seed), args.nba_latency_ms / 1000), serve(args.port) as url:
+            print(f"Serving the stubbed app on {url} (Ctrl-C to stop)")
+            with contextlib.suppress(KeyboardInterrupt):
+                threading.Event().wait()
+        return
+
+    report = run_load_test(args.mix, args.concurrency, args.duration, args.requests, args.warmup,
+                           args.users, args.nba_latency_ms, args.seed, args.url)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    print(json.dumps(report["endpoints"], indent=2))
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Scoreboard and box score fixtures for the benchmarks, in nba_api live response format.
+
+``fixtures/scoreboard.json`` is a ``ScoreBoard().get_dict()`` response for a 12-game night and
+``fixtures/boxscores.json`` the ``BoxScore(game_id).get_dict()`` response of each of its games.
+Re-record them from a machine that can reach nba.com with:
+
+    python tests/benchmarks/nba_fixtures.py
+"""
+
+import json
+import os
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SCOREBOARD_PATH = os.path.join(FIXTURES_DIR, "scoreboard.json")
+BOXSCORES_PATH = os.path.join(FIXTURES_DIR, "boxscores.json")
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_scoreboard():
+    """
+    Returns the recorded ScoreBoard response.
+    """
+    return _load(SCOREBOARD_PATH)
+
+
+def load_games():
+    """
+    Returns the recorded scoreboard games, as get_today_games() would.
+    """
+    return load_scoreboard()["scoreboard"]["games"]
+
+
+def load_boxscores():
+    """
+    Returns the recorded BoxScore responses keyed by game ID.
+    """
+    return {boxscore["game"]["gameId"]: boxscore for boxscore in _load(BOXSCORES_PATH)}
+
+
+def record():
+    """
+    Record today's scoreboard and every game's box score from nba_api.
+    """
+    from nba_api.live.nba.endpoints import boxscore, scoreboard
+
+    board = scoreboard.ScoreBoard().get_dict()
+    boxscores = [boxscore.BoxScore(game["gameId"]).get_dict() for game in board["scoreboard"]["games"]]
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for path, data in ((SCOREBOARD_PATH, board), (BOXSCORES_PATH, boxscores)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+            f.write("\n")
+    print(f"Recorded {len(boxscores)} games from {board['scoreboard']['gameDate']}")
+
+
+if __name__ == "__main__":
+    record()
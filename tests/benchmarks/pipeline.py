@@ -0,0 +1,403 @@
+"""
+Synthetic-scale benchmark for the newsletter pipeline.
+
+Replays the recorded scoreboard (see nba_fixtures.py) against synthetic subscriber tables of
+1k to 1M users and times each stage of the producer Lambda, plus the consumer's send path:
+
+    python tests/benchmarks/pipeline.py [--sizes 1000,10000,100000,1000000] [--repeat 3]
+
+Producer stages are timed with the functions lambda_handler runs, one stage at a time:
+read subscribers from the team index ("scan"), group and match them ("match"), render the
+distinct digests ("render") and publish them to SQS ("enqueue"); the whole handler is timed
+as well ("end_to_end"). The consumer sends the producer's messages in SQS-sized batches
+through an in-process FakeSMTP and a LocalSMTPServer on localhost.
+
+DynamoDB and SQS are in-memory stand-ins without network latency, so the numbers track the
+pipeline's own CPU cost. Results are written as JSON (median of --repeat runs per stage).
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from decimal import Decimal
+from unittest.mock import patch
+
+# Import the Lambda sources the way they are deployed (flat, with shared app/core modules next to them).
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(os.path.dirname(BENCHMARKS_DIR))
+for path in (ROOT, os.path.dirname(BENCHMARKS_DIR), os.path.join(ROOT, "lambda", "producer"),
+             os.path.join(ROOT, "lambda", "consumer")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import importlib  # noqa: E402
+
+for _module in ("team_matching", "dynamodb", "game_view", "fragments", "emf"):
+    sys.modules.setdefault(_module, importlib.import_module(f"app.core.{_module}"))
+
+import consumer_lambda  # noqa: E402
+import producer_lambda  # noqa: E402
+from fakes import FakeSMTP, LocalSMTPServer  # noqa: E402
+from nba_fixtures import load_games  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_OUTPUT = os.path.join(BENCHMARKS_DIR, "results", "pipeline.json")
+
+# DynamoDB returns at most 1 MB per page; an index item with a few teams is ~150 bytes.
+DYNAMODB_PAGE_ITEMS = 5000
+# The consumer's SQS event source mapping delivers up to 10 records per invocation (terraform/main.tf).
+SQS_EVENT_BATCH_SIZE = 10
+
+# Share of subscribers following 1, 2 and 3 teams.
+TEAM_COUNT_WEIGHTS = (0.6, 0.3, 0.1)
+
+
+def synthetic_subscribers(count, seed=0):
+    """
+    Yields (email, teams) for ``count`` synthetic subscribers.
+
+    Team popularity is skewed (a few teams have most followers), and users following the same
+    teams share one ``teams`` list, like DynamoDB items carry Decimal team IDs.
+
+    Args:
+        count (int): Number of subscribers.
+        seed (int): Random seed, so every run sees the same table.
+    """
+    from nba_api.stats.static import teams as static_teams
+
+    rng = random.Random(seed)
+    teams = [
+        {"id": Decimal(team["id"]), "name": team["full_name"], "abbreviation": team["abbreviation"]}
+        for team in static_teams.get_teams()
+    ]
+    popularity = [1 / (rank + 1) ** 0.8 for rank in range(len(teams))]
+    rng.shuffle(popularity)
+    follows = {}
+    for i in range(count):
+        picked = set(rng.choices(range(len(teams)), popularity, k=rng.choices((1, 2, 3), TEAM_COUNT_WEIGHTS)[0]))
+        key = tuple(sorted(picked))
+        followed = follows.get(key)
+        if followed is None:
+            followed = follows[key] = [teams[index] for index in key]
+        yield f"user{i:07d}@example.com", followed
+
+
+class SyntheticTable:
+    """
+    Read-only, in-memory stand-in for a large DynamoDB table.
+
+    Rows are kept as tuples and only turned into item dicts page by page, the way boto3
+    deserializes each response, so a 1M-user table fits in memory. Supports paginated and
+    segmented scans, ``#pk = :pk`` queries on ``partition_key`` and key lookups.
+    """
+
+    def __init__(self, fields, rows, partition_key=None, page_size=DYNAMODB_PAGE_ITEMS):
+        self.fields = fields
+        self.rows = rows
+        self.page_size = page_size
+        self.partition_key = partition_key
+        self.partitions = {}
+        if partition_key is not None:
+            position = fields.index(partition_key)
+            for row in rows:
+                self.partitions.setdefault(row[position], []).append(row)
+        self._segments = {}
+
+    def _page(self, rows, kwargs):
+        start = kwargs.get("ExclusiveStartKey", {}).get("offset", 0)
+        if "Limit" in kwargs:
+            end = start + min(kwargs["Limit"], self.page_size)
+        else:
+            end = start + self.page_size
+
+        fields = self.fields
+        if "ProjectionExpression" in kwargs:
+            names = kwargs.get("ExpressionAttributeNames", {})
+            fields = [names.get(name.strip(), name.strip()) for name in kwargs["ProjectionExpression"].split(",")]
+        positions = [(name, self.fields.index(name)) for name in fields]
+        response = {"Items": [{name: row[position] for name, position in positions} for row in rows[start:end]]}
+        if end < len(rows):
+            response["LastEvaluatedKey"] = {"offset": end}
+        return response
+
+    def scan(self, **kwargs):
+        segment, total = kwargs.get("Segment", 0), kwargs.get("TotalSegments", 1)
+        rows = self.rows if total == 1 else self._segments.get((segment, total))
+        if rows is None:
+            rows = self._segments[(segment, total)] = self.rows[segment::total]
+        return self._page(rows, kwargs)
+
+    def query(self, **kwargs):
+        value = kwargs["ExpressionAttributeValues"][":pk"]
+        return self._page(self.partitions.get(value, []), kwargs)
+
+    def get_item(self, Key):
+        rows = self.rows if self.partition_key is None else self.partitions.get(Key[self.partition_key], [])
+        for row in rows:
+            item = dict(zip(self.fields, row))
+            if all(item.get(name) == value for name, value in Key.items()):
+                return {"Item": item}
+        return {}
+
+
+def build_tables(count, seed=0):
+    """
+    Returns (team index table, users table) holding ``count`` synthetic subscribers.
+    """
+    users = list(synthetic_subscribers(count, seed))
+    index_rows = [(team["id"], email, teams) for email, teams in users for team in teams]
+    # Backfilled, so the producer reads the index.
+    ready = producer_lambda.TEAM_INDEX_READY_KEY
+    index_rows.append((ready["team_id"], ready["email"], []))
+    index = SyntheticTable(("team_id", "email", "teams"), index_rows, partition_key="team_id")
+    return index, SyntheticTable(("email", "teams"), users)
+
+
+class CountingSQS:
+    """
+    SQS stand-in that counts batches, messages and bytes instead of storing them.
+    The first ``keep`` message bodies are kept to replay through the consumer.
+    """
+
+    def __init__(self, keep=0):
+        self.batches = 0
+        self.messages = 0
+        self.bytes = 0
+        self.kept = []
+        self._keep = keep
+        self._lock = threading.Lock()
+
+    def send_message_batch(self, QueueUrl, Entries):
+        with self._lock:
+            self.batches += 1
+            self.messages += len(Entries)
+            self.bytes += sum(len(entry["MessageBody"]) for entry in Entries)
+            if len(self.kept) < self._keep:
+                self.kept.extend(entry["MessageBody"] for entry in Entries[:self._keep - len(self.kept)])
+        return {"Successful": [], "Failed": []}
+
+
+def _median_stages(runs):
+    return {stage: round(statistics.median(run[stage] for run in runs), 4) for stage in runs[0]}
+
+
+def run_producer_stages(games, index_table, users_table, keep_messages=0):
+    """
+    Times each producer stage once against the given tables.
+
+    Returns:
+        tuple: (stage seconds, counts, SQS stand-in)
+    """
+    today_str = "2025-04-01"
+    sqs = CountingSQS(keep=keep_messages)
+    stages = {}
+    renderer = producer_lambda.FragmentRenderer(producer_lambda.load_template())
+
+    with patch.object(producer_lambda, "team_index_table", index_table), \
+         patch.object(producer_lambda, "users_table", users_table), \
+         patch.object(producer_lambda, "renderer", renderer):
+        started = time.perf_counter()
+        views = producer_lambda.project_games(games)
+        version = producer_lambda.snapshot_version([view.to_dict() for view in views])
+        stages["project"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        users = list(producer_lambda.get_today_subscribers(views))
+        stages["scan"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        matcher = producer_lambda.GameMatcher(views)
+        users_by_mask = matcher.group_users(users)
+        matched = {mask: matcher.match_mask(mask) for mask in users_by_mask}
+        stages["match"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        digest_cache = {}
+        html_by_mask = {
+            mask: producer_lambda.get_digest_html(digest_cache, today_str, mask_games, version)[0]
+            for mask, mask_games in matched.items() if mask_games
+        }
+        stages["render"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        publisher = producer_lambda.SQSPublisher(sqs, "benchmark-queue")
+        for mask, html in html_by_mask.items():
+            for user in users_by_mask[mask]:
+                publisher.publish(user["email"], f"NBA Newsletter - {today_str}", html)
+        publisher.close()
+        stages["enqueue"] = time.perf_counter() - started
+
+    counts = {
+        "users_read": len(users),
+        "team_masks": len(users_by_mask),
+        "distinct_digests": len(digest_cache),
+        "card_renders": renderer.renders,
+        "sqs_messages": sqs.messages,
+        "sqs_batches": sqs.batches,
+        "sqs_bytes": sqs.bytes,
+    }
+    return stages, counts, sqs
+
+
+def run_end_to_end(games, index_table, users_table):
+    """
+    Times one lambda_handler invocation against the given tables and returns (seconds, summary).
+    """
+    renderer = producer_lambda.FragmentRenderer(producer_lambda.load_template())
+    with patch.object(producer_lambda, "get_today_games", return_value=games), \
+         patch.object(producer_lambda, "team_index_table", index_table), \
+         patch.object(producer_lambda, "users_table", users_table), \
+         patch.object(producer_lambda, "sqs", CountingSQS()), \
+         patch.object(producer_lambda, "renderer", renderer), \
+         contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        result = producer_lambda.lambda_handler({}, None)
+        return time.perf_counter() - started, result["summary"]
+
+
+def benchmark_producer(games, size, repeat):
+    """
+    Returns the stage timings and counts for a users table of ``size`` subscribers.
+    """
+    started = time.perf_counter()
+    index_table, users_table = build_tables(size)
+    setup_seconds = time.perf_counter() - started
+
+    runs = []
+    for _ in range(repeat):
+        gc.collect()
+        stages, counts, _ = run_producer_stages(games, index_table, users_table)
+        gc.collect()
+        stages["end_to_end"], summary = run_end_to_end(games, index_table, users_table)
+        runs.append(stages)
+
+    stages = _median_stages(runs)
+    users = max(counts["users_read"], 1)
+    return {
+        "subscribers": size,
+        "index_items": len(index_table.rows),
+        "table_setup_seconds": round(setup_seconds, 3),
+        "stages_seconds": stages,
+        "microseconds_per_user": {stage: round(seconds / users * 1e6, 3) for stage, seconds in stages.items()},
+        "counts": counts,
+        "handler_summary": {key: summary[key] for key in ("users", "newsletters", "distinct_digests", "sqs_batches")},
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {f"p{int(q * 100)}_ms": round(pick(q) * 1000, 3) for q in (0.5, 0.95, 0.99)}
+
+
+def benchmark_consumer(messages, transport):
+    """
+    Sends ``messages`` (SQS message bodies) through consumer_lambda.lambda_handler in SQS-sized
+    batches, over FakeSMTP ("fake") or a LocalSMTPServer on localhost ("local").
+    """
+    records = [{"messageId": str(i), "body": body} for i, body in enumerate(messages)]
+    batches = [records[i:i + SQS_EVENT_BATCH_SIZE] for i in range(0, len(records), SQS_EVENT_BATCH_SIZE)]
+    pool = consumer_lambda.SMTPConnectionPool(consumer_lambda.SMTP_POOL_SIZE)
+    limiter = consumer_lambda.RateLimiter(1e9, 0)
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(patch.object(consumer_lambda, "_pool", pool))
+        stack.enter_context(patch.object(consumer_lambda, "_limiter", limiter))
+        stack.enter_context(patch.object(consumer_lambda, "SMTP_STARTTLS", False))
+        stack.enter_context(patch.dict(os.environ, {"GMAIL_ADDRESS": "newsletter@example.com", "GMAIL_APP_PASSWORD": ""}))
+        if transport == "fake":
+            stack.enter_context(patch.object(consumer_lambda.smtplib, "SMTP", FakeSMTP))
+        else:
+            server = stack.enter_context(LocalSMTPServer())
+            stack.enter_context(patch.object(consumer_lambda, "SMTP_HOST", "127.0.0.1"))
+            stack.enter_context(patch.object(consumer_lambda, "SMTP_PORT", server.port))
+        stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+
+        latencies = []
+        failed = 0
+        started = time.perf_counter()
+        for batch in batches:
+            batch_started = time.perf_counter()
+            failed += len(consumer_lambda.lambda_handler({"Records": batch}, None)["batchItemFailures"])
+            latencies.append(time.perf_counter() - batch_started)
+        seconds = time.perf_counter() - started
+        pool.close_all()
+        FakeSMTP.instances.clear()
+
+    return {
+        "messages": len(records),
+        "failed": failed,
+        "invocations": len(batches),
+        "seconds": round(seconds, 4),
+        "messages_per_second": round((len(records) - failed) / seconds, 1) if seconds else 0.0,
+        "smtp_connects": pool.connects,
+        "invocation_latency": _percentiles(latencies),
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat=3, consumer_messages=1000):
+    """
+    Runs the producer benchmark for each table size and the consumer benchmark, and returns the report.
+    """
+    games = load_games()
+    producer = {}
+    for size in sizes:
+        producer[str(size)] = benchmark_producer(games, size, repeat)
+        print(f"[benchmark] {size} subscribers: {producer[str(size)]['stages_seconds']}", file=sys.stderr)
+
+    # Replay real producer output through the consumer.
+    index_table, users_table = build_tables(consumer_messages)
+    _, _, sqs = run_producer_stages(games, index_table, users_table, keep_messages=consumer_messages)
+    consumer = {transport: benchmark_consumer(sqs.kept, transport) for transport in ("fake", "local")}
+
+    return {
+        "benchmark": "pipeline",
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "games": len(games),
+        "producer": producer,
+        "consumer": consumer,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated subscriber counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--consumer-messages", type=int, default=1000)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    report = run_benchmarks([int(size) for size in args.sizes.split(",")], args.repeat, args.consumer_messages)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
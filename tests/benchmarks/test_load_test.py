@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+import load_test
+
+
+class TestLoadTest:
+
+    def test_short_run_reports_every_traffic_kind(self):
+        """
+        Test that a short run against the stubbed app succeeds and reports latency per traffic kind.
+        """
+        report = load_test.run_load_test(concurrency=4, duration=30, max_requests=80, warmup=0, users=20)
+
+        assert report["total"]["requests"] == 80
+        assert report["total"]["errors"] == 0
+        assert set(report["endpoints"]) == {"subscribe", "teams", "games", "stats"}
+        for result in report["endpoints"].values():
+            assert result["requests"] > 0
+            assert 0 < result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"] <= result["max_ms"]
+
+    def test_writes_go_to_the_stand_ins(self):
+        """
+        Test that subscribe and team update traffic lands in the in-memory tables and index.
+        """
+        data = load_test.TrafficData(5)
+        mix = load_test.parse_mix("subscribe=1,teams=1")
+
+        with load_test.stand_ins(data) as db, load_test.serve() as url:
+            seeded_index = len(db.tables["team_subscribers"].items)
+            _, errors, _ = asyncio.run(load_test.drive(url, data, mix, 2, 30, max_requests=20))
+
+        assert not errors
+        assert len(db.tables["users"].items) > 5
+        assert len(db.transactions) > 5
+        assert seeded_index >= 5
+
+    def test_unknown_traffic_kind_is_rejected(self):
+        """
+        Test that a mix naming an unknown traffic kind fails before any traffic is sent.
+        """
+        with pytest.raises(ValueError):
+            load_test.parse_mix("games=1,scores=2")
@@ -0,0 +1,39 @@
+import json
+
+import pipeline
+
+
+class TestPipelineBenchmark:
+
+    def test_small_run_reports_every_stage(self, tmp_path, monkeypatch):
+        """
+        Test that a small benchmark run times every stage and writes a JSON report.
+        """
+        output = tmp_path / "pipeline.json"
+        monkeypatch.setattr("sys.argv", ["pipeline.py", "--sizes", "200", "--repeat", "1",
+                                         "--consumer-messages", "20", "--output", str(output)])
+
+        pipeline.main()
+
+        report = json.loads(output.read_text())
+        result = report["producer"]["200"]
+        assert set(result["stages_seconds"]) == {"project", "scan", "match", "render", "enqueue", "end_to_end"}
+        assert result["counts"]["sqs_messages"] == result["handler_summary"]["newsletters"] > 0
+        assert result["counts"]["card_renders"] <= report["games"]
+        for transport in ("fake", "local"):
+            assert report["consumer"][transport]["failed"] == 0
+            assert report["consumer"][transport]["messages"] > 0
+
+    def test_synthetic_table_pages_like_dynamodb(self):
+        """
+        Test that the synthetic index pages through a partition and projects attributes.
+        """
+        index, users = pipeline.build_tables(50)
+        team_id = next(iter(index.partitions))
+        index.page_size = 3
+
+        items = list(pipeline.producer_lambda.query_items(index, "team_id", [team_id], attributes=("email",)))
+
+        assert sorted(item["email"] for item in items) == sorted(row[1] for row in index.partitions[team_id])
+        assert all(set(item) == {"email"} for item in items)
+        assert len(users.rows) == 50
@@ -0,0 +1,25 @@
+import pytest
+
+from app.core import cache, metrics
+from app.core.archive import GameArchive
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Start every test with empty in-process caches and metrics so mocked upstream data never leaks between tests.
+    """
+    cache.clear_all()
+    metrics.clear_all()
+    yield
+    cache.clear_all()
+
+
+@pytest.fixture(autouse=True)
+def game_archive(tmp_path, monkeypatch):
+    """
+    Point the game archive at a per-test directory instead of the local data directory.
+    """
+    archive = GameArchive(str(tmp_path / "archive"))
+    monkeypatch.setattr("app.services.games.game_archive", archive)
+    return archive
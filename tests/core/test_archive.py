@@ -0,0 +1,89 @@
+import json
+import multiprocessing
+
+from app.core.archive import GameArchive, game_date
+from fakes import make_game
+
+
+def append_games(directory, game_ids):
+    archive = GameArchive(directory)
+    for game_id in game_ids:
+        archive.append("2025-04-01", game_id, "scoreboard", make_game(game_id, date="2025-04-01"))
+
+
+class TestGameArchive:
+
+    def test_get_games_reads_only_requested_date(self, tmp_path):
+        """
+        Test that a day is read back from its own records.
+        """
+        archive = GameArchive(str(tmp_path))
+        archive.append("2025-04-01", "1", "scoreboard", make_game("1", date="2025-04-01"))
+        archive.append("2025-04-02", "2", "scoreboard", make_game("2", date="2025-04-02"))
+        archive.append("2025-04-02", "3", "scoreboard", make_game("3", date="2025-04-02"))
+
+        assert [game["gameId"] for game in archive.get_games("2025-04-02")] == ["2", "3"]
+        assert archive.get_games("2025-04-03") == []
+
+    def test_archive_is_append_only_and_deduplicated(self, tmp_path):
+        """
+        Test that re-archiving the same game and kind does not write a second record.
+        """
+        archive = GameArchive(str(tmp_path))
+
+        assert archive.append("2025-04-01", "1", "scoreboard", make_game("1", date="2025-04-01")) is True
+        size = (tmp_path / "games.dat").stat().st_size
+        assert archive.append("2025-04-01", "1", "scoreboard", make_game("1", date="2025-04-01")) is False
+        assert (tmp_path / "games.dat").stat().st_size == size
+
+    def test_index_is_shared_between_instances(self, tmp_path):
+        """
+        Test that a second reader (another process) sees records appended after it was created.
+        """
+        writer = GameArchive(str(tmp_path))
+        reader = GameArchive(str(tmp_path))
+        writer.append("2025-04-01", "1", "scoreboard", make_game("1", date="2025-04-01"))
+        writer.append("2025-04-01", "1", "boxscore", {"gameId": "1", "homeTeam": {"players": []}})
+
+        assert len(reader.get_games("2025-04-01")) == 1
+        assert reader.get_boxscore("1") == {"gameId": "1", "homeTeam": {"players": []}}
+        assert reader.get_boxscore("2") is None
+
+    def test_concurrent_processes_write_each_game_once(self, tmp_path):
+        """
+        Test that processes appending the same games at once never duplicate or corrupt index entries.
+        """
+        game_ids = [str(i) for i in range(30)]
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=append_games, args=(str(tmp_path), game_ids)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+
+        entries = [json.loads(line) for line in (tmp_path / "index.jsonl").read_text().splitlines()]
+        assert sorted(entry["game_id"] for entry in entries) == sorted(game_ids)
+        games = GameArchive(str(tmp_path)).get_games("2025-04-01")
+        assert sorted(game["gameId"] for game in games) == sorted(game_ids)
+
+    def test_get_games_in_range(self, tmp_path):
+        """
+        Test that a date range returns every archived day in the range, keyed by date.
+        """
+        archive = GameArchive(str(tmp_path))
+        for day in range(1, 6):
+            date = f"2025-04-0{day}"
+            archive.append(date, str(day), "scoreboard", make_game(str(day), date=date))
+
+        result = archive.get_games_in_range("2025-04-02", "2025-04-04")
+
+        assert sorted(result) == ["2025-04-02", "2025-04-03", "2025-04-04"]
+        assert result["2025-04-03"][0]["gameId"] == "3"
+
+    def test_game_date(self):
+        """
+        Test that the game date comes from gameCode, falling back to gameEt.
+        """
+        assert game_date({"gameCode": "20250407/LALGSW"}) == "2025-04-07"
+        assert game_date({"gameEt": "2025-04-07T19:30:00Z"}) == "2025-04-07"
+        assert game_date({}) is None
@@ -0,0 +1,192 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from app.core.cache import TTLCache
+from app.services.games import get_today_games, get_today_games_async, scoreboard_cache
+
+
+class TestTTLCache:
+
+    def test_get_loads_once_within_ttl(self):
+        """
+        Test that a fresh entry is served from the cache without calling the loader again.
+        """
+        cache = TTLCache("test", ttl=60)
+        loader = MagicMock(return_value=[1, 2, 3])
+
+        assert cache.get("k", loader) == [1, 2, 3]
+        assert cache.get("k", loader) == [1, 2, 3]
+
+        loader.assert_called_once()
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_get_reloads_after_expiry(self):
+        """
+        Test that an entry past its TTL and stale window is reloaded synchronously.
+        """
+        cache = TTLCache("test", ttl=10, stale_ttl=0)
+        loader = MagicMock(side_effect=["old", "new"])
+
+        with patch("app.core.cache.time.monotonic", return_value=100.0):
+            assert cache.get("k", loader) == "old"
+        with patch("app.core.cache.time.monotonic", return_value=111.0):
+            assert cache.get("k", loader) == "new"
+
+        assert cache.stats()["misses"] == 2
+
+    def test_get_serves_stale_while_revalidating(self):
+        """
+        Test that an expired entry inside the stale window is returned immediately
+        and refreshed in the background.
+        """
+        cache = TTLCache("test", ttl=10, stale_ttl=30)
+
+        with patch("app.core.cache.threading.Thread") as mock_thread:
+            with patch("app.core.cache.time.monotonic", return_value=1e12):
+                cache.set("k", "old")
+            with patch("app.core.cache.time.monotonic", return_value=1e12 + 15):
+                result = cache.get("k", lambda: "new")
+
+        assert result == "old"
+        mock_thread.assert_called_once()
+        assert cache.stats()["stale_hits"] == 1
+
+    def test_ttl_none_never_expires(self):
+        """
+        Test that a TTL of None keeps the entry forever.
+        """
+        cache = TTLCache("test", ttl=lambda value: None)
+        cache.set("k", "final")
+
+        with patch("app.core.cache.time.monotonic", return_value=1e18):
+            assert cache.get("k", lambda: "reloaded") == "final"
+
+    def test_set_prunes_entries_past_stale_window(self):
+        """
+        Test that entries nobody asks for again are dropped once they can no longer be served.
+        """
+        cache = TTLCache("test", ttl=10, stale_ttl=5)
+        with patch("app.core.cache.time.monotonic", return_value=0.0):
+            cache.set("old", 1)
+        with patch("app.core.cache.time.monotonic", return_value=12.0):
+            cache.set("recent", 2)
+        with patch("app.core.cache.time.monotonic", return_value=16.0):
+            cache.set("new", 3)
+
+        assert cache.stats()["size"] == 2
+
+    def test_scoreboard_is_shared_across_calls(self):
+        """
+        Test that repeated scoreboard reads hit nba_api only once per TTL window.
+        """
+        mock_games = [{"gameId": "1"}]
+        with patch("nba_api.live.nba.endpoints.scoreboard.ScoreBoard") as mock_scoreboard:
+            mock_scoreboard.return_value.get_dict.return_value = {"scoreboard": {"games": mock_games}}
+
+            assert get_today_games() == mock_games
+            assert get_today_games() == mock_games
+
+            mock_scoreboard.assert_called_once()
+        assert scoreboard_cache.stats()["hits"] == 1
+
+    def test_get_coalesces_concurrent_threads(self):
+        """
+        Test that threads missing the same key share one in-flight load.
+        """
+        cache = TTLCache("test", ttl=60)
+        calls = []
+        release = threading.Event()
+
+        def loader():
+            calls.append(1)
+            release.wait(1)
+            return "value"
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(cache.get, "k", loader) for _ in range(5)]
+            time.sleep(0.05)
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert results == ["value"] * 5
+        assert len(calls) == 1
+        assert cache.stats()["coalesced"] == 4
+
+    def test_aget_coalesces_concurrent_coroutines(self):
+        """
+        Test that coroutines missing the same key wait on one in-flight load.
+        """
+        cache = TTLCache("test", ttl=60)
+        loader = MagicMock(side_effect=lambda: time.sleep(0.05) or "value")
+
+        async def run():
+            return await asyncio.gather(*(cache.aget("k", loader) for _ in range(10)))
+
+        assert asyncio.run(run()) == ["value"] * 10
+        loader.assert_called_once()
+
+    def test_aget_propagates_loader_errors_to_all_waiters(self):
+        """
+        Test that a failed load is raised to every waiter and is not cached.
+        """
+        cache = TTLCache("test", ttl=60)
+
+        def loader():
+            time.sleep(0.05)
+            raise RuntimeError("upstream down")
+
+        async def run():
+            return await asyncio.gather(*(cache.aget("k", loader) for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert cache.get("k", lambda: "recovered") == "recovered"
+
+    def test_aget_cancelled_waiter_does_not_cancel_others(self):
+        """
+        Test that cancelling one coalesced waiter leaves the shared load and the other waiters intact.
+        """
+        cache = TTLCache("test", ttl=60)
+        release = threading.Event()
+
+        def loader():
+            release.wait(5)
+            return "value"
+
+        async def run():
+            leader = asyncio.create_task(cache.aget("k", loader))
+            follower = asyncio.create_task(cache.aget("k", loader))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            await asyncio.sleep(0.01)
+            release.set()
+            return await follower, leader.cancelled()
+
+        loop = asyncio.new_event_loop()
+        errors = []
+        loop.set_exception_handler(lambda loop, context: errors.append(context))
+        try:
+            assert loop.run_until_complete(run()) == ("value", True)
+        finally:
+            loop.close()
+        assert errors == []
+        assert cache.get("k", lambda: "reloaded") == "value"
+
+    def test_async_scoreboard_single_upstream_fetch(self):
+        """
+        Test that concurrent async scoreboard reads trigger a single ScoreBoard request.
+        """
+        mock_games = [{"gameId": "1"}]
+        with patch("nba_api.live.nba.endpoints.scoreboard.ScoreBoard") as mock_scoreboard:
+            mock_scoreboard.return_value.get_dict.return_value = {"scoreboard": {"games": mock_games}}
+
+            async def run():
+                return await asyncio.gather(*(get_today_games_async() for _ in range(20)))
+
+            assert asyncio.run(run()) == [mock_games] * 20
+            mock_scoreboard.assert_called_once()
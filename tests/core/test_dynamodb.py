@@ -0,0 +1,54 @@
+import pytest
+from fakes import FakeTable
+
+from app.core.dynamodb import scan_items
+
+
+class TestScanItems:
+
+    def test_scan_items_follows_last_evaluated_key(self):
+        """
+        Test that a serial scan reads every page instead of stopping after the first one.
+        """
+        items = [{"email": f"user{i}@example.com"} for i in range(7)]
+        table = FakeTable(items, page_size=3)
+
+        result = list(scan_items(table, total_segments=1))
+
+        assert result == items
+        assert len(table.scan_calls) == 3
+
+    def test_scan_items_parallel_segments(self):
+        """
+        Test that a segmented scan returns every item exactly once across all segments.
+        """
+        items = [{"email": f"user{i}@example.com"} for i in range(25)]
+        table = FakeTable(items, page_size=2)
+
+        result = list(scan_items(table, total_segments=4))
+
+        assert sorted(item["email"] for item in result) == sorted(item["email"] for item in items)
+        assert {call["TotalSegments"] for call in table.scan_calls} == {4}
+        assert {call["Segment"] for call in table.scan_calls} == {0, 1, 2, 3}
+
+    def test_scan_items_projection(self):
+        """
+        Test that only the requested attributes are fetched.
+        """
+        table = FakeTable([{"email": "a@example.com", "teams": [], "created_at": "2025-01-01"}])
+
+        result = list(scan_items(table, total_segments=2, attributes=("email", "teams")))
+
+        assert result == [{"email": "a@example.com", "teams": []}]
+        assert table.scan_calls[0]["ExpressionAttributeNames"] == {"#a0": "email", "#a1": "teams"}
+
+    def test_scan_items_raises_segment_errors(self):
+        """
+        Test that an error in any segment worker is raised to the caller.
+        """
+        class BrokenTable:
+            def scan(self, **kwargs):
+                raise RuntimeError("throttled")
+
+        with pytest.raises(RuntimeError, match="throttled"):
+            list(scan_items(BrokenTable(), total_segments=2))
@@ -0,0 +1,68 @@
+import json
+import threading
+
+from app.core.emf import MetricsLogger
+
+
+class TestMetricsLogger:
+
+    def test_flush_prints_one_emf_line(self, capsys):
+        """
+        Test that stage times, counters, samples and properties are printed as one EMF document.
+        """
+        metrics = MetricsLogger("producer", enabled=True, namespace="Test")
+        with metrics.stage("Render"):
+            pass
+        with metrics.stage("Render"):
+            pass
+        metrics.increment("Retries")
+        metrics.put("Users", 3)
+        for latency in (10, 20, 30, 40):
+            metrics.observe("SmtpSendLatency", latency)
+        metrics.set_property("requestId", "abc")
+
+        metrics.flush()
+
+        document = json.loads(capsys.readouterr().out)
+        directive, = document["_aws"]["CloudWatchMetrics"]
+        units = {metric["Name"]: metric["Unit"] for metric in directive["Metrics"]}
+        assert directive["Namespace"] == "Test" and directive["Dimensions"] == [["Service"]]
+        assert document["Service"] == "producer" and document["requestId"] == "abc"
+        assert units["RenderTime"] == "Milliseconds" and document["RenderTime"] >= 0
+        assert document["Retries"] == 1 and document["Users"] == 3
+        assert document["SmtpSendLatency"] == [10, 20, 30, 40]
+        assert (document["SmtpSendLatencyP50"], document["SmtpSendLatencyP99"]) == (30, 40)
+        assert "requestId" not in units
+
+    def test_disabled_logger_records_and_prints_nothing(self, capsys):
+        """
+        Test that a disabled logger is a no-op and hands iterables back unchanged.
+        """
+        metrics = MetricsLogger("producer", enabled=False)
+        users = iter([1, 2])
+
+        with metrics.stage("Render"):
+            metrics.increment("Retries")
+            metrics.observe("SmtpSendLatency", 1.0)
+        metrics.flush()
+
+        assert metrics.timed_iter("Scan", users) is users
+        assert metrics.elapsed("Render") == 0
+        assert capsys.readouterr().out == ""
+
+    def test_timed_iter_and_concurrent_counters(self):
+        """
+        Test that time spent producing items is recorded and counters are safe across threads.
+        """
+        metrics = MetricsLogger("consumer", enabled=True)
+
+        assert list(metrics.timed_iter("Scan", range(3))) == [0, 1, 2]
+        threads = [threading.Thread(target=lambda: [metrics.increment("Sent") for _ in range(1000)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        document = metrics.to_document()
+        assert "ScanTime" in document
+        assert document["Sent"] == 4000
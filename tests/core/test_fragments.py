@@ -0,0 +1,53 @@
+from jinja2 import DictLoader, Environment
+
+from app.core.fragments import FragmentRenderer
+
+TEMPLATE = """{% macro game_card(game) %}<div>{{ game.gameId }}: {{ game.score }}</div>{% endmacro -%}
+<h1>{{ date }}</h1>{% for card in cards %}{{ card }}{% endfor %}<footer/>"""
+
+
+def make_renderer():
+    env = Environment(loader=DictLoader({"page.html": TEMPLATE}))
+    return FragmentRenderer(env.get_template("page.html"))
+
+
+class TestFragmentRenderer:
+
+    def test_render_joins_shell_and_cards(self):
+        """
+        Test that a newsletter is the shell around each game's card, in order.
+        """
+        renderer = make_renderer()
+        games = [{"gameId": "1", "score": 10}, {"gameId": "2", "score": 20}]
+
+        html = renderer.render("2025-04-01", games, "v1")
+
+        assert html == "<h1>2025-04-01</h1><div>1: 10</div><div>2: 20</div><footer/>"
+        assert html == renderer.render("2025-04-01", games)
+
+    def test_cards_are_rendered_once_per_game_and_version(self):
+        """
+        Test that newsletters sharing games reuse their cards within a snapshot version.
+        """
+        renderer = make_renderer()
+        games = [{"gameId": "1", "score": 10}, {"gameId": "2", "score": 20}, {"gameId": "3", "score": 30}]
+
+        renderer.render("2025-04-01", games[:2], "v1")
+        renderer.render("2025-04-01", games[1:], "v1")
+        renderer.render("2025-04-01", games, "v1")
+
+        assert renderer.renders == 3
+        assert renderer.hits == 4
+
+    def test_new_version_rerenders_and_drops_old_cards(self):
+        """
+        Test that a new snapshot version renders fresh cards and does not serve stale ones.
+        """
+        renderer = make_renderer()
+        renderer.render("2025-04-01", [{"gameId": "1", "score": 10}], "v1")
+
+        html = renderer.render("2025-04-01", [{"gameId": "1", "score": 12}], "v2")
+
+        assert "<div>1: 12</div>" in html
+        assert renderer.renders == 2
+        assert list(renderer._cards) == ["1"]
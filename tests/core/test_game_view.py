@@ -0,0 +1,75 @@
+import os
+
+from jinja2 import Environment, FileSystemLoader
+
+from app.core.fragments import FragmentRenderer
+from app.core.game_view import GameView, project_games
+from app.core.team_matching import GameMatcher
+from app.services.games import get_game_projection
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_raw_game(game_id="0022400001"):
+    team = lambda team_id, tricode, score: {
+        "teamId": team_id, "teamName": tricode, "teamCity": tricode, "teamTricode": tricode,
+        "wins": 40, "losses": 20, "seed": None, "inBonus": "1", "timeoutsRemaining": 2, "score": score,
+        "periods": [{"period": 1, "periodType": "REGULAR", "score": score}],
+    }
+    leader = lambda name: {"personId": 1, "name": name, "jerseyNum": "23", "position": "F", "teamTricode": "LAL",
+                           "playerSlug": None, "points": 30, "rebounds": 10, "assists": 8}
+    return {
+        "gameId": game_id, "gameCode": "20250401/GSWLAL", "gameStatus": 3, "gameStatusText": "Final",
+        "period": 4, "gameClock": "", "gameTimeUTC": "2025-04-02T02:00:00Z", "gameEt": "2025-04-01T22:00:00Z",
+        "regulationPeriods": 4, "ifNecessary": False, "seriesGameNumber": "", "seriesText": "",
+        "homeTeam": team(1610612747, "LAL", 110), "awayTeam": team(1610612744, "GSW", 100),
+        "gameLeaders": {"homeLeaders": leader("Home Star"), "awayLeaders": leader("Away Star")},
+        "pbOdds": {"team": None, "odds": 0.0, "suspended": 0},
+    }
+
+
+class TestGameView:
+
+    def test_projection_keeps_only_used_fields(self):
+        """
+        Test that the projection drops fields nobody uses and keeps teams, scores, periods, leaders and status.
+        """
+        payload = GameView.from_dict(make_raw_game()).to_dict()
+
+        assert "pbOdds" not in payload and "gameClock" not in payload
+        assert "wins" not in payload["homeTeam"]
+        assert payload["homeTeam"]["periods"] == [{"period": 1, "score": 110}]
+        assert payload["gameLeaders"]["awayLeaders"] == {
+            "personId": 1, "name": "Away Star", "points": 30, "rebounds": 10, "assists": 8
+        }
+        assert payload["gameStatusText"] == "Final"
+
+    def test_views_render_the_same_newsletter_as_raw_games(self):
+        """
+        Test that both newsletter templates render identically from views and raw scoreboard dicts.
+        """
+        games = [make_raw_game()]
+        for directory, name in (("app/templates", "newsletter.html"), ("lambda/producer", "newsletter_template.html")):
+            template = Environment(loader=FileSystemLoader(os.path.join(ROOT, directory))).get_template(name)
+            renderer = FragmentRenderer(template)
+            assert renderer.render("2025-04-01", project_games(games)) == renderer.render("2025-04-01", games)
+
+    def test_views_work_with_game_matcher(self):
+        """
+        Test that views can be matched like scoreboard dicts.
+        """
+        views = project_games([make_raw_game()])
+
+        assert GameMatcher(views).match([{"id": 1610612744, "abbreviation": "GSW"}]) == views
+
+    def test_projection_is_built_once_per_snapshot(self):
+        """
+        Test that the same snapshot reuses its projection and payloads.
+        """
+        snapshot = [make_raw_game("1"), make_raw_game("2")]
+
+        projection = get_game_projection(snapshot)
+
+        assert get_game_projection(snapshot) is projection
+        assert projection.payloads_for(snapshot[1:]) == [projection.views[1].to_dict()]
+        assert get_game_projection(list(snapshot)) is not projection
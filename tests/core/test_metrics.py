@@ -0,0 +1,65 @@
+import boto3
+from botocore.stub import Stubber
+
+from app.core import metrics
+from app.core.metrics import Histogram, route_template
+
+
+class TestMetrics:
+
+    def test_histogram_renders_cumulative_buckets(self):
+        """
+        Test that a histogram is exposed with cumulative buckets, sum and count per label set.
+        """
+        histogram = Histogram("test_seconds", "Test histogram.", ("route",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, "/a")
+        histogram.observe(0.5, "/a")
+        histogram.observe(5.0, "/a")
+        histogram.observe(0.1, "/b")
+
+        lines = histogram.collect()
+
+        assert 'test_seconds_bucket{route="/a",le="0.1"} 1' in lines
+        assert 'test_seconds_bucket{route="/a",le="1.0"} 2' in lines
+        assert 'test_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+        assert 'test_seconds_count{route="/a"} 3' in lines
+        assert 'test_seconds_sum{route="/a"} 5.55' in lines
+        assert 'test_seconds_bucket{route="/b",le="0.1"} 1' in lines
+        metrics._metrics.remove(histogram)
+
+    def test_route_template_is_the_matched_routes_path(self):
+        """
+        Test that route labels use the matched route's full template, independent of the request path.
+        """
+        route = lambda path: type("Route", (), {"path": path})()
+        included = {"effective_route_context": route("/api/teams/{team_name}")}
+
+        assert route_template({"path": "/api/teams/lakers", "route": route("/api/teams/{team_name}")}) == "/api/teams/{team_name}"
+        assert route_template({"path": "/api/users/", "route": route("/api/users/")}) == "/api/users/"
+        assert route_template({"path": "/api/teams/lakers", "route": route("/{team_name}"), "fastapi": included}) == \
+            "/api/teams/{team_name}"
+        assert route_template({"path": "/wp-login.php"}) == "unmatched"
+
+    def test_dynamodb_calls_are_timed_by_operation(self):
+        """
+        Test that calls through an instrumented resource are timed, and error responses counted.
+        """
+        resource = boto3.resource("dynamodb", region_name="us-east-1",
+                                  aws_access_key_id="test", aws_secret_access_key="test")
+        metrics.instrument_dynamodb(resource)
+        table = resource.Table("users")
+
+        with Stubber(resource.meta.client) as stubber:
+            stubber.add_response("get_item", {"Item": {"email": {"S": "a@example.com"}}})
+            stubber.add_client_error("put_item", "ConditionalCheckFailedException")
+            table.get_item(Key={"email": "a@example.com"})
+            try:
+                table.put_item(Item={"email": "a@example.com"})
+            except resource.meta.client.exceptions.ConditionalCheckFailedException:
+                pass
+
+        text = metrics.render()
+        assert 'dynamodb_request_duration_seconds_count{operation="GetItem"} 1' in text
+        assert 'dynamodb_request_duration_seconds_count{operation="PutItem"} 1' in text
+        assert 'dynamodb_request_errors_total{operation="PutItem"} 1' in text
+        assert 'dynamodb_request_errors_total{operation="GetItem"}' not in text
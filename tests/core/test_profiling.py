@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import profiles
+from app.core import profiling
+from app.core.profiling import ProfileStore, ProfilingMiddleware
+
+
+def busy_wait(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def make_client(store, token=""):
+    app = FastAPI()
+
+    @app.get("/sync")
+    def sync_endpoint():
+        busy_wait(0.05)
+        return {"ok": True}
+
+    @app.get("/async")
+    async def async_endpoint():
+        await asyncio.sleep(0.05)
+        return {"ok": True}
+
+    app.add_middleware(ProfilingMiddleware, store=store, token=token, interval=0.001)
+    return TestClient(app)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProfileStore(str(tmp_path), max_files=2)
+
+
+class TestProfilingMiddleware:
+
+    def test_unprofiled_requests_store_nothing(self, store):
+        """
+        Test that requests without the X-Profile header are passed through untouched.
+        """
+        client = make_client(store)
+
+        response = client.get("/sync")
+
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+        assert store.list() == []
+
+    def test_sync_endpoint_is_sampled_on_the_threadpool(self, store):
+        """
+        Test that a profiled request returns its profile id and samples the worker thread running the endpoint.
+        """
+        client = make_client(store)
+
+        response = client.get("/sync", headers={"X-Profile": "1"})
+
+        profile_id = response.headers["x-profile-id"]
+        assert response.json() == {"ok": True}
+        assert profile_id.endswith("_GET_sync")
+        profile = store.read(profile_id)
+        assert "(threadpool);sync_endpoint" in profile
+        assert "busy_wait" in profile
+
+    def test_async_endpoint_await_is_sampled(self, store):
+        """
+        Test that time spent suspended in an await is attributed to the awaiting coroutine.
+        """
+        client = make_client(store)
+
+        response = client.get("/async", headers={"X-Profile": "1"})
+
+        lines = store.read(response.headers["x-profile-id"]).splitlines()
+        assert any("async_endpoint" in line and ";(await) " in line for line in lines)
+        assert all(line.startswith("__call__ (core/profiling.py") for line in lines)
+
+    def test_profile_is_saved_off_the_event_loop(self, tmp_path):
+        """
+        Test that saving the profile runs on a worker thread instead of blocking the event loop.
+        """
+        threads = {}
+
+        class RecordingStore(ProfileStore):
+            def save(self, profile_id, stacks):
+                threads["save"] = threading.get_ident()
+                super().save(profile_id, stacks)
+
+        app = FastAPI()
+
+        @app.get("/loop")
+        async def loop_endpoint():
+            threads["loop"] = threading.get_ident()
+            return {"ok": True}
+
+        app.add_middleware(ProfilingMiddleware, store=RecordingStore(str(tmp_path)), interval=0.001)
+        response = TestClient(app).get("/loop", headers={"X-Profile": "1"})
+
+        assert "x-profile-id" in response.headers
+        assert threads["save"] != threads["loop"]
+
+    def test_token_must_match(self, store):
+        """
+        Test that with a token configured, only requests presenting it are profiled.
+        """
+        client = make_client(store, token="secret")
+
+        wrong = client.get("/sync", headers={"X-Profile": "guess"})
+        right = client.get("/sync", headers={"X-Profile": "secret"})
+
+        assert "x-profile-id" not in wrong.headers
+        assert [entry["id"] for entry in store.list()] == [right.headers["x-profile-id"]]
+
+
+class TestProfileStore:
+
+    def test_keeps_only_the_newest_profiles(self, store):
+        """
+        Test that saving beyond max_files removes the oldest profiles.
+        """
+        for profile_id in ("20250101T000000Z_GET_a", "20250102T000000Z_GET_b", "20250103T000000Z_GET_c"):
+            store.save(profile_id, Counter({("main", "work"): 3}))
+
+        assert [entry["id"] for entry in store.list()] == ["20250103T000000Z_GET_c", "20250102T000000Z_GET_b"]
+        assert store.read("20250101T000000Z_GET_a") is None
+        assert store.read("20250103T000000Z_GET_c") == "main;work 3\n"
+
+    def test_rejects_ids_outside_the_directory(self, store):
+        """
+        Test that profile ids cannot be used to read other files.
+        """
+        with pytest.raises(ValueError):
+            store.read("../secrets")
+
+
+class TestProfilesRouter:
+
+    def test_lists_and_downloads_profiles(self, store, monkeypatch):
+        """
+        Test that the listing endpoint returns stored profiles and each can be downloaded as text.
+        """
+        monkeypatch.setattr(profiles, "profile_store", store)
+        store.save("20250101T000000Z_GET_a", Counter({("main",): 1}))
+        app = FastAPI()
+        app.include_router(profiles.router, prefix="/api/profiles")
+        client = TestClient(app)
+
+        listing = client.get("/api/profiles").json()
+        download = client.get("/api/profiles/20250101T000000Z_GET_a")
+        missing = client.get("/api/profiles/20250102T000000Z_GET_b").json()
+
+        assert listing["success"] is True
+        assert [entry["id"] for entry in listing["data"]] == ["20250101T000000Z_GET_a"]
+        assert download.headers["content-type"].startswith("text/plain")
+        assert download.text == "main 1\n"
+        assert missing["success"] is False
+
+    def test_profiling_is_off_by_default(self):
+        """
+        Test that the main app installs neither the middleware nor the endpoints unless enabled.
+        """
+        from app.main import app
+
+        assert profiling.PROFILE_HEADER == b"x-profile"
+        assert all(middleware.cls is not ProfilingMiddleware for middleware in app.user_middleware)
+        assert TestClient(app).get("/api/profiles").status_code == 404
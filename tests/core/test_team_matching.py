@@ -0,0 +1,49 @@
+from app.core.team_matching import GameMatcher
+from fakes import make_game
+
+
+GAMES = [
+    make_game("1", "LAL", "GSW", home_id=1610612747, away_id=1610612744),
+    make_game("2", "BOS", "NYK", home_id=1610612738, away_id=1610612752),
+]
+
+
+class TestGameMatcher:
+
+    def test_match_by_id_and_abbreviation(self):
+        """
+        Test that followed teams match by team ID or by abbreviation.
+        """
+        matcher = GameMatcher(GAMES)
+
+        assert matcher.match([{"id": 1610612747}]) == [GAMES[0]]
+        assert matcher.match([{"abbreviation": "NYK"}]) == [GAMES[1]]
+        assert matcher.match([{"id": 1610612744}, {"abbreviation": "BOS"}]) == GAMES
+
+    def test_teams_not_playing_have_empty_mask(self):
+        """
+        Test that a user whose teams are not playing today gets mask 0 and no games.
+        """
+        matcher = GameMatcher(GAMES)
+
+        assert matcher.team_mask([{"id": 1610612741, "abbreviation": "CHI"}]) == 0
+        assert matcher.match([]) == []
+
+    def test_group_users_by_identical_mask(self):
+        """
+        Test that users following the same teams share a group and that users
+        without a game today are dropped.
+        """
+        matcher = GameMatcher(GAMES)
+        users = [
+            {"email": "a", "teams": [{"abbreviation": "LAL"}]},
+            {"email": "b", "teams": [{"abbreviation": "LAL"}, {"abbreviation": "CHI"}]},
+            {"email": "c", "teams": [{"abbreviation": "GSW"}]},
+            {"email": "d", "teams": [{"abbreviation": "CHI"}]},
+        ]
+
+        groups = matcher.group_users(users)
+
+        assert sorted(len(group) for group in groups.values()) == [1, 2]
+        for mask, group in groups.items():
+            assert matcher.match_mask(mask) == [GAMES[0]]
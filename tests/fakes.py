@@ -0,0 +1,305 @@
+import json
+import threading
+
+from botocore.exceptions import ClientError
+
+
+def make_game(game_id, home="HOM", away="AWY", home_id=None, away_id=None, home_score=100, away_score=90,
+              status="Final", date="2025-04-01"):
+    """
+    Builds a scoreboard game in nba_api's live format, as ScoreBoard().get_dict() lists them.
+    Team IDs default to ``"<tricode>-id"``; games with any other status than "Final" are in progress.
+    """
+    def team(tricode, team_id, score):
+        return {"teamId": f"{tricode}-id" if team_id is None else team_id, "teamTricode": tricode,
+                "teamCity": tricode, "teamName": tricode, "score": score, "periods": []}
+
+    return {
+        "gameId": game_id,
+        "gameCode": f"{date.replace('-', '')}/{away}{home}",
+        "gameStatus": 3 if status == "Final" else 2,
+        "gameStatusText": status,
+        "homeTeam": team(home, home_id, home_score),
+        "awayTeam": team(away, away_id, away_score),
+        "gameLeaders": {"homeLeaders": {}, "awayLeaders": {}}
+    }
+
+
+class FakeSQS:
+    """
+    In-memory stand-in for the boto3 SQS client's send_message_batch.
+    ``fail_first`` entry IDs are reported as failed on their first attempt only.
+    """
+
+    def __init__(self, fail_first=()):
+        self.messages = []
+        self.calls = []
+        self._fail_first = set(fail_first)
+        self._lock = threading.Lock()
+
+    def send_message_batch(self, QueueUrl, Entries):
+        assert len(Entries) <= 10
+        with self._lock:
+            self.calls.append([entry["Id"] for entry in Entries])
+            failed = []
+            for entry in Entries:
+                if entry["Id"] in self._fail_first:
+                    self._fail_first.discard(entry["Id"])
+                    failed.append({"Id": entry["Id"], "SenderFault": False, "Code": "InternalError"})
+                else:
+                    self.messages.append(json.loads(entry["MessageBody"]))
+        return {"Successful": [], "Failed": failed}
+
+
+class FakeTable:
+    """
+    In-memory stand-in for a boto3 DynamoDB Table.
+    Supports paginated and segmented scans, single-key equality queries and batch writes.
+    Items are assigned to scan segments by position and pages hold ``page_size`` items.
+    """
+
+    def __init__(self, items=(), page_size=2, key=("email",)):
+        self.key = key
+        self.page_size = page_size
+        self.scan_calls = []
+        self.query_calls = []
+        self._items = {}
+        self._lock = threading.Lock()
+        for item in items:
+            self.put_item(Item=item)
+
+    @property
+    def items(self):
+        return list(self._items.values())
+
+    def _key_of(self, item):
+        return tuple(item[k] for k in self.key)
+
+    def put_item(self, Item):
+        with self._lock:
+            self._items[self._key_of(Item)] = dict(Item)
+
+    def delete_item(self, Key):
+        with self._lock:
+            self._items.pop(self._key_of(Key), None)
+
+    def get_item(self, Key):
+        item = self._items.get(self._key_of(Key))
+        return {"Item": dict(item)} if item is not None else {}
+
+    def batch_writer(self):
+        return _FakeBatchWriter(self)
+
+    def _page(self, items, kwargs):
+        start = kwargs.get("ExclusiveStartKey", {}).get("offset", 0)
+        page = items[start:start + self.page_size]
+
+        names = kwargs.get("ExpressionAttributeNames", {})
+        if "ProjectionExpression" in kwargs:
+            attributes = [names.get(name.strip(), name.strip()) for name in kwargs["ProjectionExpression"].split(",")]
+            page = [{k: item[k] for k in attributes if k in item} for item in page]
+
+        response = {"Items": page}
+        if start + self.page_size < len(items):
+            response["LastEvaluatedKey"] = {"offset": start + self.page_size}
+        return response
+
+    def scan(self, **kwargs):
+        with self._lock:
+            self.scan_calls.append(kwargs)
+
+        segment = kwargs.get("Segment", 0)
+        total_segments = kwargs.get("TotalSegments", 1)
+        return self._page(self.items[segment::total_segments], kwargs)
+
+    def query(self, **kwargs):
+        with self._lock:
+            self.query_calls.append(kwargs)
+
+        # Only "#name = :value" key conditions are supported.
+        name, value = [part.strip() for part in kwargs["KeyConditionExpression"].split("=")]
+        attribute = kwargs.get("ExpressionAttributeNames", {}).get(name, name)
+        expected = kwargs["ExpressionAttributeValues"][value]
+        return self._page([item for item in self.items if item.get(attribute) == expected], kwargs)
+
+
+class _FakeBatchWriter:
+
+    def __init__(self, table):
+        self.table = table
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def put_item(self, Item):
+        self.table.put_item(Item=Item)
+
+    def delete_item(self, Key):
+        self.table.delete_item(Key=Key)
+
+
+class FakeDynamoDB:
+    """
+    In-memory stand-in for DynamoDB transactions over FakeTables, keyed by table name.
+    Supports Put, Delete and Update ("SET a = :a, ..." only) items with "attr = :value" and
+    "attribute_not_exists(attr)" conditions. Every condition is checked before anything is written.
+    """
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.transactions = []
+        self._lock = threading.Lock()
+
+    def get_table(self, name):
+        return self.tables[name]
+
+    def _condition_holds(self, item, spec):
+        condition = spec.get("ConditionExpression")
+        if not condition:
+            return True
+        if condition.startswith("attribute_not_exists("):
+            return item is None or condition[len("attribute_not_exists("):-1] not in item
+        name, value = [part.strip() for part in condition.split("=")]
+        return item is not None and item.get(name) == spec["ExpressionAttributeValues"][value]
+
+    def transact_write(self, items):
+        assert len(items) <= 100
+        with self._lock:
+            for item in items:
+                (operation, spec), = item.items()
+                table = self.tables[spec["TableName"]]
+                key = spec["Item"] if operation == "Put" else spec["Key"]
+                if not self._condition_holds(table.get_item(Key=key).get("Item"), spec):
+                    raise ClientError(
+                        {"Error": {"Code": "TransactionCanceledException", "Message": "ConditionalCheckFailed"}},
+                        "TransactWriteItems"
+                    )
+
+            for item in items:
+                (operation, spec), = item.items()
+                table = self.tables[spec["TableName"]]
+                if operation == "Put":
+                    table.put_item(Item=spec["Item"])
+                elif operation == "Delete":
+                    table.delete_item(Key=spec["Key"])
+                else:
+                    updated = table.get_item(Key=spec["Key"]).get("Item", dict(spec["Key"]))
+                    for assignment in spec["UpdateExpression"].removeprefix("SET ").split(","):
+                        name, value = [part.strip() for part in assignment.split("=")]
+                        updated[name] = spec["ExpressionAttributeValues"][value]
+                    table.put_item(Item=updated)
+            self.transactions.append(items)
+
+
+class FakeSMTP:
+    """
+    Stand-in for smtplib.SMTP that records connections, logins and sent messages.
+    Recipients in ``refuse`` are rejected; ``disconnect_after`` drops the session after that many sends.
+    """
+
+    instances = []
+
+    def __init__(self, host, port, timeout=None, refuse=(), disconnect_after=None):
+        self.host = host
+        self.port = port
+        self.logins = 0
+        self.sent = []
+        self.refuse = set(refuse)
+        self.disconnect_after = disconnect_after
+        FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        self.logins += 1
+
+    def send_message(self, msg):
+        import smtplib
+
+        if self.disconnect_after is not None and len(self.sent) >= self.disconnect_after:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        if msg["To"] in self.refuse:
+            raise smtplib.SMTPRecipientsRefused({msg["To"]: (550, b"No such user")})
+        self.sent.append(msg)
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class LocalSMTPServer:
+    """
+    Minimal threaded SMTP sink on localhost, in the spirit of a local SMTP debugging server.
+    Accepted messages are stored in ``messages``. The first ``throttle_first`` MAIL
+    commands are answered with ``throttle_code`` (421 also closes the session).
+    """
+
+    def __init__(self, throttle_first=0, throttle_code=421):
+        import socketserver
+
+        self.messages = []
+        self.sessions = 0
+        self.throttle_first = throttle_first
+        self.throttle_code = throttle_code
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line):
+                self.wfile.write(line.encode() + b"\r\n")
+
+            def handle(self):
+                with server._lock:
+                    server.sessions += 1
+                self.reply("220 localhost ESMTP test")
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    command = line.decode().strip().upper()
+                    if command.startswith(("EHLO", "HELO")):
+                        self.reply("250 localhost")
+                    elif command.startswith("MAIL"):
+                        with server._lock:
+                            throttled = server.throttle_first > 0
+                            server.throttle_first -= throttled
+                        if throttled:
+                            self.reply(f"{server.throttle_code} Try again later")
+                            if server.throttle_code == 421:
+                                return
+                        else:
+                            self.reply("250 OK")
+                    elif command.startswith(("RCPT", "RSET", "NOOP")):
+                        self.reply("250 OK")
+                    elif command == "DATA":
+                        self.reply("354 End data with <CR><LF>.<CR><LF>")
+                        data = []
+                        while (data_line := self.rfile.readline()) not in (b".\r\n", b""):
+                            data.append(data_line)
+                        with server._lock:
+                            server.messages.append(b"".join(data))
+                        self.reply("250 OK")
+                    elif command == "QUIT":
+                        self.reply("221 Bye")
+                        return
+                    else:
+                        self.reply("502 Command not implemented")
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        return False
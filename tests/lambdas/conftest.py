@@ -0,0 +1,18 @@
+import importlib
+import os
+import sys
+
+# The Lambda sources are deployed as flat zips, so import them the same way the runtime does.
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "lambda", "producer"))
+sys.path.insert(0, os.path.join(ROOT, "lambda", "consumer"))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-2")
+
+# build-script.sh ships these app/core modules as top-level modules next to the Lambdas.
+sys.path.insert(0, ROOT)
+sys.modules.setdefault("team_matching", importlib.import_module("app.core.team_matching"))
+sys.modules.setdefault("dynamodb", importlib.import_module("app.core.dynamodb"))
+sys.modules.setdefault("game_view", importlib.import_module("app.core.game_view"))
+sys.modules.setdefault("fragments", importlib.import_module("app.core.fragments"))
+sys.modules.setdefault("emf", importlib.import_module("app.core.emf"))
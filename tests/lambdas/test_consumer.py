@@ -0,0 +1,147 @@
+import json
+from functools import partial
+from unittest.mock import patch
+
+import pytest
+from fakes import FakeSMTP, LocalSMTPServer
+
+import consumer_lambda
+
+
+def make_event(emails):
+    return {
+        "Records": [
+            {
+                "messageId": f"msg-{i}",
+                "body": json.dumps({"email": email, "subject": "NBA Newsletter", "html_body": "<p>hi</p>"})
+            }
+            for i, email in enumerate(emails)
+        ]
+    }
+
+
+@pytest.fixture(autouse=True)
+def reset_consumer(monkeypatch):
+    monkeypatch.setenv("GMAIL_ADDRESS", "sender@example.com")
+    monkeypatch.setenv("GMAIL_APP_PASSWORD", "secret")
+    monkeypatch.setattr(consumer_lambda, "_pool", consumer_lambda.SMTPConnectionPool(1))
+    monkeypatch.setattr(consumer_lambda, "_limiter", consumer_lambda.RateLimiter(1000, 0))
+    FakeSMTP.instances = []
+    yield
+    consumer_lambda._pool.close_all()
+
+
+@pytest.fixture
+def local_smtp(monkeypatch):
+    """
+    Point the consumer at a plain-text local SMTP server without authentication.
+    """
+    def start(**kwargs):
+        server = LocalSMTPServer(**kwargs).__enter__()
+        monkeypatch.setattr(consumer_lambda, "SMTP_HOST", "127.0.0.1")
+        monkeypatch.setattr(consumer_lambda, "SMTP_PORT", server.port)
+        monkeypatch.setattr(consumer_lambda, "SMTP_STARTTLS", False)
+        monkeypatch.delenv("GMAIL_APP_PASSWORD")
+        servers.append(server)
+        return server
+
+    servers = []
+    yield start
+    for server in servers:
+        server.__exit__(None, None, None)
+
+
+class TestConsumer:
+
+    def test_batch_reuses_one_smtp_session(self):
+        """
+        Test that a batch of messages is sent over one connection with a single login.
+        """
+        with patch.object(consumer_lambda.smtplib, "SMTP", FakeSMTP):
+            result = consumer_lambda.lambda_handler(make_event(["a@x.com", "b@x.com", "c@x.com"]), None)
+
+        assert result["batchItemFailures"] == []
+        assert len(FakeSMTP.instances) == 1
+        assert FakeSMTP.instances[0].logins == 1
+        assert len(FakeSMTP.instances[0].sent) == 3
+
+    def test_bad_address_reported_as_item_failure(self):
+        """
+        Test that a refused recipient only fails its own record and does not drop the session.
+        """
+        smtp = partial(FakeSMTP, refuse={"bad@x.com"})
+        with patch.object(consumer_lambda.smtplib, "SMTP", smtp):
+            result = consumer_lambda.lambda_handler(make_event(["a@x.com", "bad@x.com", "c@x.com"]), None)
+
+        assert result["batchItemFailures"] == [{"itemIdentifier": "msg-1"}]
+        assert len(FakeSMTP.instances) == 1
+        assert len(FakeSMTP.instances[0].sent) == 2
+
+    def test_reconnects_when_session_drops(self):
+        """
+        Test that a disconnected session is replaced and the message retried on the new one.
+        """
+        smtp = partial(FakeSMTP, disconnect_after=2)
+        with patch.object(consumer_lambda.smtplib, "SMTP", smtp):
+            result = consumer_lambda.lambda_handler(make_event(["a@x.com", "b@x.com", "c@x.com"]), None)
+
+        assert result["batchItemFailures"] == []
+        assert len(FakeSMTP.instances) == 2
+        assert [len(server.sent) for server in FakeSMTP.instances] == [2, 1]
+
+    def test_concurrent_pool_against_local_smtp_server(self, local_smtp, monkeypatch):
+        """
+        Test that a batch is delivered concurrently over a bounded number of sessions
+        and that throughput is reported.
+        """
+        monkeypatch.setattr(consumer_lambda, "_pool", consumer_lambda.SMTPConnectionPool(3))
+        server = local_smtp()
+
+        result = consumer_lambda.lambda_handler(make_event([f"user{i}@x.com" for i in range(10)]), None)
+
+        assert result["batchItemFailures"] == []
+        assert len(server.messages) == 10
+        assert server.sessions <= 3
+        assert result["summary"]["messages_per_second"] > 0
+
+    def test_throttle_reply_slows_down_and_retries(self, local_smtp):
+        """
+        Test that a 421 reply halves the send rate and the message is retried on a new session.
+        """
+        server = local_smtp(throttle_first=1, throttle_code=421)
+
+        with patch.object(consumer_lambda.time, "sleep"):
+            result = consumer_lambda.lambda_handler(make_event(["a@x.com"]), None)
+
+        assert result["batchItemFailures"] == []
+        assert len(server.messages) == 1
+        assert server.sessions == 2
+        assert consumer_lambda._limiter.rate < consumer_lambda._limiter.max_rate
+
+    def test_rate_limiter_daily_quota(self, monkeypatch):
+        """
+        Test that sends beyond the daily quota are refused and reported as failures.
+        """
+        monkeypatch.setattr(consumer_lambda, "_limiter", consumer_lambda.RateLimiter(1000, 2))
+
+        with patch.object(consumer_lambda.smtplib, "SMTP", FakeSMTP):
+            result = consumer_lambda.lambda_handler(make_event(["a@x.com", "b@x.com", "c@x.com"]), None)
+
+        assert result["summary"]["sent"] == 2
+        assert len(result["batchItemFailures"]) == 1
+
+    def test_lambda_handler_logs_smtp_latency_percentiles(self, capsys, monkeypatch):
+        """
+        Test that the handler prints SMTP send latency samples and percentiles in its EMF line.
+        """
+        monkeypatch.setattr("emf.METRICS_ENABLED", True)
+
+        with patch.object(consumer_lambda.smtplib, "SMTP", partial(FakeSMTP, disconnect_after=2)):
+            consumer_lambda.lambda_handler(make_event(["a@x.com", "b@x.com", "c@x.com"]), None)
+
+        document = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+        assert len(document["SmtpSendLatency"]) == 3
+        assert document["SmtpSendLatencyP50"] <= document["SmtpSendLatencyP99"]
+        assert document["SmtpReconnects"] == 1
+        assert document["SmtpConnects"] == 2
+        assert document["Sent"] == 3
@@ -0,0 +1,227 @@
+import json
+from unittest.mock import patch
+
+import producer_lambda
+from fakes import FakeSQS, FakeTable, make_game
+
+
+def make_team_index():
+    # A backfilled index, so the producer reads it instead of scanning the users table.
+    return FakeTable([producer_lambda.TEAM_INDEX_READY_KEY], key=("team_id", "email"))
+
+
+class TestProducer:
+
+    def test_get_digest_html_renders_once_per_game_set(self):
+        """
+        Test that identical matched game sets are rendered once, regardless of game order.
+        """
+        games = [make_game("1", "LAL", "GSW"), make_game("2", "BOS", "NYK")]
+        digest_cache = {}
+
+        with patch.object(producer_lambda, "create_newsletter_html", return_value="<html/>") as mock_render:
+            first, first_cached = producer_lambda.get_digest_html(digest_cache, "2025-01-01", games)
+            second, second_cached = producer_lambda.get_digest_html(digest_cache, "2025-01-01", games[::-1])
+
+        assert first == second == "<html/>"
+        assert (first_cached, second_cached) == (False, True)
+        mock_render.assert_called_once()
+
+    def test_lambda_handler_reports_render_cache_hit_rate(self):
+        """
+        Test that the handler renders each distinct digest once and reports the hit rate.
+        """
+        games = [make_game("1", "LAL", "GSW"), make_game("2", "BOS", "NYK")]
+        users = {
+            "a@example.com": ["LAL"],
+            "b@example.com": ["GSW", "LAL"],
+            "c@example.com": ["BOS"],
+            "d@example.com": ["CHI"]
+        }
+        team_index = make_team_index()
+        for email, tricodes in users.items():
+            teams = [{"id": f"{tricode}-id", "abbreviation": tricode} for tricode in tricodes]
+            for team in teams:
+                team_index.put_item(Item={"team_id": team["id"], "email": email, "teams": teams})
+        fake_sqs = FakeSQS()
+
+        with patch.object(producer_lambda, "get_today_games", return_value=games), \
+             patch.object(producer_lambda, "team_index_table", team_index), \
+             patch.object(producer_lambda, "sqs", fake_sqs), \
+             patch.object(producer_lambda, "create_newsletter_html", side_effect=lambda d, g, v=None: g[0]["gameId"]) as mock_render:
+            result = producer_lambda.lambda_handler({}, None)
+
+        assert mock_render.call_count == 2
+        assert sorted(m["email"] for m in fake_sqs.messages) == ["a@example.com", "b@example.com", "c@example.com"]
+        assert {call["ExpressionAttributeValues"][":pk"] for call in team_index.query_calls} == {
+            "LAL-id", "GSW-id", "BOS-id", "NYK-id"
+        }
+        assert result["summary"]["users"] == 3
+        assert result["summary"]["distinct_digests"] == 2
+        assert result["summary"]["render_cache_hit_rate"] == round(1 / 3, 4)
+
+    def test_lambda_handler_renders_each_game_card_once(self):
+        """
+        Test that digests sharing games reuse the game's rendered card.
+        """
+        games = [make_game("1", "LAL", "GSW"), make_game("2", "BOS", "NYK")]
+        team_index = make_team_index()
+        for email, tricodes in {"a@example.com": ["LAL"], "b@example.com": ["BOS"], "c@example.com": ["LAL", "BOS"]}.items():
+            teams = [{"id": f"{tricode}-id", "abbreviation": tricode} for tricode in tricodes]
+            for team in teams:
+                team_index.put_item(Item={"team_id": team["id"], "email": email, "teams": teams})
+        fake_sqs = FakeSQS()
+
+        with patch.object(producer_lambda, "get_today_games", return_value=games), \
+             patch.object(producer_lambda, "team_index_table", team_index), \
+             patch.object(producer_lambda, "sqs", fake_sqs), \
+             patch.object(producer_lambda, "renderer", producer_lambda.FragmentRenderer(producer_lambda.load_template())):
+            result = producer_lambda.lambda_handler({}, None)
+
+        html_by_email = {message["email"]: message["html_body"] for message in fake_sqs.messages}
+        assert result["summary"]["distinct_digests"] == 3
+        assert result["summary"]["card_renders"] == 2
+        assert html_by_email["c@example.com"].count("Quarter Scores") == 2
+        assert "LAL LAL (100)" in html_by_email["a@example.com"]
+
+    def test_lambda_handler_logs_stage_metrics(self, capsys, monkeypatch):
+        """
+        Test that the handler prints one EMF line with per-stage timings and counters.
+        """
+        monkeypatch.setattr("emf.METRICS_ENABLED", True)
+        games = [make_game("1", "LAL", "GSW"), make_game("2", "BOS", "NYK")]
+        team_index = make_team_index()
+        for email, tricode in (("a@example.com", "LAL"), ("b@example.com", "BOS")):
+            teams = [{"id": f"{tricode}-id", "abbreviation": tricode}]
+            team_index.put_item(Item={"team_id": teams[0]["id"], "email": email, "teams": teams})
+
+        with patch.object(producer_lambda, "get_today_games", return_value=games), \
+             patch.object(producer_lambda, "team_index_table", team_index), \
+             patch.object(producer_lambda, "sqs", FakeSQS()):
+            producer_lambda.lambda_handler({}, None)
+
+        document = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+        metric_names = {metric["Name"] for metric in document["_aws"]["CloudWatchMetrics"][0]["Metrics"]}
+        assert {"FetchGamesTime", "ScanTime", "MatchTime", "RenderTime", "EnqueueTime"} <= metric_names
+        assert document["UsersScanned"] == 2
+        assert document["DistinctDigests"] == 2
+        assert document["SqsBatches"] == 1
+
+    def test_lambda_handler_prints_nothing_with_metrics_disabled(self, capsys, monkeypatch):
+        """
+        Test that disabling metrics removes the log line.
+        """
+        monkeypatch.setattr("emf.METRICS_ENABLED", False)
+
+        with patch.object(producer_lambda, "get_today_games", return_value=[]):
+            producer_lambda.lambda_handler({}, None)
+
+        assert capsys.readouterr().out == ""
+
+    def test_lambda_handler_without_games_creates_no_clients(self):
+        """
+        Test that a day without games returns before any AWS client or template is created.
+        """
+        with patch.object(producer_lambda, "get_today_games", return_value=[]), \
+             patch.object(producer_lambda, "get_table") as mock_get_table, \
+             patch.object(producer_lambda, "get_sqs") as mock_get_sqs, \
+             patch.object(producer_lambda, "load_template") as mock_load_template:
+            result = producer_lambda.lambda_handler({}, None)
+
+        assert result["message"] == "No games today"
+        assert result["summary"]["newsletters"] == 0
+        mock_get_table.assert_not_called()
+        mock_get_sqs.assert_not_called()
+        mock_load_template.assert_not_called()
+
+    def test_precompiled_template_renders_like_the_source(self, tmp_path):
+        """
+        Test that the template compiled by the build renders the same newsletter as the source.
+        """
+        import compile_templates
+
+        games = producer_lambda.project_games([make_game("1", "LAL", "GSW")])
+        source = producer_lambda.load_template()
+        compile_templates.compile_templates(str(tmp_path))
+
+        with patch.object(producer_lambda, "COMPILED_TEMPLATES_DIR", str(tmp_path)):
+            compiled = producer_lambda.load_template()
+
+        assert compiled.filename != source.filename
+        assert producer_lambda.FragmentRenderer(compiled).render("2025-04-01", games) == \
+            producer_lambda.FragmentRenderer(source).render("2025-04-01", games)
+
+    def test_get_today_subscribers_falls_back_to_users_scan_while_index_is_empty(self):
+        """
+        Test that subscribers are still found before the team index has been backfilled.
+        """
+        users = FakeTable([
+            {"email": "a@example.com", "teams": [{"id": "LAL-id", "abbreviation": "LAL"}]},
+            {"email": "b@example.com", "teams": []}
+        ])
+        team_index = FakeTable(key=("team_id", "email"))
+
+        with patch.object(producer_lambda, "team_index_table", team_index), \
+             patch.object(producer_lambda, "users_table", users):
+            subscribers = list(producer_lambda.get_today_subscribers([make_game("1", "LAL", "GSW")]))
+
+        assert sorted(user["email"] for user in subscribers) == ["a@example.com", "b@example.com"]
+        assert team_index.query_calls == []
+
+    def test_get_today_subscribers_falls_back_until_backfill_completes(self):
+        """
+        Test that a subscribe made before the backfill does not hide the rest of the users table.
+        """
+        lal = [{"id": "LAL-id", "abbreviation": "LAL"}]
+        users = FakeTable([
+            {"email": "a@example.com", "teams": lal},
+            {"email": "new@example.com", "teams": lal}
+        ])
+        team_index = FakeTable([{"team_id": "LAL-id", "email": "new@example.com", "teams": lal}], key=("team_id", "email"))
+        game = make_game("1", "LAL", "GSW")
+
+        with patch.object(producer_lambda, "team_index_table", team_index), \
+             patch.object(producer_lambda, "users_table", users):
+            before = list(producer_lambda.get_today_subscribers([game]))
+            queried_before_backfill = list(team_index.query_calls)
+            team_index.put_item(Item={"team_id": "LAL-id", "email": "a@example.com", "teams": lal})
+            team_index.put_item(Item=producer_lambda.TEAM_INDEX_READY_KEY)
+            after = list(producer_lambda.get_today_subscribers([game]))
+
+        assert sorted(user["email"] for user in before) == ["a@example.com", "new@example.com"]
+        assert sorted(user["email"] for user in after) == ["a@example.com", "new@example.com"]
+        assert queried_before_backfill == []
+        assert team_index.query_calls
+
+    def test_sqs_publisher_batches_by_ten(self):
+        """
+        Test that messages are sent in batches of at most 10 entries.
+        """
+        fake_sqs = FakeSQS()
+        publisher = producer_lambda.SQSPublisher(fake_sqs, "queue-url")
+
+        for i in range(25):
+            publisher.publish(f"user{i}@example.com", "subject", "<html/>")
+        summary = publisher.close()
+
+        assert sorted(len(call) for call in fake_sqs.calls) == [5, 10, 10]
+        assert summary["sqs_sent"] == 25
+        assert summary["sqs_batches"] == 3
+        assert {m["email"] for m in fake_sqs.messages} == {f"user{i}@example.com" for i in range(25)}
+        assert fake_sqs.messages[0]["html_body"] == "<html/>"
+
+    def test_sqs_publisher_retries_only_failed_entries(self):
+        """
+        Test that only the entries SQS reports as failed are sent again.
+        """
+        fake_sqs = FakeSQS(fail_first={"1", "3"})
+        publisher = producer_lambda.SQSPublisher(fake_sqs, "queue-url")
+
+        with patch.object(producer_lambda.time, "sleep"):
+            for i in range(4):
+                publisher.publish(f"user{i}@example.com", "subject", "<html/>")
+            summary = publisher.close()
+
+        assert fake_sqs.calls == [["0", "1", "2", "3"], ["1", "3"]]
+        assert summary["sqs_sent"] == 4
+        assert summary["sqs_failed"] == 0
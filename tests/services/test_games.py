@@ -6,7 +6,9 @@ import pytest
 import pytz
 from nba_api.live.nba.endpoints import scoreboard
 
+from app.services import games
 from app.services.games import get_games_by_date
+from app.services.games import get_today_games
 from app.services.games import get_team_game_today
 from app.services.games import get_today_us_date
 from app.services.games import get_user_team_games_today
@@ -14,19 +16,49 @@ from app.services.games import get_user_team_games_today
 
 class TestGames(unittest.TestCase):
 
-    def test_get_games_by_date_ignores_input(self):
+    def test_get_games_by_date_today_uses_live_scoreboard(self):
         """
-        Test that get_games_by_date ignores the input date_str parameter.
-        This is an edge case where the method accepts an input but doesn't use it.
+        Test that get_games_by_date returns the live scoreboard for today's date or no date.
         """
-        # Call the method with a non-None date_str
-        result_with_date = get_games_by_date("2023-01-01")
+        mock_games = [{"gameId": "1"}]
+        with patch('app.services.games.get_today_games', return_value=mock_games):
+            result_with_date = get_games_by_date(get_today_us_date())
+            result_without_date = get_games_by_date()
 
-        # Call the method with None as date_str
-        result_without_date = get_games_by_date()
+        assert result_with_date == result_without_date == mock_games
 
-        # Assert that the results are the same, indicating the input is ignored
-        assert result_with_date == result_without_date
+    def test_get_games_by_date_past_date_reads_archive(self):
+        """
+        Test that a past date is served from the archive without calling nba_api.
+        """
+        archived_game = {"gameId": "0022300001", "gameCode": "20230101/LALGSW", "gameStatus": 3}
+        games.game_archive.append("2023-01-01", archived_game["gameId"], "scoreboard", archived_game)
+
+        with patch('app.services.games.scoreboard.ScoreBoard') as mock_scoreboard:
+            result = get_games_by_date("2023-01-01")
+
+        assert result == [archived_game]
+        mock_scoreboard.assert_not_called()
+
+    def test_get_games_by_date_invalid_date(self):
+        """
+        Test that a malformed date is rejected.
+        """
+        with pytest.raises(ValueError, match="Invalid date"):
+            get_games_by_date("01-01-2023")
+
+    def test_final_games_are_archived_on_fetch(self):
+        """
+        Test that games reported as Final by the live scoreboard are appended to the archive once.
+        """
+        final_game = {"gameId": "1", "gameCode": "20250407/LALGSW", "gameStatus": 3}
+        live_game = {"gameId": "2", "gameCode": "20250407/BOSNYK", "gameStatus": 2}
+        with patch('app.services.games.scoreboard.ScoreBoard') as mock_scoreboard:
+            mock_scoreboard.return_value.get_dict.return_value = {"scoreboard": {"games": [final_game, live_game]}}
+            get_today_games()
+
+        assert games.game_archive.get_games("2025-04-07") == [final_game]
+        assert games.game_archive.append("2025-04-07", "1", "scoreboard", final_game) is False
 
     def test_get_games_by_date_returns_todays_games(self):
         """
@@ -0,0 +1,120 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+
+from app.services import games as game_service
+from app.services import live
+from app.services.live import LiveScoreBroadcaster, diff_games
+from fakes import make_game
+
+
+def parse_event(message):
+    event, data = message.strip().split("\n")
+    return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+class TestDiffGames(unittest.TestCase):
+
+    def test_new_games_send_every_field(self):
+        """
+        Test that a game not in the previous snapshot is sent in full, flattened.
+        """
+        snapshot, diffs = diff_games({}, [make_game("1", home_id=10, away_id=20, home_score=0)])
+
+        assert diffs == [{"gameId": "1", "changes": snapshot["1"]}]
+        assert snapshot["1"]["homeTeam.score"] == 0
+
+    def test_only_changed_fields_are_sent(self):
+        """
+        Test that unchanged games are skipped and changed games carry only the changed fields.
+        """
+        first = [make_game("1", home_id=10, away_id=20, home_score=0, status="Q1"), make_game("2", home_id=30, away_id=40)]
+        second = [make_game("1", home_id=10, away_id=20, home_score=3, status="Q2"), make_game("2", home_id=30, away_id=40)]
+
+        snapshot, _ = diff_games({}, first)
+        _, diffs = diff_games(snapshot, second)
+
+        assert diffs == [{"gameId": "1", "changes": {"homeTeam.score": 3, "gameStatusText": "Q2"}}]
+
+
+class TestLiveScoreBroadcaster(unittest.TestCase):
+
+    def test_one_poll_serves_all_subscribers_with_team_filter(self):
+        """
+        Test that every subscriber gets a snapshot first, then diffs filtered by team,
+        with one upstream fetch per poll shared through the scoreboard cache.
+        """
+        polls = [
+            [make_game("1", home_id=10, away_id=20), make_game("2", home_id=30, away_id=40)],
+            [make_game("1", home_id=10, away_id=20, home_score=2), make_game("2", home_id=30, away_id=40, away_score=3)],
+        ]
+        fetched = []
+
+        def fetch():
+            fetched.append(1)
+            return polls[min(len(fetched), len(polls)) - 1]
+
+        async def scenario():
+            broadcaster = LiveScoreBroadcaster(interval=0.01)
+            with patch("app.services.live.game_service._fetch_today_games", side_effect=fetch):
+                everyone = broadcaster.subscribe()
+                first = await asyncio.wait_for(everyone.queue.get(), 5)
+                team_fan = broadcaster.subscribe(30)
+                second = await asyncio.wait_for(everyone.queue.get(), 5)
+                broadcaster.unsubscribe(everyone)
+                broadcaster.unsubscribe(team_fan)
+                await asyncio.wait_for(broadcaster._task, 5)
+                cached = await game_service.get_today_games_async()
+            return broadcaster, first, second, team_fan, cached
+
+        broadcaster, first, second, team_fan, cached = asyncio.run(scenario())
+
+        assert len(fetched) == broadcaster.polls
+        assert cached == polls[1]
+        assert parse_event(first) == ("snapshot", game_service.to_game_payloads(polls[0]))
+        assert parse_event(second) == ("diff", [
+            {"gameId": "1", "changes": {"homeTeam.score": 2}},
+            {"gameId": "2", "changes": {"awayTeam.score": 3}},
+        ])
+
+        event, games = parse_event(team_fan.queue.get_nowait())
+        assert event == "snapshot" and [game["gameId"] for game in games] == ["2"]
+        assert parse_event(team_fan.queue.get_nowait()) == ("diff", [{"gameId": "2", "changes": {"awayTeam.score": 3}}])
+
+    def test_subscriber_before_first_poll_gets_snapshot_not_diff(self):
+        """
+        Test that a subscriber waiting for the first poll receives a nested snapshot, not a diff.
+        """
+        async def scenario():
+            broadcaster = LiveScoreBroadcaster(interval=3600)
+            with patch("app.services.live.game_service._fetch_today_games", return_value=[make_game("1", home_id=10, away_id=20)]):
+                subscriber = broadcaster.subscribe()
+                message = await asyncio.wait_for(subscriber.queue.get(), 5)
+            broadcaster._task.cancel()
+            return subscriber, message
+
+        subscriber, message = asyncio.run(scenario())
+
+        assert parse_event(message) == ("snapshot", game_service.to_game_payloads([make_game("1", home_id=10, away_id=20)]))
+        assert subscriber.queue.empty()
+
+    def test_slow_subscriber_is_dropped(self):
+        """
+        Test that a subscriber whose queue is full is unsubscribed and told to close.
+        """
+        async def scenario():
+            broadcaster = LiveScoreBroadcaster(interval=3600)
+            with patch.object(live, "SUBSCRIBER_QUEUE_SIZE", 1):
+                subscriber = broadcaster.subscribe()
+            broadcaster._task.cancel()
+            subscriber.ready = True
+            diff = [{"gameId": "1", "changes": {"homeTeam.score": 1}}]
+            broadcaster.publish(diff)
+            broadcaster.publish(diff)
+            return broadcaster, subscriber
+
+        broadcaster, subscriber = asyncio.run(scenario())
+
+        assert broadcaster.subscriber_count == 0
+        assert subscriber.queue.get_nowait() is None
@@ -0,0 +1,66 @@
+from app.services.player_search import PlayerSearchIndex
+from app.services.player_search import autocomplete_players
+
+
+def make_player(player_id, full_name, is_active):
+    first_name, _, last_name = full_name.partition(" ")
+    return {"id": player_id, "full_name": full_name, "first_name": first_name, "last_name": last_name, "is_active": is_active}
+
+
+PLAYERS = [
+    make_player(1, "Marcus James", False),
+    make_player(2, "LeBron James", True),
+    make_player(3, "Bronny James", True),
+    make_player(4, "Stephen Curry", True),
+    make_player(5, "Dell Curry", False),
+    make_player(6, "Nikola Jokić", True),
+]
+
+
+class TestPlayerSearch:
+
+    def test_autocomplete_prefix_on_any_word(self):
+        """
+        Test that a prefix matches the start of the full name or of a later word.
+        """
+        index = PlayerSearchIndex(PLAYERS)
+
+        assert [p["id"] for p in index.autocomplete("lebr")] == [2]
+        assert {p["id"] for p in index.autocomplete("curr")} == {4, 5}
+
+    def test_autocomplete_ranks_active_players_first(self):
+        """
+        Test that active players are ranked ahead of inactive ones.
+        """
+        index = PlayerSearchIndex(PLAYERS)
+
+        result = index.autocomplete("james")
+
+        assert [p["id"] for p in result] == [3, 2, 1]
+
+    def test_autocomplete_respects_limit(self):
+        """
+        Test that only the top-k matches are returned.
+        """
+        index = PlayerSearchIndex(PLAYERS)
+
+        assert len(index.autocomplete("james", limit=2)) == 2
+        assert index.autocomplete("", limit=5) == []
+
+    def test_autocomplete_tolerates_typos_and_accents(self):
+        """
+        Test that misspelled and unaccented queries fall back to trigram matches.
+        """
+        index = PlayerSearchIndex(PLAYERS)
+
+        assert index.autocomplete("stephen cury")[0]["id"] == 4
+        assert index.autocomplete("jokic")[0]["id"] == 6
+
+    def test_autocomplete_players_uses_static_player_list(self):
+        """
+        Test the module-level index built from nba_api's static player list.
+        """
+        result = autocomplete_players("LeBron", 3)
+
+        assert result[0]["full_name"] == "LeBron James"
+        assert len(result) <= 3
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime
 from unittest.mock import patch, MagicMock
 
@@ -10,6 +11,12 @@ from app.services.players import get_player_stats_by_name
 from app.services.players import get_today_game_ids
 from app.services.players import get_today_us_date
 from app.services.players import search_players
+from app.services.players import get_boxscore
+from app.services.players import get_today_boxscores
+from app.services.players import get_player_index
+from app.services.players import get_player_stats_by_ids
+from app.services.players import normalize_name
+from app.services.players import get_player_stats_by_id_async
 
 
 class TestPlayers:
@@ -268,3 +275,145 @@ class TestPlayers:
         Returns a list of player dictionaries.
         """
         return players.find_players_by_full_name(search)
+
+    def test_get_boxscore_final_game_is_cached_for_final_ttl(self):
+        """
+        Test that a box score for a Final game is fetched once and served from memory well past the live TTL.
+        """
+        final_box = {"game": {"gameId": "1", "gameStatus": 3, "homeTeam": {"players": []}, "awayTeam": {"players": []}}}
+
+        with patch('app.services.players.boxscore.BoxScore') as mock_boxscore, \
+             patch('app.core.cache.time.monotonic', side_effect=[0.0, 0.0, 3600.0]):
+            mock_boxscore.return_value.get_dict.return_value = final_box
+
+            get_boxscore("1")
+            result = get_boxscore("1")
+
+            assert result == final_box["game"]
+            mock_boxscore.assert_called_once_with("1")
+
+    def test_get_boxscore_expired_final_game_is_read_from_archive(self):
+        """
+        Test that once a Final box score leaves memory it is re-read from the archive, not nba_api.
+        """
+        final_box = {"game": {"gameId": "1", "gameCode": "20250401/AAABBB", "gameStatus": 3,
+                              "homeTeam": {"players": []}, "awayTeam": {"players": []}}}
+
+        with patch('app.services.players.boxscore.BoxScore') as mock_boxscore, \
+             patch('app.core.cache.time.monotonic', side_effect=[0.0, 0.0, 1e9, 1e9]):
+            mock_boxscore.return_value.get_dict.return_value = final_box
+
+            get_boxscore("1")
+            result = get_boxscore("1")
+
+            assert result == final_box["game"]
+            mock_boxscore.assert_called_once_with("1")
+
+    def test_get_boxscore_live_game_expires(self):
+        """
+        Test that a live box score is refetched once its short TTL has passed.
+        """
+        live_box = {"game": {"gameId": "1", "gameStatus": 2, "homeTeam": {"players": []}, "awayTeam": {"players": []}}}
+
+        with patch('app.services.players.boxscore.BoxScore') as mock_boxscore, \
+             patch('app.core.cache.time.monotonic', side_effect=[0.0, 0.0, 1e9, 1e9]):
+            mock_boxscore.return_value.get_dict.return_value = live_box
+
+            get_boxscore("1")
+            get_boxscore("1")
+
+            assert mock_boxscore.call_count == 2
+
+    def test_get_today_boxscores_keeps_scoreboard_order(self):
+        """
+        Test that concurrently fetched box scores are returned in scoreboard order.
+        """
+        with patch('app.services.players.get_today_game_ids', return_value=['1', '2', '3']), \
+             patch('app.services.players.boxscore.BoxScore') as mock_boxscore:
+            mock_boxscore.side_effect = lambda game_id: MagicMock(
+                get_dict=MagicMock(return_value={"game": {"gameId": game_id}})
+            )
+
+            result = get_today_boxscores()
+
+            assert [game["gameId"] for game in result] == ['1', '2', '3']
+
+    def _make_player(self, person_id, name, points):
+        return {
+            "personId": person_id,
+            "name": name,
+            "starter": "1",
+            "statistics": {"points": points, "rebounds": 1, "assists": 2, "minutes": "PT30M"}
+        }
+
+    def test_get_player_stats_by_ids_batch(self):
+        """
+        Test that get_player_stats_by_ids answers every requested ID from one index,
+        including IDs that did not play today.
+        """
+        boxscores = [{
+            "homeTeam": {"players": [self._make_player(1, "Player One", 10)]},
+            "awayTeam": {"players": [self._make_player(2, "Player Two", 20)]}
+        }]
+
+        with patch('app.services.players.get_today_boxscores', return_value=boxscores):
+            result = get_player_stats_by_ids([2, 1, 99])
+
+        assert result[1]["points"] == 10
+        assert result[2]["points"] == 20
+        assert result[99] == {"message": "No stats found for the player today."}
+
+    def test_get_player_index_rebuilt_only_on_refresh(self):
+        """
+        Test that the player index is reused while the box scores are unchanged
+        and rebuilt when a box score is refreshed.
+        """
+        box = {"homeTeam": {"players": [self._make_player(1, "Player One", 10)]}, "awayTeam": {"players": []}}
+        refreshed = {"homeTeam": {"players": [self._make_player(1, "Player One", 12)]}, "awayTeam": {"players": []}}
+
+        with patch('app.services.players.get_today_boxscores', return_value=[box]):
+            first = get_player_index()
+            assert get_player_index() is first
+
+        with patch('app.services.players.get_today_boxscores', return_value=[refreshed]):
+            second = get_player_index()
+
+        assert second is not first
+        assert second.by_id[1]["statistics"]["points"] == 12
+
+    def test_get_player_stats_by_name_normalized(self):
+        """
+        Test that name lookups ignore case, accents and punctuation and still match partial names.
+        """
+        boxscores = [{
+            "homeTeam": {"players": [self._make_player(1, "Luka Dončić", 30)]},
+            "awayTeam": {"players": [self._make_player(2, "D'Angelo Russell", 15)]}
+        }]
+
+        with patch('app.services.players.get_today_boxscores', return_value=boxscores):
+            assert get_player_stats_by_name("luka doncic")["points"] == 30
+            assert get_player_stats_by_name("DANGELO")["points"] == 15
+
+        assert normalize_name("  Luka   Dončić ") == "luka doncic"
+
+    def test_get_player_stats_by_id_async_coalesces_boxscore_fetches(self):
+        """
+        Test that concurrent async stats lookups fetch each box score only once.
+        """
+        box = {"game": {
+            "gameStatus": 2,
+            "homeTeam": {"players": [self._make_player(1, "Player One", 10)]},
+            "awayTeam": {"players": []}
+        }}
+
+        with patch('app.services.players.get_today_game_ids_async', return_value=['1']), \
+             patch('app.services.players.boxscore.BoxScore') as mock_boxscore:
+            mock_boxscore.return_value.get_dict.return_value = box
+
+            async def run():
+                return await asyncio.gather(*(get_player_stats_by_id_async(1) for _ in range(10)))
+
+            results = asyncio.run(run())
+
+        assert all(result["points"] == 10 for result in results)
+        mock_boxscore.assert_called_once_with('1')
@@ -0,0 +1,119 @@
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import ClientError
+from fakes import FakeDynamoDB, FakeTable
+
+from app.services.subscribers import delete_user
+from app.services.subscribers import TEAM_INDEX_READY_KEY, rebuild_team_index
+from app.services.subscribers import sync_team_index
+from app.services.subscribers import update_user_teams
+
+LAL = {"id": 1610612747, "name": "Los Angeles Lakers", "abbreviation": "LAL"}
+GSW = {"id": 1610612744, "name": "Golden State Warriors", "abbreviation": "GSW"}
+BOS = {"id": 1610612738, "name": "Boston Celtics", "abbreviation": "BOS"}
+
+
+class TestSubscribers:
+
+    def test_sync_team_index_adds_and_removes_teams(self):
+        """
+        Test that changing a user's teams removes dropped teams and writes the new
+        team list to every followed team's partition.
+        """
+        index = FakeTable(key=("team_id", "email"))
+
+        with patch('app.services.subscribers.get_table', return_value=index):
+            sync_team_index("a@example.com", [], [LAL, GSW])
+            sync_team_index("a@example.com", [LAL, GSW], [GSW, BOS])
+
+        assert sorted(item["team_id"] for item in index.items) == [BOS["id"], GSW["id"]]
+        assert all(item["teams"] == [GSW, BOS] for item in index.items)
+
+    def make_db(self, users=()):
+        db = FakeDynamoDB({"users": FakeTable(users), "team_subscribers": FakeTable(key=("team_id", "email"))})
+        return db, patch('app.services.subscribers.get_table', side_effect=db.get_table), \
+            patch('app.services.subscribers.transact_write', side_effect=db.transact_write)
+
+    def index_rows(self, db):
+        return sorted((item["team_id"], item["email"]) for item in db.tables["team_subscribers"].items)
+
+    def test_update_user_teams_writes_user_and_index_together(self):
+        """
+        Test that a teams update changes the user row and the index in a single transaction.
+        """
+        db, get_table_patch, transact_patch = self.make_db([{"email": "a@example.com", "teams": []}])
+
+        with get_table_patch, transact_patch:
+            update_user_teams("a@example.com", [LAL, GSW], "t1")
+            item = update_user_teams("a@example.com", [GSW, BOS], "t2")
+
+        assert item == {"email": "a@example.com", "teams": [GSW, BOS], "updated_at": "t2"}
+        assert db.tables["users"].get_item(Key={"email": "a@example.com"})["Item"] == item
+        assert self.index_rows(db) == [(BOS["id"], "a@example.com"), (GSW["id"], "a@example.com")]
+        assert len(db.transactions) == 2
+
+    def test_update_user_teams_retries_when_user_changed_concurrently(self):
+        """
+        Test that a stale read fails the transaction's condition without writing, and the retry
+        computes the index changes from the user's current teams.
+        """
+        db, get_table_patch, transact_patch = self.make_db([{"email": "a@example.com", "teams": [BOS]}])
+        users = db.tables["users"]
+        real_get_item = users.get_item
+        stale_reads = iter([{"Item": {"email": "a@example.com", "teams": [LAL]}}])
+        users.get_item = lambda Key: next(stale_reads, None) or real_get_item(Key=Key)
+        db.tables["team_subscribers"].put_item(Item={"team_id": BOS["id"], "email": "a@example.com", "teams": [BOS]})
+
+        with get_table_patch, transact_patch:
+            update_user_teams("a@example.com", [GSW], "t1")
+
+        assert self.index_rows(db) == [(GSW["id"], "a@example.com")]
+        assert len(db.transactions) == 1
+
+    def test_failed_transaction_leaves_user_and_index_untouched(self):
+        """
+        Test that when the transaction fails, neither the user row nor the index changes.
+        """
+        db, get_table_patch, _ = self.make_db([{"email": "a@example.com", "teams": [LAL]}])
+        error = ClientError({"Error": {"Code": "ProvisionedThroughputExceededException", "Message": ""}}, "TransactWriteItems")
+
+        with get_table_patch, patch('app.services.subscribers.transact_write', side_effect=error):
+            with pytest.raises(ClientError):
+                update_user_teams("a@example.com", [GSW], "t1")
+
+        assert db.tables["users"].get_item(Key={"email": "a@example.com"})["Item"]["teams"] == [LAL]
+        assert self.index_rows(db) == []
+
+    def test_delete_user_removes_user_and_index_items(self):
+        """
+        Test that unsubscribing removes the user and their index items and leaves other users alone.
+        """
+        db, get_table_patch, transact_patch = self.make_db([{"email": "a@example.com"}, {"email": "b@example.com"}])
+
+        with get_table_patch, transact_patch:
+            update_user_teams("a@example.com", [LAL, GSW], "t1")
+            update_user_teams("b@example.com", [LAL], "t1")
+            deleted = delete_user("a@example.com")
+
+        assert deleted["teams"] == [LAL, GSW]
+        assert [item["email"] for item in db.tables["users"].items] == ["b@example.com"]
+        assert self.index_rows(db) == [(LAL["id"], "b@example.com")]
+
+    def test_rebuild_team_index(self):
+        """
+        Test that the index can be rebuilt from the users table.
+        """
+        users = FakeTable([
+            {"email": "a@example.com", "teams": [LAL]},
+            {"email": "b@example.com", "teams": [LAL, BOS]},
+            {"email": "c@example.com", "teams": []}
+        ])
+        index = FakeTable(key=("team_id", "email"))
+
+        with patch('app.services.subscribers.get_table', side_effect=lambda name: users if name == "users" else index):
+            count = rebuild_team_index()
+
+        assert count == 3
+        assert len(index.items) == 4
+        assert index.get_item(Key=TEAM_INDEX_READY_KEY)["Item"] == TEAM_INDEX_READY_KEY
@@ -1,5 +1,9 @@
 from app.services.teams import get_team_by_name
 from app.services.teams import get_team_list
+from app.services.teams import find_team
+from app.services.teams import get_teams_by_ids
+from app.services.teams import load_team_index
+from app.services.teams import get_team_index
 from nba_api.stats.static import teams
 
 class TestTeams:
@@ -44,8 +48,47 @@ class TestTeams:
         teams.get_teams = lambda: []
 
         try:
+            # The index is built once at startup, so rebuild it from the mocked source
+            load_team_index()
             result = get_team_list()
             assert len(result) == 0, "Expected an empty list when no teams are available"
         finally:
             # Restore the original function
             teams.get_teams = original_get_teams
+            load_team_index()
+
+    def test_get_team_list_copies_cannot_change_the_index(self):
+        """
+        Test that the startup index is reused, but callers mutating their team list leave it intact.
+        """
+        index = get_team_index()
+        team_list = get_team_list()
+        team_list[0]["full_name"] = "Changed"
+        team_list.clear()
+
+        assert get_team_index() is index
+        assert isinstance(index.team_list, tuple)
+        assert len(get_team_list()) == 30
+        assert "Changed" not in {team["full_name"] for team in index.team_list}
+
+    def test_find_team_by_id_tricode_nickname_and_full_name(self):
+        """
+        Test that find_team resolves every supported key case-insensitively.
+        """
+        lakers = find_team("Los Angeles Lakers")
+        assert lakers["abbreviation"] == "LAL"
+        assert find_team("lal") is lakers
+        assert find_team("Lakers") is lakers
+        assert find_team(str(lakers["id"])) is lakers
+        assert find_team("Nonexistent Team") is None
+
+    def test_get_teams_by_ids(self):
+        """
+        Test that team IDs are converted to the subscription shape, skipping unknown and duplicate IDs.
+        """
+        result = get_teams_by_ids([1610612747, 1, 1610612744, 1610612747])
+
+        assert result == [
+            {"id": 1610612747, "name": "Los Angeles Lakers", "abbreviation": "LAL"},
+            {"id": 1610612744, "name": "Golden State Warriors", "abbreviation": "GSW"}
+        ]